@@ -0,0 +1,98 @@
+"""
+Accord ordinal entre scores de fiabilité gold et prédits (échelle 1-5).
+
+Toutes les mesures se déduisent de la matrice de confusion 5 × 5: sur une
+échelle à cinq niveaux, le rang moyen d'un score (ex æquo compris) ne dépend
+que des effectifs marginaux. Spearman, Kendall tau-b et kappa pondéré se
+calculent donc en O(1) une fois la matrice construite (O(n)), quelle que soit
+la taille du corpus, et avec les mêmes formules pour un article ou pour tout
+le corpus.
+"""
+
+RELIABILITY_LEVELS = 5
+
+Confusion = list[list[int]]
+
+
+def reliability_level(score: float) -> int:
+    """Index 0..4 d'un score de fiabilité, borné à l'échelle 1-5."""
+    return min(max(round(score), 1), RELIABILITY_LEVELS) - 1
+
+
+def reliability_confusion(gold_scores: dict, pred_scores: dict) -> Confusion:
+    """Matrice de confusion (lignes: gold, colonnes: prédiction) des arguments alignés."""
+    confusion = [[0] * RELIABILITY_LEVELS for _ in range(RELIABILITY_LEVELS)]
+    for arg_id in gold_scores.keys() & pred_scores.keys():
+        confusion[reliability_level(gold_scores[arg_id])][reliability_level(pred_scores[arg_id])] += 1
+    return confusion
+
+
+def _midranks(marginal: list[int]) -> list[float]:
+    """Rang moyen de chaque niveau (les ex æquo partagent la moyenne de leurs rangs)."""
+    ranks, below = [], 0
+    for count in marginal:
+        ranks.append(below + (count + 1) / 2)
+        below += count
+    return ranks
+
+
+def spearman(confusion: Confusion) -> float:
+    """Corrélation de Spearman (rangs moyens), 0 si une des séries est constante."""
+    rows = [sum(row) for row in confusion]
+    cols = [sum(col) for col in zip(*confusion)]
+    n = sum(rows)
+    mean = (n + 1) / 2
+    gold_ranks = [rank - mean for rank in _midranks(rows)]
+    pred_ranks = [rank - mean for rank in _midranks(cols)]
+    covariance = sum(
+        count * gold_ranks[i] * pred_ranks[j]
+        for i, row in enumerate(confusion)
+        for j, count in enumerate(row)
+    )
+    gold_var = sum(count * rank**2 for count, rank in zip(rows, gold_ranks))
+    pred_var = sum(count * rank**2 for count, rank in zip(cols, pred_ranks))
+    if gold_var == 0 or pred_var == 0:
+        return 0.0
+    return covariance / (gold_var * pred_var) ** 0.5
+
+
+def kendall_tau(confusion: Confusion) -> float:
+    """Tau-b de Kendall (corrigé des ex æquo), 0 si une des séries est constante."""
+    size = len(confusion)
+    concordant = discordant = 0
+    for i in range(size):
+        for j in range(size):
+            count = confusion[i][j]
+            if count:
+                for k in range(i + 1, size):
+                    concordant += count * sum(confusion[k][j + 1:])
+                    discordant += count * sum(confusion[k][:j])
+    rows = [sum(row) for row in confusion]
+    cols = [sum(col) for col in zip(*confusion)]
+    n = sum(rows)
+
+    def pairs(m):
+        return m * (m - 1) / 2
+
+    total = pairs(n)
+    denominator = (
+        (total - sum(pairs(r) for r in rows)) * (total - sum(pairs(c) for c in cols))
+    ) ** 0.5
+    return (concordant - discordant) / denominator if denominator else 0.0
+
+
+def quadratic_kappa(confusion: Confusion) -> float:
+    """Kappa de Cohen à pondération quadratique, 0 si l'accord attendu est parfait."""
+    size = len(confusion)
+    rows = [sum(row) for row in confusion]
+    cols = [sum(col) for col in zip(*confusion)]
+    n = sum(rows)
+    if not n:
+        return 0.0
+    observed = expected = 0.0
+    for i in range(size):
+        for j in range(size):
+            weight = (i - j) ** 2 / (size - 1) ** 2
+            observed += weight * confusion[i][j]
+            expected += weight * rows[i] * cols[j] / n
+    return 1 - observed / expected if expected else 0.0
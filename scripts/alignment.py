@@ -0,0 +1,273 @@
+"""
+Alignement des arguments gold et prédits par similarité textuelle.
+
+Quand le modèle découpe le texte autrement que l'annotateur, l'alignement par
+`id` décale tous les arguments suivants. Ici, les arguments sont appariés
+d'après leur `claim` et leur `original_text`:
+
+1. chaque argument est réduit à l'ensemble de ses mots significatifs:
+   tokenisation de `scripts.text_overlap` (accents et élisions), sans mots
+   grammaticaux ni mots de moins de 3 lettres. Sans ce filtrage, deux
+   arguments quelconques partagent « les », « des », « que »... et presque
+   tous les couples deviennent candidats;
+2. un index MinHash/LSH propose les couples candidats (sous-quadratique);
+   le découpage en bandes est déduit du seuil de similarité. Les mots
+   présents dans plus de `MAX_WORD_FREQUENCY` des arguments (sujet de
+   l'article) ne servent pas à l'index: ils rapprochent tous les arguments
+   sans aider à les distinguer (ils comptent dans la similarité). Les
+   petits articles comparent directement tous les couples;
+3. la similarité de Jaccard exacte est calculée pour chaque candidat;
+4. une affectation optimale (méthode hongroise) maximise la similarité
+   totale, composante connexe par composante connexe du graphe des
+   candidats; les couples sous le seuil restent non appariés. Au-delà de
+   `MAX_COMPONENT` arguments, une composante est affectée de façon gloutonne
+   (couples par similarité décroissante), pour borner le coût O(n²m).
+
+Sans dépendance: les hachages sont stables d'un processus à l'autre (crc32),
+ce qui garantit des résultats identiques en mode parallèle.
+"""
+
+import random
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import Hashable
+from functools import lru_cache
+
+from scripts import text_overlap
+
+NUM_PERM = 128  # permutations MinHash
+LSH_RECALL = 0.9  # probabilité minimale qu'un couple au seuil soit candidat
+EXACT_PAIRS = 2500  # en deçà, tous les couples sont comparés sans index
+MAX_COMPONENT = 200  # au-delà (gold + prédits), affectation gloutonne
+MAX_WORD_FREQUENCY = 0.05  # part maximale des arguments contenant un mot (mode LSH)
+DEFAULT_THRESHOLD = 0.2  # similarité minimale d'un appariement
+MIN_WORD_LENGTH = 3
+
+# Mots grammaticaux fréquents (sans accents, comme les tokens), en plus des
+# articles de `text_overlap`
+STOPWORDS = text_overlap.STOPWORDS | frozenset({
+    "les", "des", "aux", "une", "que", "qui", "quoi", "dont", "pour", "par", "sur", "sous",
+    "dans", "avec", "sans", "entre", "vers", "chez", "est", "sont", "etre", "ete", "etait",
+    "ont", "avait", "fait", "peut", "doit", "pas", "plus", "moins", "tres", "bien", "mais",
+    "donc", "car", "comme", "aussi", "encore", "deja", "meme", "tout", "tous", "toute",
+    "toutes", "son", "sa", "ses", "leur", "leurs", "notre", "nos", "votre", "vos", "ces",
+    "cet", "cette", "celui", "celle", "ceux", "elle", "elles", "ils", "lui", "nous", "vous",
+    "non", "ainsi", "alors", "lorsque", "puisque", "quand", "chaque", "autre",
+    "autres", "the", "and", "for", "that", "with", "this", "are", "was", "not",
+})
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20251212)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """Ensemble des mots significatifs d'un texte (3 lettres ou plus, hors mots grammaticaux)."""
+    return frozenset(
+        word for word in text_overlap.tokenize(text)
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS
+    )
+
+
+@lru_cache
+def band_rows(threshold: float, num_perm: int = NUM_PERM, recall: float = LSH_RECALL) -> int:
+    """
+    Lignes par bande LSH pour un seuil de similarité.
+
+    Un couple de similarité s partage au moins une des b = num_perm / r
+    bandes avec la probabilité 1 - (1 - s^r)^b. On retient le plus grand r
+    (le moins de candidats) qui garde cette probabilité au-dessus de
+    `recall` au seuil: r = 2 (64 bandes, rappel 93 %) pour le seuil 0,2.
+    """
+    rows = 1
+    for candidate in range(2, num_perm + 1):
+        if 1 - (1 - threshold**candidate) ** (num_perm // candidate) < recall:
+            break
+        rows = candidate
+    return rows
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Similarité de Jaccard de deux ensembles (0 si les deux sont vides)."""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hashes(token: str) -> tuple[int, ...]:
+    """Valeurs d'un mot sous chaque permutation (mises en cache: les mots se répètent)."""
+    h = zlib.crc32(token.encode("utf-8"))
+    return tuple((a * h + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+def minhash(tokens: frozenset[str]) -> tuple[int, ...]:
+    """Signature MinHash d'un ensemble non vide de mots."""
+    return tuple(map(min, zip(*map(_token_hashes, tokens))))
+
+
+def lsh_candidates(
+    gold: dict[Hashable, frozenset[str]],
+    predicted: dict[Hashable, frozenset[str]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> set[tuple[Hashable, Hashable]]:
+    """Couples (gold, prédit) partageant au moins une bande de leurs signatures."""
+    rows = band_rows(threshold)
+    buckets: dict[tuple, tuple[list, list]] = defaultdict(lambda: ([], []))
+    for side, arguments in enumerate((gold, predicted)):
+        for arg_id, tokens in arguments.items():
+            if not tokens:
+                continue
+            signature = minhash(tokens)
+            for start in range(0, NUM_PERM - rows + 1, rows):
+                buckets[start, signature[start:start + rows]][side].append(arg_id)
+    return {(g, p) for gold_ids, pred_ids in buckets.values() for g in gold_ids for p in pred_ids}
+
+
+def hungarian(cost: list[list[float]]) -> list[int]:
+    """
+    Affectation de coût minimal (méthode hongroise, O(n²m)).
+
+    Args:
+        cost: Matrice n × m avec n <= m.
+
+    Returns:
+        Pour chaque ligne, l'indice de la colonne affectée.
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u, v = [0.0] * (n + 1), [0.0] * (m + 1)
+    match = [0] * (m + 1)  # ligne (1..n) affectée à chaque colonne, 0 si libre
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while match[col0]:
+            used[col0] = True
+            row0, delta, col1 = match[col0], inf, 0
+            for col in range(1, m + 1):
+                if not used[col]:
+                    current = cost[row0 - 1][col - 1] - u[row0] - v[col]
+                    if current < minv[col]:
+                        minv[col], way[col] = current, col0
+                    if minv[col] < delta:
+                        delta, col1 = minv[col], col
+            for col in range(m + 1):
+                if used[col]:
+                    u[match[col]] += delta
+                    v[col] -= delta
+                else:
+                    minv[col] -= delta
+            col0 = col1
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+    assignment = [0] * n
+    for col in range(1, m + 1):
+        if match[col]:
+            assignment[match[col] - 1] = col - 1
+    return assignment
+
+
+def _components(pairs: dict[tuple[Hashable, Hashable], float]) -> list[tuple[list, list]]:
+    """Composantes connexes du graphe biparti des candidats: (ids gold, ids prédits)."""
+    parent: dict = {}
+
+    def find(node):
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for g, p in pairs:
+        parent[find(("g", g))] = find(("p", p))
+    components: dict = defaultdict(lambda: ([], []))
+    for side, arg_id in list(parent):
+        components[find((side, arg_id))][side == "p"].append(arg_id)
+    return list(components.values())
+
+
+def greedy_assignment(
+    similarities: dict[tuple[Hashable, Hashable], float],
+) -> dict[Hashable, Hashable]:
+    """Appariement un pour un glouton: couples par similarité décroissante."""
+    mapping, used = {}, set()
+    for (g, p), _ in sorted(similarities.items(), key=lambda item: (-item[1], repr(item[0]))):
+        if p not in mapping and g not in used:
+            mapping[p] = g
+            used.add(g)
+    return mapping
+
+
+def align_arguments(
+    gold_texts: dict[Hashable, str],
+    pred_texts: dict[Hashable, str],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict[Hashable, Hashable]:
+    """
+    Apparie les arguments prédits aux arguments gold par similarité.
+
+    Args:
+        gold_texts: Texte de chaque argument gold, par identifiant.
+        pred_texts: Texte de chaque argument prédit, par identifiant.
+        threshold: Similarité de Jaccard minimale d'un appariement.
+
+    Returns:
+        Identifiant gold apparié à chaque argument prédit (les arguments sans
+        appariement sont absents).
+    """
+    gold = {arg_id: tokenize(text) for arg_id, text in gold_texts.items()}
+    predicted = {arg_id: tokenize(text) for arg_id, text in pred_texts.items()}
+
+    if len(gold) * len(predicted) <= EXACT_PAIRS:
+        candidates = {(g, p) for g in gold for p in predicted}
+    else:
+        frequency = Counter(word for tokens in (*gold.values(), *predicted.values())
+                            for word in tokens)
+        limit = MAX_WORD_FREQUENCY * (len(gold) + len(predicted))
+        common = {word for word, count in frequency.items() if count > limit}
+        candidates = lsh_candidates(
+            {arg_id: tokens - common for arg_id, tokens in gold.items()},
+            {arg_id: tokens - common for arg_id, tokens in predicted.items()},
+            threshold,
+        )
+    similarities = {
+        pair: similarity
+        for pair in candidates
+        if (similarity := jaccard(gold[pair[0]], predicted[pair[1]])) >= threshold
+    }
+
+    mapping = {}
+    components = _components(similarities)
+    # Couples de chaque grande composante, regroupés en une passe
+    large = {
+        p: index for index, (gold_ids, pred_ids) in enumerate(components)
+        if len(gold_ids) + len(pred_ids) > MAX_COMPONENT for p in pred_ids
+    }
+    large_pairs: dict[int, dict] = defaultdict(dict)
+    for pair, similarity in similarities.items():
+        if pair[1] in large:
+            large_pairs[large[pair[1]]][pair] = similarity
+    for pairs in large_pairs.values():
+        mapping.update(greedy_assignment(pairs))
+
+    for gold_ids, pred_ids in components:
+        if len(gold_ids) + len(pred_ids) > MAX_COMPONENT:
+            continue
+        rows, cols, transposed = gold_ids, pred_ids, False
+        if len(rows) > len(cols):
+            rows, cols, transposed = cols, rows, True
+        cost = [
+            [
+                -similarities.get((c, r) if transposed else (r, c), 0.0)
+                for c in cols
+            ]
+            for r in rows
+        ]
+        for i, j in enumerate(hungarian(cost)):
+            g, p = (cols[j], rows[i]) if transposed else (rows[i], cols[j])
+            if (g, p) in similarities:
+                mapping[p] = g
+    return mapping
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage des outils en ligne de commande.
+
+Les scripts sont souvent lancés dans des environnements éphémères où le
+démarrage à froid domine. Pour chaque scénario (point d'entrée et format),
+mesure dans un interpréteur neuf:
+
+- le temps total d'exécution (médiane et minimum de N lancements);
+- le temps d'import d'après `python -X importtime` (lancement médian),
+  avec les modules de premier niveau les plus coûteux;
+- la mémoire résidente maximale (RSS) du processus.
+
+Les mesures sont comparées à une référence versionnée dans
+`benchmark/perf/startup_baseline.json`; une régression au-delà du seuil
+(20 % par défaut, et un écart absolu minimal par métrique) fait échouer
+le script.
+
+Usage:
+    python scripts/bench_startup.py [--runs N] [--scenario NOM ...] [--threshold 0.2]
+    python scripts/bench_startup.py --update-baseline
+
+Exemple:
+    python scripts/bench_startup.py --runs 10 --imports
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+BASELINE_PATH = ROOT_DIR / "benchmark" / "perf" / "startup_baseline.json"
+EXAMPLE = ROOT_DIR / "assets" / "example_analysis.json"
+GOLD = ROOT_DIR / "benchmark" / "annotations" / "gold" / "001_atecopol_iag.json"
+
+# nom: arguments de l'interpréteur ({tmp} est remplacé par un répertoire temporaire)
+SCENARIOS = {
+    "generate-md": ["-m", "scripts.generate_analysis", str(EXAMPLE), "{tmp}/r.md", "--format", "md"],
+    "generate-json": [
+        "-m", "scripts.generate_analysis", str(EXAMPLE), "{tmp}/r.json", "--format", "json"
+    ],
+    "generate-xlsx": ["-m", "scripts.generate_analysis", str(EXAMPLE), "{tmp}/r.xlsx"],
+    "generate-xlsx-native": [
+        "-m", "scripts.generate_analysis", str(EXAMPLE), "{tmp}/r.xlsx", "--xlsx-engine", "native"
+    ],
+    "evaluate": ["-m", "scripts.evaluate", str(GOLD), str(GOLD), "--quiet"],
+    "package-skill": ["-m", "scripts.package_skill", "--dry-run", str(ROOT_DIR)],
+}
+
+# Métriques comparées à la référence. Une régression doit dépasser à la fois
+# le seuil relatif et un écart absolu minimal, sous lequel on ne mesure que
+# le bruit de la machine.
+METRICS = {
+    # clé: (libellé, unité, écart absolu minimal)
+    "wall_ms": ("Démarrage", "ms", 15),
+    "import_ms": ("Imports", "ms", 15),
+    "rss_mb": ("RSS", "Mo", 2),
+}
+
+
+def run_once(args: list[str]) -> tuple[float, float, str]:
+    """
+    Lance un interpréteur neuf et mesure son exécution.
+
+    Returns:
+        Tuple (durée en ms, RSS maximale en Mo, sortie d'erreur)
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *args], cwd=ROOT_DIR, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, text=True,
+    )
+    stderr = process.stderr.read()
+    # wait4 fournit l'usage des ressources de ce seul processus enfant
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = (time.perf_counter() - start) * 1000
+    process.returncode = os.waitstatus_to_exitcode(status)
+    process.stderr.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"Échec de {' '.join(args)}:\n{stderr}")
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    rss_kb = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return elapsed, rss_kb / 1024, stderr
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float]]:
+    """
+    Extrait les imports de premier niveau de la sortie de `-X importtime`.
+
+    Returns:
+        Couples (module, temps cumulé en ms), du plus coûteux au moins coûteux.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Les imports imbriqués sont indentés sous leur parent
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: item[1], reverse=True)
+
+
+def measure(args: list[str], runs: int) -> tuple[dict[str, float], list[tuple[str, float]]]:
+    """
+    Mesure un scénario.
+
+    Returns:
+        Tuple (métriques, imports de premier niveau triés par coût)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        args = [arg.replace("{tmp}", tmp) for arg in args]
+        samples = [run_once(args) for _ in range(runs)]
+        # Lancements distincts: -X importtime ralentit lui-même l'exécution
+        breakdowns = [
+            parse_importtime(run_once(["-X", "importtime", *args])[2]) for _ in range(runs)
+        ]
+    # Lancement médian, pour une mesure aussi stable que le temps total
+    imports = sorted(breakdowns, key=lambda b: sum(ms for _, ms in b))[len(breakdowns) // 2]
+    metrics = {
+        "wall_ms": round(statistics.median(s[0] for s in samples), 1),
+        "wall_min_ms": round(min(s[0] for s in samples), 1),
+        "import_ms": round(sum(ms for _, ms in imports), 1),
+        "rss_mb": round(max(s[1] for s in samples), 1),
+    }
+    return metrics, imports
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """
+    Compare les mesures à la référence.
+
+    Args:
+        results: Métriques par scénario.
+        baseline: Métriques de référence par scénario.
+        threshold: Hausse relative tolérée (0.2 = +20 %).
+
+    Returns:
+        Description de chaque métrique dépassant le seuil.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name, {})
+        for key, (label, unit, tolerance) in METRICS.items():
+            if key not in reference:
+                continue
+            current, expected = metrics[key], reference[key]
+            if current > expected * (1 + threshold) and current - expected > tolerance:
+                regressions.append(
+                    f"{name}: {label} {current:g} {unit} "
+                    f"(référence {expected:g} {unit}, {current / expected - 1:+.0%})"
+                )
+    return regressions
+
+
+def environment() -> dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(terse=True)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage des CLI")
+    parser.add_argument("--runs", "-r", type=int, default=5, help="Lancements par scénario")
+    parser.add_argument(
+        "--scenario", "-s", action="append", choices=list(SCENARIOS),
+        help="Scénario à mesurer (répétable, par défaut: tous)",
+    )
+    parser.add_argument(
+        "--threshold", "-t", type=float, default=0.2,
+        help="Hausse relative tolérée avant de signaler une régression (défaut: 0.2)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Fichier de référence")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Enregistre les mesures comme référence"
+    )
+    parser.add_argument(
+        "--imports", type=int, nargs="?", const=5, default=0, metavar="N",
+        help="Affiche les N imports de premier niveau les plus coûteux (défaut: 5)",
+    )
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored.get("scenarios", {})
+        if stored.get("environment") != environment():
+            print(f"⚠️  Référence mesurée sur un autre environnement: {stored.get('environment')}")
+
+    print(f"\n📊 Démarrage à froid, médiane de {args.runs} lancement(s)\n")
+    print("| Scénario | Démarrage (ms) | Min (ms) | Imports (ms) | RSS (Mo) |")
+    print("|---|---|---|---|---|")
+    results, breakdowns = {}, {}
+    for name in args.scenario or SCENARIOS:
+        results[name], breakdowns[name] = measure(SCENARIOS[name], args.runs)
+        m = results[name]
+        print(
+            f"| {name} | {m['wall_ms']:.0f} | {m['wall_min_ms']:.0f} "
+            f"| {m['import_ms']:.0f} | {m['rss_mb']:.1f} |"
+        )
+
+    if args.imports:
+        for name, imports in breakdowns.items():
+            print(f"\n🔍 {name}:")
+            for module, ms in imports[:args.imports]:
+                print(f"   {ms:8.1f} ms  {module}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        scenarios = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "scenarios": scenarios}, f, indent=2)
+            f.write("\n")
+        print(f"\n✅ Référence mise à jour: {args.baseline}")
+        return
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Régression(s) au-delà de {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        sys.exit(1)
+    if baseline:
+        print(f"\n✅ Aucune régression au-delà de {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark des moteurs d'écriture XLSX.
+
+Compare le formateur openpyxl (standard et write-only) et le moteur natif
+sur un corpus synthétique obtenu en répliquant les arguments d'une analyse
+d'exemple: temps d'écriture (meilleur de N essais), taille du fichier et
+temps d'import du module.
+
+Usage:
+    python scripts/bench_xlsx.py [--arguments N] [--repeat R] [--input analysis.json]
+
+Exemple:
+    python scripts/bench_xlsx.py --arguments 20000 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+ENGINES = {
+    # nom: (module, paramètres de save_report)
+    "openpyxl": ("scripts.formatters.excel", {}),
+    "openpyxl-streaming": ("scripts.formatters.excel", {"streaming": True}),
+    "native": ("scripts.formatters.xlsx_native", {}),
+}
+
+
+def synthetic_analysis(template: dict, count: int) -> dict:
+    """Construit une analyse de `count` arguments en répliquant ceux du modèle."""
+    arguments = template.get("arguments", [])
+    if not arguments:
+        raise ValueError("L'analyse modèle ne contient aucun argument")
+    replicated = []
+    for i in range(count):
+        arg = dict(arguments[i % len(arguments)])
+        arg["id"] = i + 1
+        replicated.append(arg)
+    return {**template, "arguments": replicated}
+
+
+def import_time(module: str) -> float:
+    """Mesure le temps d'import à froid d'un module dans un interpréteur neuf (secondes)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT_DIR, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def bench_engine(module_name: str, params: dict, data: dict, repeat: int) -> tuple[float, int]:
+    """
+    Mesure le meilleur temps d'écriture et la taille du fichier produit.
+
+    Returns:
+        Tuple (secondes, octets)
+    """
+    module = __import__(module_name, fromlist=["save_report"])
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp) / "bench.xlsx"
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if not module.save_report(data, output_path, **params):
+                    raise RuntimeError(f"Échec de l'écriture avec {module_name}")
+            best = min(best, time.perf_counter() - start)
+        size = output_path.stat().st_size
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs XLSX")
+    parser.add_argument("--arguments", "-n", type=int, default=5000, help="Nombre d'arguments")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Nombre d'essais par moteur")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=ROOT_DIR / "assets" / "example_analysis.json",
+        help="Analyse servant de modèle au corpus synthétique",
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT_DIR))
+    with open(args.input, encoding="utf-8") as f:
+        data = synthetic_analysis(json.load(f), args.arguments)
+
+    print(f"\n📊 {args.arguments} arguments, meilleur de {args.repeat} essai(s)\n")
+    print("| Moteur | Import (s) | Écriture (s) | Taille (Ko) |")
+    print("|---|---|---|---|")
+    for name, (module, params) in ENGINES.items():
+        elapsed, size = bench_engine(module, params, data, args.repeat)
+        print(f"| {name} | {import_time(module):.3f} | {elapsed:.2f} | {size / 1024:.0f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Catalogue indexé du corpus du benchmark (SQLite + FTS5).
+
+Chaque article (`articles/<langue>/<type>/...`) et chaque annotation
+(`annotations/<jeu>/*.json`) est décrit par une ligne: type, langue,
+annotateur, sophismes, fiabilité moyenne, empreinte SHA-256 du contenu.
+Le texte est indexé en plein texte (FTS5, accents ignorés).
+
+La mise à jour est incrémentale: un fichier dont la date de modification et
+la taille n'ont pas changé n'est pas relu. Sinon son empreinte est
+recalculée; seul un contenu différent est réindexé. Les fichiers disparus
+sont retirés du catalogue.
+
+Usage:
+    python -m scripts.catalog update benchmark/
+    python -m scripts.catalog query --type militant --language fr --corpus gold --fallacy "ad hominem"
+    python -m scripts.catalog query --text "infrastructure NEAR écologique" --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from scripts import fallacy_index
+from scripts.eval_cache import file_digest
+from scripts.model import NOT_SPECIFIED, parse_analysis
+
+DEFAULT_ROOT = Path("benchmark")
+CATALOG_NAME = "catalog.sqlite"
+
+ARTICLE_SUFFIXES = (".txt", ".md", ".html", ".htm")
+# Répertoires de langue de `articles/` -> code ISO 639-1
+LANGUAGES = {"french": "fr", "english": "en", "spanish": "es", "german": "de", "italian": "it"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    corpus TEXT,
+    type TEXT,
+    language TEXT,
+    annotator TEXT,
+    title TEXT,
+    arguments INTEGER,
+    reliability REAL,
+    sha256 TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_facets ON documents (kind, corpus, type, language);
+CREATE TABLE IF NOT EXISTS fallacies (
+    document INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    fallacy TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (fallacy, document)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fallacies_document ON fallacies (document);
+-- rowid = documents.id
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_text USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+COLUMNS = (
+    "path", "kind", "corpus", "type", "language", "annotator", "title", "arguments",
+    "reliability", "sha256", "mtime", "size",
+)
+
+TAGS = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+
+class Entry(NamedTuple):
+    """Document catalogué: ligne de `documents`, sophismes et texte indexé."""
+
+    row: dict
+    fallacies: dict[str, int]
+    body: str
+
+
+class UpdateStats(NamedTuple):
+    """Bilan d'une mise à jour du catalogue."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def language_code(value: str | None) -> str | None:
+    """Code de langue normalisé (`FR`, `french` -> `fr`)."""
+    if not value:
+        return None
+    value = value.strip().lower()
+    return LANGUAGES.get(value, value)
+
+
+def _article_text(path: Path) -> tuple[str, str]:
+    """Titre (première ligne non vide) et texte brut d'un article."""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix in (".html", ".htm"):
+        title = re.search(r"<title[^>]*>(.*?)</title>", text, re.IGNORECASE | re.DOTALL)
+        text = html.unescape(TAGS.sub(" ", text))
+        if title:
+            return html.unescape(title.group(1)).strip(), text
+    title = next((line.strip() for line in text.splitlines() if line.strip()), path.stem)
+    return title.lstrip("# "), text
+
+
+def read_article(path: Path, relative: Path) -> Entry:
+    """Entrée d'un article: langue et type d'après `articles/<langue>/<type>/`."""
+    parts = relative.parts
+    language = language_code(parts[1]) if len(parts) > 2 else None
+    kind = parts[2] if len(parts) > 3 else None
+    title, text = _article_text(path)
+    row = {"kind": "article", "corpus": None, "type": kind, "language": language,
+           "annotator": None, "title": title, "arguments": None, "reliability": None}
+    return Entry(row, {}, text)
+
+
+def read_annotation(path: Path, relative: Path) -> Entry:
+    """
+    Entrée d'une annotation (`annotations/<jeu>/...`).
+
+    Le type et la langue viennent de `metadata.type`/`metadata.language`;
+    l'annotateur de `_meta.annotator`, à défaut de `metadata.analyst`, à
+    défaut du nom du jeu (`gold`, `model`).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    analysis = parse_analysis(data)
+    raw_metadata = data.get("metadata") or {}
+    corpus = relative.parts[1] if len(relative.parts) > 2 else None
+    annotator = (data.get("_meta") or {}).get("annotator")
+    if not annotator and analysis.metadata.analyst != NOT_SPECIFIED:
+        annotator = analysis.metadata.analyst
+
+    fallacies: dict[str, int] = {}
+    body = [analysis.metadata.title]
+    for arg in analysis.arguments:
+        for fallacy in arg.fallacies:
+            fallacies[fallacy.key] = fallacies.get(fallacy.key, 0) + 1
+            body.extend((fallacy.label, fallacy.description))
+        body.extend((arg.label, arg.original_text, arg.claim, arg.grounds, arg.warrant,
+                     arg.reliability_rationale, arg.comment))
+    reliabilities = [arg.reliability for arg in analysis.arguments if arg.reliability is not None]
+    row = {
+        "kind": "annotation",
+        "corpus": corpus,
+        "type": (raw_metadata.get("type") or "").lower() or None,
+        "language": language_code(raw_metadata.get("language")),
+        "annotator": annotator or corpus,
+        "title": analysis.metadata.title,
+        "arguments": len(analysis.arguments),
+        "reliability": sum(reliabilities) / len(reliabilities) if reliabilities else None,
+    }
+    return Entry(row, fallacies, "\n".join(part for part in body if part))
+
+
+def corpus_files(root: Path) -> dict[str, Path]:
+    """Articles et annotations du benchmark, par chemin relatif à `root`."""
+    files = {}
+    for path in sorted((root / "articles").rglob("*")):
+        if path.suffix.lower() in ARTICLE_SUFFIXES and path.is_file():
+            files[path.relative_to(root).as_posix()] = path
+    for path in sorted((root / "annotations").rglob("*.json")):
+        files[path.relative_to(root).as_posix()] = path
+    return files
+
+
+def read_entry(path: Path, relative: Path) -> Entry:
+    if relative.parts[0] == "articles":
+        return read_article(path, relative)
+    return read_annotation(path, relative)
+
+
+class Catalog:
+    """Catalogue SQLite des articles et annotations d'un benchmark."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+
+    def update(self, root: Path) -> UpdateStats:
+        """
+        Met le catalogue à jour avec le contenu de `root` (incrémental).
+
+        Un fichier illisible est signalé et laissé hors du catalogue.
+        """
+        known = {
+            path: (sha256, mtime, size)
+            for path, sha256, mtime, size in self._db.execute(
+                "SELECT path, sha256, mtime, size FROM documents"
+            )
+        }
+        added = updated = unchanged = 0
+        with self._db:
+            for relative, path in corpus_files(root).items():
+                stat = path.stat()
+                previous = known.pop(relative, None)
+                if previous and previous[1:] == (stat.st_mtime, stat.st_size):
+                    unchanged += 1
+                    continue
+                digest = file_digest(path)
+                if previous and previous[0] == digest:
+                    # Fichier touché sans changement de contenu
+                    self._db.execute(
+                        "UPDATE documents SET mtime = ?, size = ? WHERE path = ?",
+                        (stat.st_mtime, stat.st_size, relative),
+                    )
+                    unchanged += 1
+                    continue
+                try:
+                    entry = read_entry(path, Path(relative))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  {relative} ignoré: {e}", file=sys.stderr)
+                    if previous:
+                        known[relative] = previous
+                    continue
+                row = {**entry.row, "path": relative, "sha256": digest,
+                       "mtime": stat.st_mtime, "size": stat.st_size}
+                self._remove(relative)
+                document = self._db.execute(
+                    f"INSERT INTO documents ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [row[column] for column in COLUMNS],
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO fallacies VALUES (?, ?, ?)",
+                    [(document, key, count) for key, count in entry.fallacies.items()],
+                )
+                self._db.execute(
+                    "INSERT INTO documents_text (rowid, title, body) VALUES (?, ?, ?)",
+                    (document, row["title"], entry.body),
+                )
+                if previous:
+                    updated += 1
+                else:
+                    added += 1
+            for relative in known:
+                self._remove(relative)
+        return UpdateStats(added, updated, unchanged, len(known))
+
+    def _remove(self, relative: str) -> None:
+        row = self._db.execute("SELECT id FROM documents WHERE path = ?", (relative,)).fetchone()
+        if row:
+            self._db.execute("DELETE FROM documents WHERE id = ?", row)
+            self._db.execute("DELETE FROM documents_text WHERE rowid = ?", row)
+
+    def query(
+        self,
+        kind: str | None = None,
+        corpus: str | None = None,
+        type: str | None = None,
+        language: str | None = None,
+        annotator: str | None = None,
+        fallacies: list[str] | None = None,
+        text: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Documents répondant à tous les critères donnés, triés par chemin.
+
+        Args:
+            kind: `article` ou `annotation`
+            corpus: Jeu d'annotations (`gold`, `model`, ...)
+            type: Type d'article (`militant`, `journalistique`, `academique`)
+            language: Langue (`fr`, `FR` ou `french`)
+            annotator: Annotateur
+            fallacies: Sophismes tous présents (noms libres, normalisés par le catalogue)
+            text: Requête plein texte FTS5 (mots, "phrase exacte", OR, NEAR, préfixe*)
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Lignes du catalogue, avec la liste `fallacies` des sophismes annotés
+        """
+        clauses, params = [], []
+        for column, value in (("kind", kind), ("corpus", corpus), ("type", type),
+                              ("annotator", annotator)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if language:
+            clauses.append("language = ?")
+            params.append(language_code(language))
+        for name in fallacies or ():
+            clauses.append(
+                "id IN (SELECT document FROM fallacies WHERE fallacy = ?)"
+            )
+            params.append(fallacy_index.normalize(name))
+        if text:
+            clauses.append("id IN (SELECT rowid FROM documents_text WHERE documents_text MATCH ?)")
+            params.append(text)
+        sql = (
+            f"SELECT {', '.join(COLUMNS)}, (SELECT GROUP_CONCAT(fallacy, ' ') FROM "
+            "(SELECT fallacy FROM fallacies WHERE document = id ORDER BY fallacy)) FROM documents"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = []
+        for *values, keys in self._db.execute(sql, params):
+            row = dict(zip(COLUMNS, values))
+            row["fallacies"] = keys.split() if keys else []
+            rows.append(row)
+        return rows
+
+    def summary(self) -> list[tuple]:
+        """Nombre de documents par nature, jeu, type et langue."""
+        return self._db.execute(
+            "SELECT kind, corpus, type, language, COUNT(*) FROM documents "
+            "GROUP BY kind, corpus, type, language ORDER BY kind, corpus, type, language"
+        ).fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> Catalog:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalogue indexé du corpus du benchmark")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help=f"Base du catalogue (par défaut: <racine>/{CATALOG_NAME})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="Indexe les fichiers nouveaux ou modifiés")
+    update.add_argument("root", nargs="?", type=Path, default=DEFAULT_ROOT, help="Racine du benchmark")
+
+    query = commands.add_parser("query", help="Recherche dans le catalogue")
+    query.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Racine du benchmark")
+    query.add_argument("--kind", choices=["article", "annotation"])
+    query.add_argument("--corpus", help="Jeu d'annotations (gold, model, ...)")
+    query.add_argument("--type", help="Type d'article (militant, journalistique, academique)")
+    query.add_argument("--language", help="Langue (fr, en, ...)")
+    query.add_argument("--annotator", help="Annotateur")
+    query.add_argument(
+        "--fallacy", action="append", default=[], help="Sophisme présent (répétable: tous requis)"
+    )
+    query.add_argument("--text", help="Requête plein texte (syntaxe FTS5)")
+    query.add_argument("--limit", type=int, help="Nombre maximal de résultats")
+    query.add_argument("--json", action="store_true", help="Résultats en JSON")
+
+    stats = commands.add_parser("stats", help="Nombre de documents par type et langue")
+    stats.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Racine du benchmark")
+
+    args = parser.parse_args()
+    db_path = args.db or args.root / CATALOG_NAME
+
+    if args.command == "update":
+        if not args.root.is_dir():
+            print(f"❌ Erreur: répertoire introuvable: {args.root}")
+            sys.exit(1)
+        with Catalog(db_path) as catalog:
+            result = catalog.update(args.root)
+        print(
+            f"✅ Catalogue {db_path}: {result.added} ajouté(s), {result.updated} mis à jour, "
+            f"{result.unchanged} inchangé(s), {result.removed} retiré(s)"
+        )
+        return
+
+    if not db_path.exists():
+        print(f"❌ Erreur: catalogue introuvable: {db_path} (lancer `update` d'abord)")
+        sys.exit(1)
+    with Catalog(db_path) as catalog:
+        if args.command == "stats":
+            print(f"📊 Catalogue {db_path}:")
+            for kind, corpus, kind_type, language, count in catalog.summary():
+                facets = " / ".join(value or "-" for value in (kind, corpus, kind_type, language))
+                print(f"   {facets}: {count}")
+            return
+        try:
+            rows = catalog.query(
+                kind=args.kind, corpus=args.corpus, type=args.type, language=args.language,
+                annotator=args.annotator, fallacies=args.fallacy, text=args.text,
+                limit=args.limit,
+            )
+        except sqlite3.OperationalError as e:
+            print(f"❌ Erreur: requête plein texte invalide: {e}")
+            sys.exit(1)
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    for row in rows:
+        facets = ", ".join(
+            str(value) for value in (row["corpus"], row["type"], row["language"], row["annotator"])
+            if value
+        )
+        print(f"{row['path']}  [{facets}]  {row['title']}")
+        if row["fallacies"]:
+            print(f"    sophismes: {', '.join(row['fallacies'])}")
+    print(f"📁 {len(rows)} document(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Comparaison de plusieurs exécutions du modèle sur un même gold (NumPy).
+
+Chaque exécution est un répertoire de prédictions (mêmes noms de fichiers que
+le gold). Le gold est lu et indexé une seule fois, puis transmis une fois à
+chaque processus du pool; seules les prédictions sont lues par tâche, et toutes
+les exécutions sont évaluées dans le même pool.
+
+La comparaison porte sur les articles prédits par toutes les exécutions
+(plan apparié). Elle produit:
+
+- la matrice de comparaison (une ligne par exécution, métriques du corpus);
+- le F1 par type de sophisme de chaque exécution et son écart à la référence
+  (première exécution);
+- des tests de significativité appariés: randomisation approchée au niveau
+  article (les comptes d'un article sont échangés entre les deux exécutions
+  avec probabilité 1/2), pour le F1, la précision et le rappel micro, la MAE
+  de fiabilité et le F1 de chaque type. Les p-valeurs par type sont aussi
+  corrigées par la méthode de Holm.
+
+Nécessite NumPy (extra `benchmark`).
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from scripts.corpus_metrics import BOOTSTRAP_CHUNK, CorpusAccumulator, CorpusMetrics, _scores
+from scripts.evaluate import Annotations, align_annotations, extract_annotations
+from scripts.reader import AnalysisReader
+
+DEFAULT_PERMUTATIONS = 10000
+GLOBAL_METRICS = ("fallacy_precision", "fallacy_recall", "fallacy_f1", "reliability_mae")
+
+# Annotations gold de l'exécution courante, installées dans chaque processus
+_GOLD: dict[str, Annotations] = {}
+
+
+@dataclass
+class RunComparison:
+    """Résultat de la comparaison de plusieurs exécutions."""
+
+    runs: list[str]
+    articles: list[str]
+    metrics: dict[str, CorpusMetrics]
+    # type -> exécution -> {"f1", "support", "delta", "p_value", "p_holm"}
+    per_type: dict[str, dict[str, dict[str, float]]] = field(default_factory=dict)
+    # exécution (hors référence) -> métrique -> {"delta", "p_value"}
+    significance: dict[str, dict[str, dict[str, float]]] = field(default_factory=dict)
+
+    @property
+    def baseline(self) -> str:
+        return self.runs[0]
+
+
+def run_names(run_dirs: list[Path]) -> list[str]:
+    """Nom de chaque exécution: nom du répertoire, ou chemin complet s'il est ambigu."""
+    names = [run_dir.name for run_dir in run_dirs]
+    if len(set(names)) < len(names):
+        return [str(run_dir) for run_dir in run_dirs]
+    return names
+
+
+def load_gold(gold_dir: Path, with_texts: bool = False) -> dict[str, Annotations]:
+    """Lit chaque annotation gold une seule fois (nom d'article -> annotations)."""
+    return {
+        gold_file.stem: extract_annotations(AnalysisReader(gold_file), with_texts)
+        for gold_file in sorted(gold_dir.glob("*.json"))
+    }
+
+
+def _install_gold(gold: dict[str, Annotations]) -> None:
+    """Initialiseur du pool: le gold n'est transmis qu'une fois par processus."""
+    global _GOLD
+    _GOLD = gold
+
+
+def _evaluate_prediction(task: tuple[str, Path, float | None]) -> Annotations:
+    """Résumé des annotations prédites d'un article, aligné sur le gold installé."""
+    name, pred_file, align_threshold = task
+    predicted = extract_annotations(AnalysisReader(pred_file), align_threshold is not None)
+    if align_threshold is not None:
+        predicted = align_annotations(_GOLD[name], predicted, align_threshold)
+    return predicted.summary()
+
+
+def holm(p_values: np.ndarray) -> np.ndarray:
+    """P-valeurs ajustées par la méthode de Holm-Bonferroni."""
+    p_values = np.asarray(p_values, dtype=float)
+    if not p_values.size:
+        return p_values
+    order = np.argsort(p_values)
+    scaled = p_values[order] * (len(p_values) - np.arange(len(p_values)))
+    adjusted = np.empty_like(p_values)
+    adjusted[order] = np.minimum(np.maximum.accumulate(scaled), 1.0)
+    return adjusted
+
+
+def unit_statistics(totals: np.ndarray) -> np.ndarray:
+    """
+    Métriques à partir de comptes cumulés (voir `CorpusAccumulator.article_units`).
+
+    Args:
+        totals: Comptes de forme (..., 3 × types + 2).
+
+    Returns:
+        Tableau (..., 4 + types): précision, rappel, F1 micro, MAE de
+        fiabilité, puis F1 de chaque type.
+    """
+    typed = totals[..., :-2]
+    tp, fp, fn = typed[..., 0::3], typed[..., 1::3], typed[..., 2::3]
+    micro = _scores(tp.sum(axis=-1), fp.sum(axis=-1), fn.sum(axis=-1))
+    aligned = totals[..., -1]
+    mae = np.divide(
+        totals[..., -2], aligned, out=np.zeros_like(aligned, dtype=float), where=aligned > 0
+    )
+    return np.concatenate(
+        [np.stack([*micro, mae], axis=-1), _scores(tp, fp, fn)[2]], axis=-1
+    )
+
+
+def paired_permutation(
+    units_a: np.ndarray, units_b: np.ndarray, permutations: int = DEFAULT_PERMUTATIONS,
+    seed: int | None = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Test de randomisation approchée apparié, au niveau article.
+
+    Sous l'hypothèse nulle, les deux exécutions sont interchangeables sur
+    chaque article: chaque permutation échange les comptes d'un article avec
+    probabilité 1/2. Les totaux permutés s'obtiennent par un produit
+    matriciel (masque d'échange × écarts par article), par blocs.
+
+    Args:
+        units_a: Comptes par article de la référence (article × colonnes).
+        units_b: Comptes par article de l'exécution comparée, mêmes articles.
+        permutations: Nombre de permutations.
+        seed: Graine du générateur (None: non reproductible).
+
+    Returns:
+        Tuple (écarts observés B - A, p-valeurs bilatérales), une valeur par
+        métrique de `unit_statistics`.
+    """
+    rng = np.random.default_rng(seed)
+    total_a, total_b = units_a.sum(axis=0), units_b.sum(axis=0)
+    observed = unit_statistics(total_b) - unit_statistics(total_a)
+    threshold = np.abs(observed) - 1e-12
+    extreme = np.zeros_like(observed)
+    difference = units_b - units_a
+    size = len(units_a)
+    chunk = max(1, BOOTSTRAP_CHUNK // max(size, 1))
+    for start in range(0, permutations, chunk):
+        stop = min(start + chunk, permutations)
+        swaps = (rng.random((stop - start, size)) < 0.5) @ difference
+        deltas = unit_statistics(total_b - swaps) - unit_statistics(total_a + swaps)
+        extreme += (np.abs(deltas) >= threshold).sum(axis=0)
+    return observed, (extreme + 1) / (permutations + 1)
+
+
+def compare_runs(
+    gold_dir: Path,
+    run_dirs: list[Path],
+    jobs: int = 1,
+    align_threshold: float | None = None,
+    permutations: int = DEFAULT_PERMUTATIONS,
+    seed: int | None = 0,
+) -> RunComparison:
+    """
+    Évalue plusieurs exécutions sur le même gold et les compare à la première.
+
+    Args:
+        gold_dir: Répertoire des annotations de référence.
+        run_dirs: Répertoires de prédictions, la référence en premier.
+        jobs: Nombre de processus (1 = exécution séquentielle).
+        align_threshold: Seuil d'alignement par similarité (None: par id).
+        permutations: Nombre de permutations des tests appariés (0: sans test).
+        seed: Graine des permutations.
+
+    Returns:
+        RunComparison sur les articles prédits par toutes les exécutions.
+    """
+    runs = run_names(run_dirs)
+    gold = load_gold(gold_dir, align_threshold is not None)
+    articles = []
+    for name in gold:
+        missing = [run for run, run_dir in zip(runs, run_dirs)
+                   if not (run_dir / f"{name}.json").exists()]
+        if missing:
+            print(f"⚠️  {name} ignoré: pas de prédiction pour {', '.join(missing)}")
+        else:
+            articles.append(name)
+
+    tasks = [
+        (name, run_dir / f"{name}.json", align_threshold)
+        for run_dir in run_dirs
+        for name in articles
+    ]
+    if jobs <= 1 or len(tasks) <= 1:
+        _install_gold(gold)
+        predictions = list(map(_evaluate_prediction, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_install_gold, initargs=(gold,)
+        ) as executor:
+            predictions = list(executor.map(_evaluate_prediction, tasks, chunksize=chunksize))
+
+    accumulators = {}
+    for i, run in enumerate(runs):
+        corpus = CorpusAccumulator()
+        for name, predicted in zip(articles, predictions[i * len(articles):]):
+            corpus.add(
+                name, gold[name].fallacies, predicted.fallacies,
+                gold[name].reliability, predicted.reliability,
+            )
+        accumulators[run] = corpus
+
+    comparison = RunComparison(
+        runs, articles, {run: corpus.compute() for run, corpus in accumulators.items()}
+    )
+    types = sorted({t for corpus in accumulators.values() for t in corpus.fallacy_types()})
+    units = {run: corpus.article_units(types) for run, corpus in accumulators.items()}
+    baseline = runs[0]
+    for fallacy_type in types:
+        comparison.per_type[fallacy_type] = {
+            run: {
+                "f1": metrics.fallacy_per_type.get(fallacy_type, {}).get("f1", 0.0),
+                "support": metrics.fallacy_per_type.get(fallacy_type, {}).get("support", 0),
+            }
+            for run, metrics in comparison.metrics.items()
+        }
+
+    for run in runs[1:]:
+        if permutations:
+            deltas, p_values = paired_permutation(units[baseline], units[run], permutations, seed)
+        else:
+            deltas = unit_statistics(units[run].sum(axis=0)) - unit_statistics(
+                units[baseline].sum(axis=0)
+            )
+            p_values = np.full_like(deltas, np.nan)
+        count = len(GLOBAL_METRICS)
+        # Fiabilité non annotée dans le gold: pas d'écart de MAE à tester
+        scored = all(comparison.metrics[r].reliability_count for r in (baseline, run))
+        comparison.significance[run] = {
+            metric: {"delta": float(deltas[i]), "p_value": float(p_values[i])}
+            for i, metric in enumerate(GLOBAL_METRICS)
+            if scored or metric != "reliability_mae"
+        }
+        adjusted = holm(p_values[count:]) if permutations else p_values[count:]
+        for j, fallacy_type in enumerate(types):
+            comparison.per_type[fallacy_type][run].update(
+                delta=float(deltas[count + j]),
+                p_value=float(p_values[count + j]),
+                p_holm=float(adjusted[j]),
+            )
+    return comparison
+
+
+MATRIX_COLUMNS = [
+    "run",
+    "articles",
+    "fallacy_micro_precision",
+    "fallacy_micro_recall",
+    "fallacy_micro_f1",
+    "fallacy_macro_f1",
+    "reliability_mae_micro",
+    "reliability_mae_macro",
+    "reliability_spearman",
+    "reliability_qwk",
+    *(f"{metric}_{part}" for metric in GLOBAL_METRICS for part in ("delta", "p_value")),
+]
+
+
+def export_comparison_csv(comparison: RunComparison, output_path: Path) -> Path:
+    """
+    Exporte la matrice de comparaison et, à côté, le détail par type.
+
+    Returns:
+        Chemin du fichier par type (`<nom>_per_type.csv`)
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(MATRIX_COLUMNS)
+        for run in comparison.runs:
+            metrics = comparison.metrics[run]
+            tests = comparison.significance.get(run, {})
+            reliability = (
+                metrics.reliability_mae_micro, metrics.reliability_mae_macro,
+                metrics.reliability_correlation, metrics.reliability_qwk,
+            )
+            writer.writerow([
+                run,
+                metrics.article_count,
+                *(f"{value:.3f}" for value in (
+                    metrics.fallacy_micro_precision, metrics.fallacy_micro_recall,
+                    metrics.fallacy_micro_f1, metrics.fallacy_macro_f1,
+                )),
+                # Cellules vides si la fiabilité n'est pas annotée dans le gold
+                *(f"{value:.3f}" if metrics.reliability_count else "" for value in reliability),
+                *(
+                    _cell(tests[metric][part]) if metric in tests else ""
+                    for metric in GLOBAL_METRICS
+                    for part in ("delta", "p_value")
+                ),
+            ])
+
+    per_type_path = output_path.with_name(f"{output_path.stem}_per_type.csv")
+    with open(per_type_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["fallacy", "run", "support", "f1", "delta", "p_value", "p_holm"])
+        for fallacy_type, by_run in comparison.per_type.items():
+            for run in comparison.runs:
+                scores = by_run[run]
+                writer.writerow([
+                    fallacy_type, run, scores["support"], f"{scores['f1']:.3f}",
+                    *(_cell(scores[part]) if part in scores else ""
+                      for part in ("delta", "p_value", "p_holm")),
+                ])
+    return per_type_path
+
+
+def _cell(value: float) -> str:
+    """Cellule CSV d'un écart ou d'une p-valeur (vide si non calculée)."""
+    return "" if np.isnan(value) else f"{value:.4f}"
+
+
+def print_comparison_report(comparison: RunComparison, verbose: bool = True) -> None:
+    """Affiche la matrice de comparaison, les tests appariés et les écarts par type."""
+    print(
+        f"\n🆚 COMPARAISON DE {len(comparison.runs)} EXÉCUTIONS "
+        f"({len(comparison.articles)} articles communs, référence: {comparison.baseline}):"
+    )
+    width = max(len(run) for run in comparison.runs)
+    print(f"   {'':{width}}  F1 micro  F1 macro  MAE    QWK")
+    for run in comparison.runs:
+        metrics = comparison.metrics[run]
+        reliability = (
+            f"{metrics.reliability_mae_micro:.2f}  {metrics.reliability_qwk:5.2f}"
+            if metrics.reliability_count else "   —      —"
+        )
+        print(
+            f"   {run:{width}}  {metrics.fallacy_micro_f1:8.2%}  {metrics.fallacy_macro_f1:8.2%}"
+            f"  {reliability}"
+        )
+
+    for run, tests in comparison.significance.items():
+        print(f"\n   {run} vs {comparison.baseline} (randomisation appariée par article):")
+        for metric, test in tests.items():
+            p_value = "" if np.isnan(test["p_value"]) else f" (p={test['p_value']:.4f})"
+            print(f"   - {metric}: {test['delta']:+.3f}{p_value}")
+
+    if verbose and len(comparison.runs) > 1 and comparison.per_type:
+        print("\n   Écart de F1 par type (p ajustée par Holm):")
+        for fallacy_type, by_run in comparison.per_type.items():
+            support = by_run[comparison.baseline]["support"]
+            deltas = ", ".join(
+                f"{run} {scores['delta']:+.2f}"
+                + ("" if np.isnan(scores["p_holm"]) else f" (p={scores['p_holm']:.3f})")
+                for run, scores in by_run.items()
+                if run != comparison.baseline
+            )
+            print(f"   - {fallacy_type} ({support}): {deltas}")
@@ -0,0 +1,499 @@
+"""
+Métriques d'évaluation à l'échelle du corpus (NumPy).
+
+Les étiquettes de sophismes de tous les articles sont rassemblées en un
+tenseur de confusion article × argument × type, stocké à plat: une ligne par
+argument (aligné par identifiant, article après article) et une colonne par
+type de sophisme, plus l'article de chaque ligne. Les vrais positifs, faux
+positifs et faux négatifs sont calculés en une passe vectorisée, puis réduits
+par article et par type pour obtenir:
+
+- les moyennes micro (comptes cumulés sur tout le corpus);
+- les moyennes macro (moyenne des scores par type de sophisme);
+- les scores par type, avec leur support (occurrences dans le gold).
+
+La fiabilité suit le même principe: MAE micro sur tous les arguments alignés
+et MAE macro (moyenne des MAE par article ayant au moins un argument aligné).
+Seuls comptent les arguments dont la fiabilité est annotée des deux côtés: un
+gold importé sans score de fiabilité n'entre dans aucune de ces mesures.
+L'accord ordinal (Spearman, Kendall tau-b, kappa quadratique) est calculé sur
+la matrice de confusion 5 × 5 de tout le corpus, construite en une passe
+vectorisée (voir `scripts.agreement`).
+
+Des intervalles de confiance bootstrap (percentiles) sont disponibles pour les
+métriques micro, en rééchantillonnant les articles ou les arguments.
+
+Les métriques sont calculées à partir d'un état compact (`CorpusState`):
+comptes de chaque article, comptes de chaque type et matrice de confusion
+de la fiabilité. Cet état se sérialise en JSON et se fusionne: des
+fragments d'un lot évalués séparément donnent, une fois réunis, exactement
+les métriques du lot entier (voir `scripts.shards`).
+
+Nécessite NumPy (extra `benchmark`).
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from scripts.agreement import (
+    RELIABILITY_LEVELS,
+    Confusion,
+    kendall_tau,
+    quadratic_kappa,
+    spearman,
+)
+
+BOOTSTRAP_LEVELS = ("article", "argument")
+BOOTSTRAP_CHUNK = 1 << 22  # éléments tirés par bloc de rééchantillonnage
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Division élément par élément, nulle quand le dénominateur est nul."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(
+        numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0
+    )
+
+
+def _scores(tp: np.ndarray, fp: np.ndarray, fn: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Precision, recall et F1 à partir des comptes."""
+    precision = _ratio(tp, tp + fp)
+    recall = _ratio(tp, tp + fn)
+    return precision, recall, _ratio(2 * precision * recall, precision + recall)
+
+
+def _intervals(totals: np.ndarray, confidence: float) -> dict[str, tuple[float, float]]:
+    """Bornes percentiles des métriques micro, un total (tp, fp, fn, erreurs, alignés) par tirage."""
+    tp, fp, fn, error_sum, aligned = totals.T
+    precision, recall, f1 = _scores(tp, fp, fn)
+    samples = {
+        "fallacy_precision": precision,
+        "fallacy_recall": recall,
+        "fallacy_f1": f1,
+        "reliability_mae": _ratio(error_sum, aligned),
+    }
+    tail = (1 - confidence) / 2 * 100
+    return {
+        name: tuple(float(bound) for bound in np.percentile(values, [tail, 100 - tail]))
+        for name, values in samples.items()
+    }
+
+
+def _resample_units(units: np.ndarray, resamples: int, rng) -> np.ndarray:
+    """Sommes des lignes de `units` tirées avec remise, un total par rééchantillon."""
+    size = len(units)
+    totals = np.zeros((resamples, units.shape[1]))
+    if not size:
+        return totals
+    chunk = max(1, BOOTSTRAP_CHUNK // size)
+    for start in range(0, resamples, chunk):
+        stop = min(start + chunk, resamples)
+        indices = rng.integers(0, size, size=(stop - start, size))
+        totals[start:stop] = units[indices].sum(axis=1)
+    return totals
+
+
+@dataclass
+class CorpusMetrics:
+    """Métriques agrégées sur un corpus d'articles."""
+
+    article_count: int = 0
+    argument_count: int = 0
+
+    fallacy_micro_precision: float = 0.0
+    fallacy_micro_recall: float = 0.0
+    fallacy_micro_f1: float = 0.0
+    fallacy_macro_precision: float = 0.0
+    fallacy_macro_recall: float = 0.0
+    fallacy_macro_f1: float = 0.0
+    # type -> {"precision", "recall", "f1", "support"}
+    fallacy_per_type: dict[str, dict[str, float]] = field(default_factory=dict)
+    # F1 micro de chaque article, dans l'ordre d'ajout
+    fallacy_article_f1: list[float] = field(default_factory=list)
+
+    reliability_mae_micro: float = 0.0
+    reliability_mae_macro: float = 0.0
+    reliability_correlation: float = 0.0  # Spearman
+    reliability_kendall: float = 0.0
+    reliability_qwk: float = 0.0
+    reliability_confusion: Confusion = field(default_factory=list)
+    # Arguments alignés notés des deux côtés; 0: fiabilité non annotée, métriques ignorées
+    reliability_count: int = 0
+
+    def to_dict(self) -> dict:
+        scored = self.reliability_count > 0
+        return {
+            "article_count": self.article_count,
+            "argument_count": self.argument_count,
+            "fallacy_micro_precision": round(self.fallacy_micro_precision, 3),
+            "fallacy_micro_recall": round(self.fallacy_micro_recall, 3),
+            "fallacy_micro_f1": round(self.fallacy_micro_f1, 3),
+            "fallacy_macro_precision": round(self.fallacy_macro_precision, 3),
+            "fallacy_macro_recall": round(self.fallacy_macro_recall, 3),
+            "fallacy_macro_f1": round(self.fallacy_macro_f1, 3),
+            "reliability_mae_micro": round(self.reliability_mae_micro, 3) if scored else None,
+            "reliability_mae_macro": round(self.reliability_mae_macro, 3) if scored else None,
+            "reliability_correlation": round(self.reliability_correlation, 3) if scored else None,
+            "reliability_kendall": round(self.reliability_kendall, 3) if scored else None,
+            "reliability_qwk": round(self.reliability_qwk, 3) if scored else None,
+            "reliability_confusion": self.reliability_confusion,
+            "reliability_count": self.reliability_count,
+        }
+
+
+ARTICLE_COLUMNS = ("arguments", "tp", "fp", "fn", "reliability_error", "reliability_aligned")
+
+
+def _empty_confusion() -> Confusion:
+    return [[0] * RELIABILITY_LEVELS for _ in range(RELIABILITY_LEVELS)]
+
+
+@dataclass
+class CorpusState:
+    """
+    État agrégeable des métriques de corpus (un lot ou un fragment de lot).
+
+    Contient tout ce dont `compute` a besoin, et rien de plus: par article
+    les comptes de `ARTICLE_COLUMNS`, par type de sophisme les comptes
+    (tp, fp, fn), et la matrice de confusion de la fiabilité, d'où se
+    déduisent les rangs de Spearman et de Kendall et le kappa.
+    """
+
+    articles: list[str] = field(default_factory=list)
+    # Une ligne par article, colonnes ARTICLE_COLUMNS
+    article_counts: list[list[float]] = field(default_factory=list)
+    # type -> [tp, fp, fn]
+    type_counts: dict[str, list[int]] = field(default_factory=dict)
+    reliability_confusion: Confusion = field(default_factory=_empty_confusion)
+
+    @classmethod
+    def merge(cls, states: list[CorpusState]) -> CorpusState:
+        """
+        Réunit des états d'articles disjoints.
+
+        Les articles sont remis dans l'ordre de `evaluate.batch_evaluate`
+        (noms de fichiers triés): le résultat ne dépend pas du découpage.
+
+        Raises:
+            ValueError: si un article figure dans plusieurs états.
+        """
+        rows = sorted(
+            ((name, counts) for state in states
+             for name, counts in zip(state.articles, state.article_counts)),
+            key=lambda row: f"{row[0]}.json",
+        )
+        names = [name for name, _ in rows]
+        duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Articles présents dans plusieurs fragments: {', '.join(duplicates)}")
+        merged = cls(names, [counts for _, counts in rows])
+        for state in states:
+            for name, counts in state.type_counts.items():
+                total = merged.type_counts.setdefault(name, [0, 0, 0])
+                for i, count in enumerate(counts):
+                    total[i] += count
+            for i, row in enumerate(state.reliability_confusion):
+                for j, count in enumerate(row):
+                    merged.reliability_confusion[i][j] += count
+        return merged
+
+    def units(self) -> np.ndarray:
+        """Matrice article × (tp, fp, fn, somme des erreurs de fiabilité, alignés)."""
+        counts = np.array(self.article_counts, dtype=float).reshape(-1, len(ARTICLE_COLUMNS))
+        return counts[:, 1:]
+
+    def bootstrap(
+        self, resamples: int, confidence: float = 0.95, seed: int | None = 0
+    ) -> dict[str, tuple[float, float]]:
+        """Intervalles bootstrap par article (voir `CorpusAccumulator.bootstrap`)."""
+        rng = np.random.default_rng(seed)
+        return _intervals(_resample_units(self.units(), resamples, rng), confidence)
+
+    def compute(self) -> CorpusMetrics:
+        """Calcule les métriques micro, macro et par type (types triés par nom)."""
+        counts = np.array(self.article_counts, dtype=float).reshape(-1, len(ARTICLE_COLUMNS))
+        arguments, tp, fp, fn, error_sum, aligned = counts.T
+        metrics = CorpusMetrics(
+            article_count=len(self.articles), argument_count=int(arguments.sum())
+        )
+
+        types = sorted(self.type_counts)
+        tp_type, fp_type, fn_type = np.array(
+            [self.type_counts[name] for name in types], dtype=np.int64
+        ).reshape(-1, 3).T
+        precision, recall, f1 = _scores(tp_type, fp_type, fn_type)
+        metrics.fallacy_per_type = {
+            name: {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1": float(f1[i]),
+                "support": int(tp_type[i] + fn_type[i]),
+            }
+            for i, name in enumerate(types)
+        }
+        if types:
+            metrics.fallacy_macro_precision = float(precision.mean())
+            metrics.fallacy_macro_recall = float(recall.mean())
+            metrics.fallacy_macro_f1 = float(f1.mean())
+
+        micro = _scores(tp_type.sum(), fp_type.sum(), fn_type.sum())
+        (
+            metrics.fallacy_micro_precision,
+            metrics.fallacy_micro_recall,
+            metrics.fallacy_micro_f1,
+        ) = (float(score) for score in micro)
+        metrics.fallacy_article_f1 = _scores(tp, fp, fn)[2].tolist()
+
+        metrics.reliability_count = int(aligned.sum())
+        if aligned.sum():
+            metrics.reliability_mae_micro = float(error_sum.sum() / aligned.sum())
+            metrics.reliability_mae_macro = float(_ratio(error_sum, aligned)[aligned > 0].mean())
+
+        confusion = self.reliability_confusion
+        metrics.reliability_confusion = confusion
+        metrics.reliability_correlation = spearman(confusion)
+        metrics.reliability_kendall = kendall_tau(confusion)
+        metrics.reliability_qwk = quadratic_kappa(confusion)
+
+        return metrics
+
+    def to_dict(self) -> dict:
+        return {
+            "articles": self.articles,
+            "article_columns": list(ARTICLE_COLUMNS),
+            "article_counts": self.article_counts,
+            "type_counts": self.type_counts,
+            "reliability_confusion": self.reliability_confusion,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CorpusState:
+        if data.get("article_columns", list(ARTICLE_COLUMNS)) != list(ARTICLE_COLUMNS):
+            raise ValueError("Colonnes d'articles inattendues dans l'état de corpus")
+        return cls(
+            articles=list(data["articles"]),
+            article_counts=[list(row) for row in data["article_counts"]],
+            type_counts={name: list(counts) for name, counts in data["type_counts"].items()},
+            reliability_confusion=[list(row) for row in data["reliability_confusion"]],
+        )
+
+
+class CorpusAccumulator:
+    """
+    Accumule les étiquettes du corpus article par article.
+
+    Seuls des index entiers compacts sont conservés pendant l'accumulation;
+    le tenseur n'est construit qu'au calcul des métriques.
+    """
+
+    def __init__(self):
+        self.articles: list[str] = []
+        self._types: dict[str, int] = {}
+        self._article_offsets = array("q")
+        self._rows = 0
+        # Cellules (ligne, type) à vrai dans le gold et dans la prédiction
+        self._gold_rows, self._gold_types = array("q"), array("q")
+        self._pred_rows, self._pred_types = array("q"), array("q")
+        # Couples de fiabilité alignés
+        self._reliability_article = array("q")
+        self._reliability_gold, self._reliability_pred = array("d"), array("d")
+
+    def _type_index(self, fallacy: str) -> int:
+        return self._types.setdefault(fallacy, len(self._types))
+
+    def add(
+        self,
+        name: str,
+        gold_fallacies: dict[int, list[str]],
+        pred_fallacies: dict[int, list[str]],
+        gold_reliability: dict[int, int],
+        pred_reliability: dict[int, int],
+    ) -> None:
+        """
+        Ajoute les annotations d'un article (voir `evaluate.extract_annotations`).
+
+        Les arguments sont alignés par identifiant, comme dans
+        `evaluate.compute_fallacy_metrics`.
+        """
+        article = len(self.articles)
+        self.articles.append(name)
+        self._article_offsets.append(self._rows)
+
+        for arg_id in gold_fallacies.keys() | pred_fallacies.keys():
+            row = self._rows
+            self._rows += 1
+            for fallacy in set(gold_fallacies.get(arg_id, ())):
+                self._gold_rows.append(row)
+                self._gold_types.append(self._type_index(fallacy))
+            for fallacy in set(pred_fallacies.get(arg_id, ())):
+                self._pred_rows.append(row)
+                self._pred_types.append(self._type_index(fallacy))
+
+        for arg_id in gold_reliability.keys() & pred_reliability.keys():
+            self._reliability_article.append(article)
+            self._reliability_gold.append(gold_reliability[arg_id])
+            self._reliability_pred.append(pred_reliability[arg_id])
+
+    def confusion_tensor(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Construit les matrices booléennes gold et prédiction (argument × type).
+
+        Returns:
+            Tuple (gold, prédiction), de forme (arguments, types).
+        """
+        shape = (self._rows, len(self._types))
+        gold = np.zeros(shape, dtype=bool)
+        pred = np.zeros(shape, dtype=bool)
+        gold[np.frombuffer(self._gold_rows, dtype=np.int64),
+             np.frombuffer(self._gold_types, dtype=np.int64)] = True
+        pred[np.frombuffer(self._pred_rows, dtype=np.int64),
+             np.frombuffer(self._pred_types, dtype=np.int64)] = True
+        return gold, pred
+
+    def _per_article(self, cells: np.ndarray) -> np.ndarray:
+        """Somme les lignes (arguments) de chaque article: matrice article × type."""
+        offsets = np.frombuffer(self._article_offsets, dtype=np.int64)
+        sizes = np.diff(np.append(offsets, self._rows))
+        result = np.zeros((len(offsets), cells.shape[1]), dtype=np.int64)
+        # reduceat exige des segments non vides
+        non_empty = sizes > 0
+        if non_empty.any():
+            result[non_empty] = np.add.reduceat(cells, offsets[non_empty], axis=0)
+        return result
+
+    def reliability_confusion(self) -> Confusion:
+        """Matrice de confusion 5 × 5 des scores de fiabilité alignés (lignes: gold)."""
+        gold, pred = (
+            np.clip(np.rint(np.frombuffer(scores)), 1, RELIABILITY_LEVELS).astype(np.int64) - 1
+            for scores in (self._reliability_gold, self._reliability_pred)
+        )
+        cells = np.bincount(gold * RELIABILITY_LEVELS + pred, minlength=RELIABILITY_LEVELS**2)
+        return cells.reshape(RELIABILITY_LEVELS, RELIABILITY_LEVELS).tolist()
+
+    def _row_counts(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vrais positifs, faux positifs et faux négatifs de chaque argument."""
+        gold, pred = self.confusion_tensor()
+        return (
+            (gold & pred).sum(axis=1),
+            (pred & ~gold).sum(axis=1),
+            (gold & ~pred).sum(axis=1),
+        )
+
+    def fallacy_types(self) -> list[str]:
+        """Types de sophismes rencontrés (gold ou prédiction), dans l'ordre d'apparition."""
+        return list(self._types)
+
+    def article_units(self, types: list[str]) -> np.ndarray:
+        """
+        Comptes de chaque article, sur une liste de types commune à plusieurs corpus.
+
+        Returns:
+            Matrice article × (3 × types + 2): tp, fp et fn de chaque type de
+            `types` (nuls pour un type absent de ce corpus), puis somme des
+            erreurs de fiabilité et nombre d'arguments alignés.
+        """
+        gold, pred = self.confusion_tensor()
+        units = np.zeros((len(self.articles), 3 * len(types) + 2))
+        known = [(j, self._types[name]) for j, name in enumerate(types) if name in self._types]
+        if known:
+            target, source = (np.array(indices) for indices in zip(*known))
+            for offset, cells in enumerate((gold & pred, pred & ~gold, gold & ~pred)):
+                units[:, 3 * target + offset] = self._per_article(cells[:, source])
+        errors = np.abs(
+            np.frombuffer(self._reliability_gold) - np.frombuffer(self._reliability_pred)
+        )
+        articles = np.frombuffer(self._reliability_article, dtype=np.int64)
+        units[:, -2] = np.bincount(articles, weights=errors, minlength=len(self.articles))
+        units[:, -1] = np.bincount(articles, minlength=len(self.articles))
+        return units
+
+    def bootstrap(
+        self,
+        resamples: int,
+        level: str = "article",
+        confidence: float = 0.95,
+        seed: int | None = 0,
+    ) -> dict[str, tuple[float, float]]:
+        """
+        Intervalles de confiance bootstrap des métriques micro.
+
+        - `article`: les articles sont tirés avec remise (tableaux d'index
+          vectorisés, par blocs pour borner la mémoire); respecte la
+          corrélation entre arguments d'un même article.
+        - `argument`: les arguments sont tirés avec remise. Un tirage ne
+          dépend que du nombre de fois où chaque profil distinct (tp, fp, fn)
+          ou erreur de fiabilité est tiré: une loi multinomiale sur ces
+          profils donne la même distribution sans matérialiser les index.
+
+        Args:
+            resamples: Nombre de rééchantillonnages.
+            level: Unité rééchantillonnée (`article` ou `argument`).
+            confidence: Niveau de confiance de l'intervalle.
+            seed: Graine du générateur (None: non reproductible).
+
+        Returns:
+            Bornes (basse, haute) par métrique: fallacy_precision,
+            fallacy_recall, fallacy_f1, reliability_mae.
+        """
+        if level not in BOOTSTRAP_LEVELS:
+            raise ValueError(f"Niveau de bootstrap inconnu: {level}")
+        rng = np.random.default_rng(seed)
+
+        counts = np.stack(self._row_counts(), axis=1)
+        errors = np.abs(
+            np.frombuffer(self._reliability_gold) - np.frombuffer(self._reliability_pred)
+        )
+        if level == "article":
+            # Par article: tp, fp, fn, somme des erreurs, nombre d'arguments alignés
+            totals = _resample_units(self.state().units(), resamples, rng)
+        else:
+            totals = np.hstack([
+                self._resample_profiles(counts, resamples, rng),
+                self._resample_profiles(np.column_stack([errors, np.ones_like(errors)]),
+                                        resamples, rng),
+            ])
+
+        return _intervals(totals, confidence)
+
+    @staticmethod
+    def _resample_profiles(rows: np.ndarray, resamples: int, rng) -> np.ndarray:
+        """Comme `_resample_units`, par tirage multinomial sur les lignes distinctes."""
+        if not len(rows):
+            return np.zeros((resamples, rows.shape[1]))
+        profiles, frequency = np.unique(rows, axis=0, return_counts=True)
+        draws = rng.multinomial(len(rows), frequency / len(rows), size=resamples)
+        return draws @ profiles.astype(float)
+
+    def state(self) -> CorpusState:
+        """État compact et agrégeable du corpus accumulé."""
+        gold, pred = self.confusion_tensor()
+        cells = [self._per_article(c) for c in (gold & pred, pred & ~gold, gold & ~pred)]
+        offsets = np.frombuffer(self._article_offsets, dtype=np.int64)
+        errors = np.abs(
+            np.frombuffer(self._reliability_gold) - np.frombuffer(self._reliability_pred)
+        )
+        articles = np.frombuffer(self._reliability_article, dtype=np.int64)
+        article_counts = np.column_stack([
+            np.diff(np.append(offsets, self._rows)),
+            *(c.sum(axis=1) for c in cells),
+            np.bincount(articles, weights=errors, minlength=len(self.articles)),
+            np.bincount(articles, minlength=len(self.articles)),
+        ])
+        return CorpusState(
+            articles=list(self.articles),
+            article_counts=article_counts.tolist(),
+            type_counts={
+                name: [int(c[:, i].sum()) for c in cells] for name, i in self._types.items()
+            },
+            reliability_confusion=self.reliability_confusion(),
+        )
+
+    def compute(self) -> CorpusMetrics:
+        """Calcule les métriques micro, macro et par type sur tout le corpus."""
+        return self.state().compute()
@@ -0,0 +1,155 @@
+"""
+Cache SQLite des évaluations pour les relances incrémentales du benchmark.
+
+Chaque résultat de `evaluate.evaluate_files` est indexé par l'empreinte
+SHA-256 du fichier gold, du fichier prédit, de la version de l'évaluateur
+(empreinte de son code source) et des options d'évaluation. Une relance
+`--batch` ne recalcule donc que les paires modifiées; toute modification du
+code d'évaluation invalide naturellement les anciennes entrées.
+
+Politique d'éviction: les entrées non lues depuis `max_age` secondes sont
+supprimées, puis les moins récemment lues jusqu'à repasser sous `max_bytes`.
+
+Les valeurs sont sérialisées avec pickle: le cache est un fichier local de
+l'utilisateur, à ne pas partager.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+HASH_CHUNK = 1 << 20
+
+# Modules dont le code détermine les métriques calculées
+EVALUATOR_MODULES = (
+    "evaluate.py", "agreement.py", "alignment.py", "text_overlap.py", "fallacy_index.py",
+    "model.py", "reader.py",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def default_cache_path() -> Path:
+    """Emplacement par défaut du cache (`$XDG_CACHE_HOME` ou `~/.cache`)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "rhetorical-analysis" / "evaluate.sqlite"
+
+
+def file_digest(path: Path) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier, lu par blocs."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def evaluator_version() -> str:
+    """Empreinte du code source de l'évaluateur."""
+    digest = hashlib.sha256()
+    scripts_dir = Path(__file__).parent
+    for name in EVALUATOR_MODULES:
+        digest.update(name.encode())
+        digest.update((scripts_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+class EvaluationCache:
+    """Cache des résultats d'évaluation, indexé par le contenu des fichiers."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.path = Path(path) if path else default_cache_path()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.version = evaluator_version()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_accessed ON evaluations (accessed)")
+
+    def key(self, gold_file: Path, pred_file: Path, options: object = None) -> str:
+        """Clé d'une paire: contenu des deux fichiers, version de l'évaluateur, options."""
+        parts = [file_digest(gold_file), file_digest(pred_file), self.version, repr(options)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> object | None:
+        """Résultat mis en cache pour `key`, ou None (l'accès est horodaté)."""
+        row = self._db.execute("SELECT value FROM evaluations WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._db:
+            self._db.execute(
+                "UPDATE evaluations SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: object) -> None:
+        """Enregistre le résultat d'une paire."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+
+    def evict(self) -> int:
+        """
+        Applique la politique d'éviction (âge, puis taille totale).
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._db:
+            removed = self._db.execute(
+                "DELETE FROM evaluations WHERE accessed < ?", (time.time() - self.max_age,)
+            ).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM evaluations").fetchone()[0]
+            if total > self.max_bytes:
+                # Les moins récemment lues d'abord, jusqu'à repasser sous la limite
+                oldest = self._db.execute(
+                    "SELECT key, size FROM evaluations ORDER BY accessed, created"
+                )
+                stale = []
+                for key, size in oldest:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._db.executemany("DELETE FROM evaluations WHERE key = ?", stale)
+                removed += len(stale)
+        return removed
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> EvaluationCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
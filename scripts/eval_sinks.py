@@ -0,0 +1,248 @@
+"""
+Sorties incrémentales des résultats d'évaluation (mode batch).
+
+Chaque article est écrit dès que ses métriques sont disponibles, puis la
+sortie est vidée sur disque: un long lot peut être suivi en direct
+(`tail -f resultats.ndjson`) et reste exploitable s'il est interrompu.
+
+Formats:
+- `ndjson`: un objet JSON complet par ligne (détails par type de sophisme,
+  matrice de confusion et composants Toulmin compris);
+- `csv`: une ligne par article, les champs imbriqués encodés en JSON;
+- `parquet`: colonnes typées (nécessite pyarrow, extra `parquet`), écrites
+  par groupes de lignes; le fichier n'est lisible qu'une fois fermé, ce qui
+  est garanti aussi sur interruption (Ctrl+C).
+
+Le format est déduit de l'extension (`.csv`, `.ndjson`/`.jsonl`, `.parquet`).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from scripts.text_overlap import TOULMIN_COMPONENTS
+
+if TYPE_CHECKING:
+    from scripts.evaluate import EvaluationMetrics
+
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet"}
+PARQUET_ROW_GROUP = 256
+
+# Colonnes historiques de l'export CSV, dans leur ordre, puis les nouvelles
+CSV_COLUMNS = [
+    "article",
+    "fallacy_precision",
+    "fallacy_recall",
+    "fallacy_f1",
+    "reliability_mae",
+    "arg_count_gold",
+    "arg_count_pred",
+    "reliability_spearman",
+    "reliability_kendall",
+    "reliability_qwk",
+    "reliability_confusion",
+    "reliability_count",
+    *(
+        f"toulmin_{component}_{score}"
+        for component in TOULMIN_COMPONENTS
+        for score in ("rouge_l", "token_f1")
+    ),
+    "fallacy_details",
+]
+TEXT_COLUMNS = frozenset({"article", "reliability_confusion", "fallacy_details"})
+INTEGER_COLUMNS = frozenset({"arg_count_gold", "arg_count_pred", "reliability_count"})
+
+
+def full_record(name: str, metrics: EvaluationMetrics) -> dict:
+    """Toutes les métriques d'un article, champs imbriqués compris."""
+    return {
+        "article": name,
+        **metrics.to_dict(),
+        "fallacy_details": {
+            fallacy: {score: round(value, 3) for score, value in scores.items()}
+            for fallacy, scores in sorted(metrics.fallacy_details.items())
+        },
+    }
+
+
+def flat_record(name: str, metrics: EvaluationMetrics) -> dict:
+    """Une ligne par article (colonnes `CSV_COLUMNS`), champs imbriqués en JSON."""
+    record = full_record(name, metrics)
+    # Fiabilité non annotée dans le gold: cellules vides, pas de scores par défaut
+    scored = metrics.reliability_count > 0
+    row = {
+        "article": name,
+        "fallacy_precision": metrics.fallacy_precision,
+        "fallacy_recall": metrics.fallacy_recall,
+        "fallacy_f1": metrics.fallacy_f1,
+        "reliability_mae": metrics.reliability_mae if scored else None,
+        "reliability_spearman": metrics.reliability_correlation if scored else None,
+        "reliability_kendall": metrics.reliability_kendall if scored else None,
+        "reliability_qwk": metrics.reliability_qwk if scored else None,
+        "reliability_confusion": json.dumps(metrics.reliability_confusion),
+        "reliability_count": metrics.reliability_count,
+        "arg_count_gold": metrics.argument_count_gold,
+        "arg_count_pred": metrics.argument_count_predicted,
+        "fallacy_details": json.dumps(record["fallacy_details"], ensure_ascii=False),
+    }
+    for component in TOULMIN_COMPONENTS:
+        scores = metrics.toulmin_details.get(component, {})
+        for score in ("rouge_l", "token_f1"):
+            row[f"toulmin_{component}_{score}"] = scores.get(score)
+    return row
+
+
+def _csv_cell(column: str, value: object) -> object:
+    """
+    Cellule CSV: métriques à 3 décimales, valeur absente vide.
+
+    Le format suit la colonne et non le type: un dénominateur nul donne
+    l'entier 0, écrit `0.000` comme les autres scores.
+    """
+    if value is None:
+        return ""
+    if column in TEXT_COLUMNS or column in INTEGER_COLUMNS:
+        return value
+    return f"{value:.3f}"
+
+
+class ResultSink(ABC):
+    """Destination des résultats: `write` par article, `close` en fin de lot."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+
+    @abstractmethod
+    def write(self, name: str, metrics: EvaluationMetrics) -> None:
+        """Écrit les métriques d'un article."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Termine la sortie (fichier complet et fermé)."""
+
+    def __enter__(self) -> ResultSink:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class NdjsonSink(ResultSink):
+    """Un objet JSON par ligne, vidé sur disque après chaque article."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, name: str, metrics: EvaluationMetrics) -> None:
+        self._file.write(json.dumps(full_record(name, metrics), ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(ResultSink):
+    """Une ligne CSV par article, vidée sur disque après chaque article."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_COLUMNS)
+        self._file.flush()
+
+    def write(self, name: str, metrics: EvaluationMetrics) -> None:
+        row = flat_record(name, metrics)
+        self._writer.writerow([_csv_cell(column, row[column]) for column in CSV_COLUMNS])
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _parquet_type(pa, column: str):
+    """Type Arrow d'une colonne de `CSV_COLUMNS`."""
+    if column in TEXT_COLUMNS:
+        return pa.string()
+    return pa.int64() if column in INTEGER_COLUMNS else pa.float64()
+
+
+class ParquetSink(ResultSink):
+    """Colonnes typées, écrites par groupes de `PARQUET_ROW_GROUP` articles."""
+
+    def __init__(self, path: Path, row_group: int = PARQUET_ROW_GROUP):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow requis pour le format parquet (extra `parquet`)"
+            ) from None
+        super().__init__(path)
+        self._pa = pa
+        self._row_group = row_group
+        self._rows: list[dict] = []
+        self._schema = pa.schema([(column, _parquet_type(pa, column)) for column in CSV_COLUMNS])
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def _flush(self) -> None:
+        if self._rows:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def write(self, name: str, metrics: EvaluationMetrics) -> None:
+        self._rows.append(flat_record(name, metrics))
+        self.count += 1
+        if len(self._rows) >= self._row_group:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+SINKS: dict[str, type[ResultSink]] = {"csv": CsvSink, "ndjson": NdjsonSink, "parquet": ParquetSink}
+
+
+def sink_format(path: Path) -> str:
+    """Format d'une sortie d'après son extension (csv par défaut)."""
+    return EXTENSIONS.get(Path(path).suffix.lower(), "csv")
+
+
+def open_sink(path: Path, fmt: str | None = None) -> ResultSink:
+    """Ouvre une sortie de résultats (format explicite ou déduit de l'extension)."""
+    return SINKS[fmt or sink_format(path)](Path(path))
+
+
+class MultiSink(ResultSink):
+    """Diffuse chaque résultat à plusieurs sorties."""
+
+    def __init__(self, sinks: list[ResultSink]):
+        self.sinks = sinks
+        self.path = sinks[0].path if sinks else Path()
+        self.count = 0
+
+    def write(self, name: str, metrics: EvaluationMetrics) -> None:
+        for sink in self.sinks:
+            sink.write(name, metrics)
+        self.count += 1
+
+    def close(self) -> None:
+        # Chaque sortie est fermée même si une autre échoue (pied de page Parquet)
+        errors = []
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
@@ -7,15 +7,47 @@ et calcule des métriques de performance.
 
 Usage:
     python evaluate.py gold.json predicted.json
-    python evaluate.py --batch benchmark/annotations/gold/ benchmark/annotations/model/
+    python evaluate.py --batch benchmark/annotations/gold/ benchmark/annotations/model/ --jobs 8
+    python evaluate.py gold.json predicted.json --align similarity
+    python evaluate.py --batch gold/ model/ --bootstrap 10000
+    python evaluate.py --batch gold/ model/ -o results/eval.ndjson -o results/eval.csv
+    python evaluate.py --compare gold/ claude_v1/ claude_v2/ -o scores/comparison_matrix.csv
+    python evaluate.py --batch gold/ model/ --shard 2/4 --state results/shard-2.json
+    python evaluate.py --spans gold/ model/
+    python evaluate.py --spans train-labels-task2.labels predictions.labels
 """
 
 import argparse
-import csv
 import json
+import os
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from scripts import fallacy_index
+from scripts.agreement import (
+    Confusion,
+    kendall_tau,
+    quadratic_kappa,
+    reliability_confusion,
+    spearman,
+)
+from scripts.alignment import DEFAULT_THRESHOLD, align_arguments
+from scripts.model import Analysis
+from scripts.reader import AnalysisReader, as_streamable
+from scripts.text_overlap import TOULMIN_COMPONENTS, toulmin_overlap
+
+if TYPE_CHECKING:
+    from scripts.corpus_metrics import CorpusAccumulator, CorpusMetrics
+    from scripts.eval_cache import EvaluationCache
+    from scripts.eval_sinks import ResultSink
+
+RELIABILITY_NOT_ANNOTATED = "non annotée dans le gold (métriques de fiabilité ignorées)"
+
+# Installation des métriques de corpus (NumPy)
+NUMPY_HINT = "pip install .[benchmark]"
 
 
 @dataclass
@@ -30,47 +62,139 @@ class EvaluationMetrics:
 
     # Score de fiabilité
     reliability_mae: float = 0.0  # Mean Absolute Error
-    reliability_correlation: float = 0.0
+    reliability_correlation: float = 0.0  # Spearman
+    reliability_kendall: float = 0.0  # Kendall tau-b
+    reliability_qwk: float = 0.0  # Kappa de Cohen à pondération quadratique
+    # Matrice de confusion 5 × 5 (lignes: gold, colonnes: modèle)
+    reliability_confusion: Confusion = field(default_factory=list)
+    # Arguments alignés notés des deux côtés; 0: fiabilité non annotée, métriques ignorées
+    reliability_count: int = 0
 
     # Nombre d'arguments
     argument_count_gold: int = 0
     argument_count_predicted: int = 0
 
-    # Composants Toulmin (si annotés)
+    # Composants Toulmin (si annotés): ROUGE-L moyen de la thèse et des données
     toulmin_claim_match: float = 0.0
     toulmin_grounds_match: float = 0.0
+    # composant -> {"rouge_l", "token_f1", "count"} (voir `text_overlap.toulmin_overlap`)
+    toulmin_details: dict[str, dict[str, float]] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
+        scored = self.reliability_count > 0
         return {
             "fallacy_precision": round(self.fallacy_precision, 3),
             "fallacy_recall": round(self.fallacy_recall, 3),
             "fallacy_f1": round(self.fallacy_f1, 3),
-            "reliability_mae": round(self.reliability_mae, 3),
+            "reliability_mae": round(self.reliability_mae, 3) if scored else None,
+            "reliability_correlation": round(self.reliability_correlation, 3) if scored else None,
+            "reliability_kendall": round(self.reliability_kendall, 3) if scored else None,
+            "reliability_qwk": round(self.reliability_qwk, 3) if scored else None,
+            "reliability_confusion": self.reliability_confusion,
+            "reliability_count": self.reliability_count,
+            "toulmin_claim_match": round(self.toulmin_claim_match, 3),
+            "toulmin_grounds_match": round(self.toulmin_grounds_match, 3),
+            "toulmin": {
+                component: {name: round(value, 3) for name, value in scores.items()}
+                for component, scores in self.toulmin_details.items()
+            },
             "argument_count_gold": self.argument_count_gold,
             "argument_count_predicted": self.argument_count_predicted,
         }
 
 
-def extract_fallacies(analysis: dict) -> dict[int, list[str]]:
-    """Extrait les sophismes par argument."""
-    result = {}
-    for arg in analysis.get("arguments", []):
-        arg_id = arg.get("id", 0)
-        fallacies = arg.get("fallacies", [])
-        # Normaliser les noms de sophismes (lowercase, sans espaces)
-        normalized = [f.lower().strip().replace(" ", "_") for f in fallacies if f]
-        result[arg_id] = normalized
-    return result
+def normalize_fallacy(name: str) -> str:
+    """Clé canonique d'un nom de sophisme (alias FR/EN, accents, fautes de frappe)."""
+    return fallacy_index.normalize(name)
+
+
+class Annotations(NamedTuple):
+    """Résumé d'une analyse pour l'évaluation (voir `extract_annotations`)."""
+
+    count: int
+    fallacies: dict[int, list[str]]
+    # Arguments dont la fiabilité est annotée
+    reliability: dict[int, int]
+    # Thèse et texte original par argument (alignement par similarité)
+    texts: dict[int, str]
+    # Composants Toulmin par argument, dans l'ordre de TOULMIN_COMPONENTS
+    toulmin: dict[int, tuple[str | None, ...]]
+
+    def summary(self) -> "Annotations":
+        """Sans les textes: seul ce résumé circule entre processus et va dans le cache."""
+        return self._replace(texts={}, toulmin={})
+
+
+def extract_annotations(
+    analysis: dict | Analysis | AnalysisReader, with_texts: bool = False
+) -> Annotations:
+    """
+    Extrait en une seule passe les annotations utiles à l'évaluation.
+
+    Avec un lecteur incrémental, seuls ces résumés restent en mémoire, jamais
+    l'ensemble des arguments.
+
+    Args:
+        analysis: Analyse (format JSON du skill, modèle ou lecteur incrémental)
+        with_texts: Conserve la thèse et le texte original de chaque argument
+            (nécessaire à `align_annotations`)
+
+    Returns:
+        Annotations (textes d'alignement vides sans `with_texts`)
+    """
+    count, fallacies, reliability, texts, toulmin = 0, {}, {}, {}, {}
+    for arg in as_streamable(analysis).arguments:
+        count += 1
+        fallacies[arg.id] = [f.key for f in arg.fallacies]
+        if arg.reliability is not None:
+            reliability[arg.id] = arg.reliability
+        toulmin[arg.id] = tuple(getattr(arg, component) for component in TOULMIN_COMPONENTS)
+        if with_texts:
+            texts[arg.id] = f"{arg.claim}\n{arg.original_text}"
+    return Annotations(count, fallacies, reliability, texts, toulmin)
+
+
+def align_annotations(
+    gold: Annotations, predicted: Annotations, threshold: float = DEFAULT_THRESHOLD
+) -> Annotations:
+    """
+    Réétiquette les arguments prédits avec l'id de l'argument gold apparié.
+
+    L'appariement se fait par similarité de la thèse et du texte original
+    (voir `scripts.alignment`), et non par id: un découpage différent du
+    texte ne décale plus tous les arguments suivants. Les arguments prédits
+    sans appariement reçoivent un id qui ne correspond à aucun argument gold.
+
+    Args:
+        gold: Annotations gold extraites avec `with_texts=True`
+        predicted: Annotations prédites extraites avec `with_texts=True`
+        threshold: Similarité minimale d'un appariement
+
+    Returns:
+        Annotations prédites réétiquetées (sans les textes)
+    """
+    mapping = align_arguments(gold.texts, predicted.texts, threshold)
+
+    def relabel(values: dict) -> dict:
+        return {mapping.get(arg_id, ("non_aligné", arg_id)): value for arg_id, value in values.items()}
+
+    return Annotations(
+        predicted.count,
+        relabel(predicted.fallacies),
+        relabel(predicted.reliability),
+        {},
+        relabel(predicted.toulmin),
+    )
+
+
+def extract_fallacies(analysis: dict | Analysis | AnalysisReader) -> dict[int, list[str]]:
+    """Extrait les sophismes par argument (forme chaîne ou objet)."""
+    return extract_annotations(analysis).fallacies
 
 
-def extract_reliability_scores(analysis: dict) -> dict[int, int]:
+def extract_reliability_scores(analysis: dict | Analysis | AnalysisReader) -> dict[int, int]:
     """Extrait les scores de fiabilité par argument."""
-    result = {}
-    for arg in analysis.get("arguments", []):
-        arg_id = arg.get("id", 0)
-        reliability = arg.get("reliability", 3)
-        result[arg_id] = reliability
-    return result
+    return extract_annotations(analysis).reliability
 
 
 def compute_fallacy_metrics(
@@ -150,29 +274,49 @@ def compute_reliability_mae(gold_scores: dict[int, int], pred_scores: dict[int,
     return total_error / len(common_ids)
 
 
-def evaluate_analysis(gold: dict, predicted: dict) -> EvaluationMetrics:
+def evaluate_analysis(
+    gold: dict | Analysis | AnalysisReader,
+    predicted: dict | Analysis | AnalysisReader,
+    align_threshold: float | None = None,
+) -> EvaluationMetrics:
     """
     Évalue une analyse prédite par rapport à la référence gold.
 
     Args:
-        gold: Annotation de référence (format JSON du skill)
+        gold: Annotation de référence (format JSON du skill, modèle ou lecteur incrémental)
         predicted: Annotation du modèle
+        align_threshold: Seuil d'alignement des arguments par similarité
+            (None: alignement par id)
 
     Returns:
         EvaluationMetrics avec toutes les métriques calculées
     """
+    # Extraction des données (une passe par annotation)
+    return evaluate_annotations(*extract_aligned(gold, predicted, align_threshold))
+
+
+def extract_aligned(
+    gold: dict | Analysis | AnalysisReader,
+    predicted: dict | Analysis | AnalysisReader,
+    align_threshold: float | None = None,
+) -> tuple[Annotations, Annotations]:
+    """Extrait les annotations gold et prédites, alignées par id ou par similarité."""
+    with_texts = align_threshold is not None
+    gold_annotations = extract_annotations(gold, with_texts)
+    pred_annotations = extract_annotations(predicted, with_texts)
+    if with_texts:
+        pred_annotations = align_annotations(gold_annotations, pred_annotations, align_threshold)
+        gold_annotations = gold_annotations._replace(texts={})
+    return gold_annotations, pred_annotations
+
+
+def evaluate_annotations(gold: Annotations, predicted: Annotations) -> EvaluationMetrics:
+    """Calcule les métriques à partir des annotations extraites (`extract_annotations`)."""
     metrics = EvaluationMetrics()
-
-    # Nombre d'arguments
-    metrics.argument_count_gold = len(gold.get("arguments", []))
-    metrics.argument_count_predicted = len(predicted.get("arguments", []))
-
-    # Extraction des données
-    gold_fallacies = extract_fallacies(gold)
-    pred_fallacies = extract_fallacies(predicted)
-
-    gold_reliability = extract_reliability_scores(gold)
-    pred_reliability = extract_reliability_scores(predicted)
+    metrics.argument_count_gold = gold.count
+    metrics.argument_count_predicted = predicted.count
+    gold_fallacies, pred_fallacies = gold.fallacies, predicted.fallacies
+    gold_reliability, pred_reliability = gold.reliability, predicted.reliability
 
     # Calcul des métriques de sophismes
     precision, recall, f1, details = compute_fallacy_metrics(gold_fallacies, pred_fallacies)
@@ -181,9 +325,22 @@ def evaluate_analysis(gold: dict, predicted: dict) -> EvaluationMetrics:
     metrics.fallacy_f1 = f1
     metrics.fallacy_details = details
 
-    # Calcul du MAE sur la fiabilité
+    # Calcul du MAE sur la fiabilité (arguments annotés des deux côtés)
+    metrics.reliability_count = len(gold_reliability.keys() & pred_reliability.keys())
     metrics.reliability_mae = compute_reliability_mae(gold_reliability, pred_reliability)
 
+    # Accord ordinal, déduit de la matrice de confusion
+    confusion = reliability_confusion(gold_reliability, pred_reliability)
+    metrics.reliability_confusion = confusion
+    metrics.reliability_correlation = spearman(confusion)
+    metrics.reliability_kendall = kendall_tau(confusion)
+    metrics.reliability_qwk = quadratic_kappa(confusion)
+
+    # Recouvrement lexical des composants Toulmin des arguments alignés
+    metrics.toulmin_details = toulmin_overlap(gold.toulmin, predicted.toulmin)
+    metrics.toulmin_claim_match = metrics.toulmin_details.get("claim", {}).get("rouge_l", 0.0)
+    metrics.toulmin_grounds_match = metrics.toulmin_details.get("grounds", {}).get("rouge_l", 0.0)
+
     return metrics
 
 
@@ -210,7 +367,23 @@ def print_report(metrics: EvaluationMetrics, verbose: bool = True) -> None:
             )
 
     print("\n📏 Score de fiabilité:")
-    print(f"   MAE: {metrics.reliability_mae:.2f} (sur échelle 1-5)")
+    if metrics.reliability_count:
+        print(f"   MAE: {metrics.reliability_mae:.2f} (sur échelle 1-5)")
+        print(f"   Spearman: {metrics.reliability_correlation:.2f}")
+        print(f"   Kendall tau-b: {metrics.reliability_kendall:.2f}")
+        print(f"   Kappa pondéré (QWK): {metrics.reliability_qwk:.2f}")
+        if verbose and metrics.reliability_confusion:
+            print_confusion(metrics.reliability_confusion)
+    else:
+        print(f"   {RELIABILITY_NOT_ANNOTATED}")
+
+    if metrics.toulmin_details:
+        print("\n🧱 Composants Toulmin (arguments alignés):")
+        for component, scores in metrics.toulmin_details.items():
+            print(
+                f"   - {component}: ROUGE-L={scores['rouge_l']:.2f} "
+                f"F1={scores['token_f1']:.2f} ({scores['count']})"
+            )
 
     # Interprétation
     print("\n" + "-" * 60)
@@ -222,81 +395,448 @@ def print_report(metrics: EvaluationMetrics, verbose: bool = True) -> None:
     else:
         print("❌ Détection des sophismes insuffisante")
 
-    if metrics.reliability_mae <= 0.5:
-        print("✅ Scores de fiabilité bien calibrés")
-    elif metrics.reliability_mae <= 1.0:
-        print("⚠️  Scores de fiabilité à affiner")
-    else:
-        print("❌ Scores de fiabilité à recalibrer")
+    if metrics.reliability_count:
+        if metrics.reliability_mae <= 0.5:
+            print("✅ Scores de fiabilité bien calibrés")
+        elif metrics.reliability_mae <= 1.0:
+            print("⚠️  Scores de fiabilité à affiner")
+        else:
+            print("❌ Scores de fiabilité à recalibrer")
 
     print("=" * 60 + "\n")
 
 
-def batch_evaluate(gold_dir: Path, pred_dir: Path) -> list[tuple[str, EvaluationMetrics]]:
-    """Évalue tous les fichiers d'un répertoire."""
-    results = []
+def print_confusion(confusion: Confusion) -> None:
+    """Affiche la matrice de confusion des scores de fiabilité."""
+    print("\n   Confusion (lignes: gold, colonnes: modèle):")
+    print("        " + "".join(f"{level:>6}" for level in range(1, len(confusion) + 1)))
+    for level, row in enumerate(confusion, 1):
+        print(f"   {level:>5}" + "".join(f"{count:>6}" for count in row))
+
+
+def evaluate_files(
+    task: tuple[Path, Path, bool, float | None],
+) -> tuple[EvaluationMetrics, tuple[Annotations, Annotations] | None]:
+    """
+    Évalue un couple (gold, prédiction) de fichiers (exécuté dans un processus du pool).
+
+    Args:
+        task: Tuple (fichier gold, fichier prédit, renvoyer les annotations,
+            seuil d'alignement par similarité ou None pour l'alignement par id).
+
+    Returns:
+        Tuple (métriques, résumés des annotations gold et prédites si demandés)
+    """
+    gold_file, pred_file, with_annotations, align_threshold = task
+    gold, predicted = extract_aligned(
+        AnalysisReader(gold_file), AnalysisReader(pred_file), align_threshold
+    )
+    metrics = evaluate_annotations(gold, predicted)
+    return metrics, (gold.summary(), predicted.summary()) if with_annotations else None
+
+
+def print_corpus_report(metrics: "CorpusMetrics", verbose: bool = True) -> None:
+    """Affiche les métriques agrégées sur le corpus (micro, macro et par type)."""
+    print(
+        f"\n📚 MÉTRIQUES DU CORPUS ({metrics.article_count} articles, "
+        f"{metrics.argument_count} arguments):"
+    )
+    print(
+        f"   Fallacy micro: P={metrics.fallacy_micro_precision:.2%} "
+        f"R={metrics.fallacy_micro_recall:.2%} F1={metrics.fallacy_micro_f1:.2%}"
+    )
+    print(
+        f"   Fallacy macro: P={metrics.fallacy_macro_precision:.2%} "
+        f"R={metrics.fallacy_macro_recall:.2%} F1={metrics.fallacy_macro_f1:.2%}"
+    )
+    if not metrics.reliability_count:
+        print(f"   Reliability: {RELIABILITY_NOT_ANNOTATED}")
+    else:
+        print(
+            f"   Reliability MAE: micro {metrics.reliability_mae_micro:.2f}, "
+            f"macro {metrics.reliability_mae_macro:.2f}"
+        )
+        print(
+            f"   Reliability accord: Spearman {metrics.reliability_correlation:.2f}, "
+            f"Kendall tau-b {metrics.reliability_kendall:.2f}, QWK {metrics.reliability_qwk:.2f}"
+        )
+        if verbose and metrics.reliability_confusion:
+            print_confusion(metrics.reliability_confusion)
+
+    if verbose and metrics.fallacy_per_type:
+        print("\n   Détail par type (support gold):")
+        by_support = sorted(
+            metrics.fallacy_per_type.items(), key=lambda item: (-item[1]["support"], item[0])
+        )
+        for fallacy_type, scores in by_support:
+            print(
+                f"   - {fallacy_type} ({scores['support']}): P={scores['precision']:.2f} "
+                f"R={scores['recall']:.2f} F1={scores['f1']:.2f}"
+            )
 
-    for gold_file in gold_dir.glob("*.json"):
+
+def print_average_mae(maes: list[float]) -> None:
+    """Affiche la MAE moyenne des articles dont la fiabilité est annotée."""
+    if maes:
+        print(f"   Reliability MAE: {sum(maes) / len(maes):.2f}")
+    else:
+        print(f"   Reliability MAE: {RELIABILITY_NOT_ANNOTATED}")
+
+
+def print_bootstrap_report(
+    intervals: dict[str, tuple[float, float]], metrics: "CorpusMetrics",
+    resamples: int, level: str,
+) -> None:
+    """Affiche les intervalles de confiance bootstrap des métriques micro."""
+    print(f"\n🎲 Intervalles de confiance à 95 % ({resamples} tirages par {level}):")
+    for label, name in [("Precision", "fallacy_precision"), ("Recall", "fallacy_recall"),
+                        ("F1", "fallacy_f1")]:
+        low, high = intervals[name]
+        estimate = getattr(metrics, name.replace("fallacy_", "fallacy_micro_"))
+        print(f"   Fallacy {label}: {estimate:.2%} [{low:.2%} – {high:.2%}]")
+    if metrics.reliability_count:
+        low, high = intervals["reliability_mae"]
+        print(f"   Reliability MAE: {metrics.reliability_mae_micro:.2f} [{low:.2f} – {high:.2f}]")
+
+
+class Shard(NamedTuple):
+    """Fragment `index`/`count` d'un lot (index à partir de 1)."""
+
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(value: str) -> Shard:
+    """Analyse un fragment `K/N` (1 <= K <= N)."""
+    index, _, count = value.partition("/")
+    try:
+        shard = Shard(int(index), int(count))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fragment invalide: {value} (attendu: K/N)") from None
+    if not 1 <= shard.index <= shard.count:
+        raise argparse.ArgumentTypeError(f"fragment invalide: {value} (1 <= K <= N)")
+    return shard
+
+
+def batch_evaluate(
+    gold_dir: Path, pred_dir: Path, jobs: int = 1, progress: bool = False,
+    corpus: "CorpusAccumulator | None" = None, align_threshold: float | None = None,
+    cache: "EvaluationCache | None" = None, sink: "ResultSink | None" = None,
+    shard: Shard | None = None,
+) -> list[tuple[str, EvaluationMetrics]]:
+    """
+    Évalue tous les fichiers d'un répertoire.
+
+    Args:
+        gold_dir: Répertoire des annotations de référence.
+        pred_dir: Répertoire des prédictions (mêmes noms de fichiers).
+        jobs: Nombre de processus (1 = exécution séquentielle dans le processus courant).
+        progress: Affiche l'avancement sur la sortie d'erreur.
+        corpus: Accumulateur alimenté avec les annotations de chaque article,
+            dans l'ordre des résultats, pour les métriques de corpus.
+        align_threshold: Seuil d'alignement des arguments par similarité
+            (None: alignement par id).
+        cache: Cache des résultats: seules les paires absentes du cache
+            (fichiers ou évaluateur modifiés) sont recalculées.
+        sink: Sortie alimentée article par article, dès que chaque résultat
+            est disponible (voir `scripts.eval_sinks`).
+        shard: N'évalue que ce fragment du lot: le fichier gold de rang i
+            (noms triés, à partir de 0) revient au fragment i mod N + 1.
+            Le découpage ne dépend que des noms de fichiers gold.
+
+    Returns:
+        Couples (article, métriques), triés par nom de fichier quel que soit `jobs`.
+    """
+    # Le cache conserve toujours les annotations, réutilisables avec ou sans corpus
+    with_annotations = corpus is not None or cache is not None
+    gold_files = sorted(gold_dir.glob("*.json"))
+    if shard is not None:
+        gold_files = gold_files[shard.index - 1::shard.count]
+    pairs = []
+    for gold_file in gold_files:
         pred_file = pred_dir / gold_file.name
         if pred_file.exists():
-            with open(gold_file) as f:
-                gold = json.load(f)
-            with open(pred_file) as f:
-                pred = json.load(f)
-
-            metrics = evaluate_analysis(gold, pred)
-            results.append((gold_file.stem, metrics))
+            pairs.append((gold_file, pred_file, with_annotations, align_threshold))
         else:
             print(f"⚠️  Pas de prédiction pour {gold_file.name}")
 
+    if cache is not None:
+        keys = [cache.key(gold_file, pred_file, align_threshold)
+                for gold_file, pred_file, *_ in pairs]
+        cached = [cache.get(key) for key in keys]
+    else:
+        keys = cached = [None] * len(pairs)
+    tasks = [task for task, hit in zip(pairs, cached) if hit is None]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        metrics_iter = map(evaluate_files, tasks)
+        executor = None
+    else:
+        # Importé ici: multiprocessing alourdit le démarrage de l'évaluation simple
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Des paquets de tâches amortissent le coût IPC sur les gros corpus;
+        # map conserve l'ordre des paires
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        metrics_iter = executor.map(evaluate_files, tasks, chunksize=chunksize)
+
+    results = []
+    try:
+        for done, ((gold_file, *_), key, result) in enumerate(zip(pairs, keys, cached), 1):
+            if result is None:
+                result = next(metrics_iter)
+                if cache is not None:
+                    cache.put(key, result)
+            metrics, annotations = result
+            results.append((gold_file.stem, metrics))
+            if sink is not None:
+                sink.write(gold_file.stem, metrics)
+            if corpus is not None:
+                gold, predicted = annotations
+                corpus.add(
+                    gold_file.stem, gold.fallacies, predicted.fallacies,
+                    gold.reliability, predicted.reliability,
+                )
+            if progress:
+                print(
+                    f"\r⏳ {done}/{len(pairs)} paire(s) évaluée(s)",
+                    end="", file=sys.stderr, flush=True,
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if progress and pairs:
+        print(file=sys.stderr)
+
     return results
 
 
 def export_results_csv(results: list[tuple[str, EvaluationMetrics]], output_path: Path) -> None:
     """Exporte les résultats en CSV."""
-    with open(output_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "article",
-                "fallacy_precision",
-                "fallacy_recall",
-                "fallacy_f1",
-                "reliability_mae",
-                "arg_count_gold",
-                "arg_count_pred",
-            ]
-        )
+    from scripts.eval_sinks import CsvSink
+
+    with CsvSink(output_path) as sink:
         for name, metrics in results:
-            writer.writerow(
-                [
-                    name,
-                    f"{metrics.fallacy_precision:.3f}",
-                    f"{metrics.fallacy_recall:.3f}",
-                    f"{metrics.fallacy_f1:.3f}",
-                    f"{metrics.reliability_mae:.3f}",
-                    metrics.argument_count_gold,
-                    metrics.argument_count_predicted,
-                ]
-            )
+            sink.write(name, metrics)
     print(f"✅ Résultats exportés dans {output_path}")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Évaluation d'analyses rhétoriques")
     parser.add_argument("gold", help="Fichier/répertoire gold standard")
-    parser.add_argument("predicted", help="Fichier/répertoire des prédictions")
+    parser.add_argument(
+        "predicted",
+        nargs="+",
+        help="Fichier/répertoire des prédictions (plusieurs répertoires avec --compare)",
+    )
     parser.add_argument("--batch", action="store_true", help="Mode batch (répertoires)")
-    parser.add_argument("--output", "-o", help="Fichier CSV de sortie (mode batch)")
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare plusieurs répertoires de prédictions à la première (matrice de "
+        "comparaison, écarts par type et tests appariés)",
+    )
+    parser.add_argument(
+        "--spans",
+        action="store_true",
+        help="Évaluation par segment des sophismes localisés (start/end) ou "
+        "d'étiquettes PTC (.labels), fichiers ou répertoires",
+    )
+    parser.add_argument(
+        "--permutations",
+        type=int,
+        default=10000,
+        metavar="N",
+        help="Permutations des tests de significativité appariés (mode --compare, 0: aucun)",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        action="append",
+        default=[],
+        help="Fichier de résultats écrit au fil de l'eau (mode batch, répétable; "
+        "format d'après l'extension: .csv, .ndjson/.jsonl, .parquet; avec --compare: "
+        "matrice de comparaison CSV)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "ndjson", "parquet"],
+        help="Format de toutes les sorties -o (par défaut: d'après l'extension)",
+    )
     parser.add_argument("--quiet", "-q", action="store_true", help="Mode silencieux")
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Nombre de processus en mode batch (par défaut: nombre de cœurs)",
+    )
+    parser.add_argument(
+        "--align",
+        choices=["id", "similarity"],
+        default="id",
+        help="Alignement des arguments: par id ou par similarité de la thèse et du texte",
+    )
+    parser.add_argument(
+        "--align-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Similarité minimale d'un appariement (par défaut: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Intervalles de confiance par N rééchantillonnages (mode batch)",
+    )
+    parser.add_argument(
+        "--bootstrap-level",
+        choices=["article", "argument"],
+        default="article",
+        help="Unité rééchantillonnée par le bootstrap (par défaut: article)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="K/N",
+        help="N'évalue que le fragment K sur N du lot (découpage déterministe, mode batch)",
+    )
+    parser.add_argument(
+        "--state",
+        metavar="FICHIER",
+        help="Écrit l'état agrégeable des métriques de corpus (mode batch; fusion des "
+        "fragments: python -m scripts.shards)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        metavar="FICHIER",
+        help="Réutilise les résultats des paires inchangées (cache SQLite, mode batch; "
+        "par défaut: ~/.cache/rhetorical-analysis/evaluate.sqlite)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256,
+        help="Taille maximale du cache avant éviction des entrées les moins récentes (Mo)",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=30,
+        metavar="JOURS",
+        help="Âge maximal d'une entrée non relue du cache (jours)",
+    )
 
     args = parser.parse_args()
+    align_threshold = args.align_threshold if args.align == "similarity" else None
+
+    for option in ("bootstrap", "shard", "state"):
+        if getattr(args, option) and not args.batch:
+            print(f"❌ Erreur: --{option} n'est disponible qu'en mode batch")
+            sys.exit(1)
+    if len(args.predicted) > 1 and not args.compare:
+        print("❌ Erreur: plusieurs prédictions ne sont acceptées qu'avec --compare")
+        sys.exit(1)
+
+    if args.spans:
+        from scripts.span_eval import evaluate_spans, load_spans, print_span_report
+
+        try:
+            gold_spans = load_spans(Path(args.gold))
+            pred_spans = load_spans(Path(args.predicted[0]))
+        except (OSError, ValueError) as e:
+            print(f"❌ Erreur: {e}")
+            sys.exit(1)
+        span_metrics = evaluate_spans(gold_spans, pred_spans)
+        if not args.quiet:
+            print_span_report(span_metrics)
+        print(json.dumps(span_metrics.to_dict(), indent=2))
+    elif args.compare:
+        try:
+            from scripts.compare_runs import (
+                compare_runs,
+                export_comparison_csv,
+                print_comparison_report,
+            )
+        except ImportError:
+            print(f"❌ Erreur: NumPy requis pour --compare ({NUMPY_HINT})")
+            sys.exit(1)
 
-    if args.batch:
+        comparison = compare_runs(
+            Path(args.gold), [Path(run) for run in args.predicted], args.jobs,
+            align_threshold=align_threshold, permutations=args.permutations,
+        )
+        print_comparison_report(comparison, verbose=not args.quiet)
+        if args.output:
+            output = Path(args.output[0])
+            per_type = export_comparison_csv(comparison, output)
+            print(f"✅ Comparaison exportée dans {output} et {per_type}")
+    elif args.batch:
         gold_dir = Path(args.gold)
-        pred_dir = Path(args.predicted)
+        (pred_dir,) = map(Path, args.predicted)
+
+        try:
+            from scripts.corpus_metrics import CorpusAccumulator
+
+            corpus = CorpusAccumulator()
+        except ImportError:
+            # Options inutilisables sans les métriques de corpus: échec explicite
+            for option in ("bootstrap", "state"):
+                if getattr(args, option):
+                    print(f"❌ Erreur: NumPy requis pour --{option} ({NUMPY_HINT})")
+                    sys.exit(1)
+            corpus = None
+            print(f"⚠️  NumPy absent: métriques de corpus indisponibles ({NUMPY_HINT})")
+
+        cache = None
+        if args.cache is not None:
+            from scripts.eval_cache import EvaluationCache
+
+            cache = EvaluationCache(
+                Path(args.cache) if args.cache else None,
+                max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                max_age=args.cache_max_age * 24 * 3600,
+            )
 
-        results = batch_evaluate(gold_dir, pred_dir)
+        sink = None
+        if args.output:
+            from scripts.eval_sinks import MultiSink, open_sink
+
+            sinks = []
+            try:
+                for output in args.output:
+                    sinks.append(open_sink(Path(output), args.output_format))
+            except (ImportError, OSError) as e:
+                MultiSink(sinks).close()
+                print(f"❌ Erreur: {e}")
+                sys.exit(1)
+            sink = MultiSink(sinks)
+
+        try:
+            results = batch_evaluate(
+                gold_dir, pred_dir, args.jobs, progress=not args.quiet, corpus=corpus,
+                align_threshold=align_threshold, cache=cache, sink=sink, shard=args.shard,
+            )
+            if cache is not None:
+                evicted = cache.evict()
+                print(
+                    f"💾 Cache: {cache.hits} paire(s) réutilisée(s), "
+                    f"{cache.misses} recalculée(s), {evicted} entrée(s) évincée(s)"
+                )
+        finally:
+            if cache is not None:
+                cache.close()
+            # Ferme aussi sur interruption: le pied de page Parquet est écrit
+            if sink is not None:
+                sink.close()
+        if sink is not None:
+            for output in sink.sinks:
+                print(f"✅ Résultats exportés dans {output.path} ({output.count} article(s))")
 
         if not args.quiet:
             print(f"\n📁 Évaluation de {len(results)} fichiers\n")
@@ -304,23 +844,36 @@ def main():
                 print(f"--- {name} ---")
                 print_report(metrics, verbose=False)
 
-        if args.output:
-            export_results_csv(results, Path(args.output))
-
         # Moyennes globales
         if results:
             avg_f1 = sum(m.fallacy_f1 for _, m in results) / len(results)
-            avg_mae = sum(m.reliability_mae for _, m in results) / len(results)
             print("\n📊 MOYENNES GLOBALES:")
             print(f"   Fallacy F1: {avg_f1:.2%}")
-            print(f"   Reliability MAE: {avg_mae:.2f}")
+            print_average_mae([m.reliability_mae for _, m in results if m.reliability_count])
+
+            if corpus is not None:
+                corpus_metrics = corpus.compute()
+                print_corpus_report(corpus_metrics, verbose=not args.quiet)
+                if args.bootstrap:
+                    intervals = corpus.bootstrap(args.bootstrap, args.bootstrap_level)
+                    print_bootstrap_report(
+                        intervals, corpus_metrics, args.bootstrap, args.bootstrap_level
+                    )
+
+        if args.state:
+            from scripts.shards import write_state
+
+            # Écrit aussi pour un fragment vide: la fusion vérifie qu'il ne manque aucun fragment
+            state_path = Path(args.state)
+            write_state(
+                state_path, corpus.state(), args.shard or Shard(1, 1),
+                {"align_threshold": align_threshold},
+            )
+            print(f"✅ État du fragment {args.shard or Shard(1, 1)} écrit dans {state_path}")
     else:
-        with open(args.gold) as f:
-            gold = json.load(f)
-        with open(args.predicted) as f:
-            predicted = json.load(f)
-
-        metrics = evaluate_analysis(gold, predicted)
+        metrics = evaluate_analysis(
+            AnalysisReader(args.gold), AnalysisReader(args.predicted[0]), align_threshold
+        )
 
         if not args.quiet:
             print_report(metrics)
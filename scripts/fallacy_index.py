@@ -0,0 +1,278 @@
+"""
+Index des noms de sophismes: normalisation des libellés vers une clé canonique.
+
+Les annotations nomment un même sophisme de bien des façons: « Homme de
+paille », « homme_de_paille », « strawman », « Straw Man »... L'index est
+compilé une seule fois à partir de:
+
+- `references/fallacies-catalog.md`: chaque titre `###` donne une entrée (clé
+  canonique = titre sans accents en snake_case), ses variantes entre
+  parenthèses ou après « / » et les sous-types en gras (`- **Tu quoque** :`)
+  en sont des alias;
+- des synonymes français et anglais usuels (`SYNONYMS`);
+- les 13 types du jeu de données LOGIC (`LOGIC_TYPES`).
+
+Une recherche passe par trois étapes: forme exacte, forme sans accents ni
+ponctuation (dictionnaire, O(1)), puis repli approché (distance d'édition
+bornée) via un index de suppressions à la SymSpell: le coût d'une recherche
+ne dépend pas du nombre d'alias. Cet index n'est construit qu'au premier
+libellé inconnu, et les résultats sont mis en cache.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from pathlib import Path
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "references" / "fallacies-catalog.md"
+
+# Distance d'édition maximale du repli approché (1 pour les libellés courts)
+MAX_EDIT_DISTANCE = 2
+SHORT_LABEL = 8
+
+# Synonymes absents du catalogue, par clé canonique
+SYNONYMS: dict[str, tuple[str, ...]] = {
+    "ad_hominem": (
+        "attaque personnelle", "personal attack", "argumentum ad hominem", "guilt by association",
+        "culpabilité par association",
+    ),
+    "appel_a_l_autorite": (
+        "argument d'autorité", "appeal to authority", "argument from authority",
+        "false authority", "appeal to false authority",
+    ),
+    "appel_a_la_popularite": (
+        "appeal to popularity", "bandwagon", "appeal to the people", "argumentum ad populum",
+    ),
+    "appel_a_l_emotion": (
+        "appel aux émotions", "appeal to emotion", "emotional appeal", "appel à la peur",
+        "appeal to fear", "appel à la pitié", "appeal to pity", "appeal to anger",
+        "appeal to positive emotion",
+    ),
+    "appel_a_la_tradition": ("appeal to tradition",),
+    "appel_a_la_nouveaute": ("appeal to novelty",),
+    "homme_de_paille": ("épouvantail", "straw man", "strawman argument"),
+    "faux_dilemme": ("fausse alternative", "false dilemma", "false dichotomy", "black and white"),
+    "petition_de_principe": (
+        "raisonnement circulaire", "cercle vicieux", "begging the question", "circular reasoning",
+        "circular argument",
+    ),
+    "generalisation_hative": (
+        "généralisation abusive", "hasty generalization", "faulty generalization",
+        "overgeneralization",
+    ),
+    "fausse_cause": (
+        "corrélation n'est pas causalité", "false cause", "questionable cause",
+        "post hoc", "cum hoc ergo propter hoc", "causal oversimplification",
+    ),
+    "pente_glissante": ("slippery slope",),
+    "composition": ("fallacy of composition",),
+    "division": ("fallacy of division",),
+    "equivoque": ("équivocation", "equivocation"),
+    "amphibologie": ("amphiboly",),
+    "fausse_equivalence": ("false equivalence",),
+    "fausse_analogie": ("analogie abusive", "false analogy", "weak analogy"),
+    "affirmation_du_consequent": ("affirming the consequent",),
+    "negation_de_l_antecedent": ("denying the antecedent",),
+    "syllogisme_disjunctif_invalide": ("syllogisme disjonctif invalide", "affirming a disjunct"),
+    "cherry_picking": ("sélection des données", "cueillette de cerises", "suppressed evidence"),
+    "moving_the_goalposts": ("déplacer les buts", "déplacement des critères"),
+    "no_true_scotsman": ("vrai écossais", "aucun vrai écossais"),
+    "argument_d_ignorance": (
+        "appel à l'ignorance", "appeal to ignorance", "argument from ignorance",
+    ),
+    "charge_de_la_preuve_inversee": (
+        "renversement de la charge de la preuve", "burden of proof", "shifting the burden of proof",
+    ),
+    "question_complexe": ("loaded question", "complex question"),
+    "reification": ("reification", "hypostatisation"),
+    "biais_du_survivant": ("survivorship bias",),
+}
+
+# Les 13 types du jeu de données LOGIC (Jin et al., 2022) et leur clé
+# canonique; les trois types sans entrée au catalogue reçoivent la leur.
+# Les fichiers CSV du jeu écrivent aussi « fallacy of logic » et
+# « intentional » (voir LOGIC_ALIASES)
+LOGIC_TYPES: dict[str, str] = {
+    "faulty generalization": "generalisation_hative",
+    "false causality": "fausse_cause",
+    "circular reasoning": "petition_de_principe",
+    "ad populum": "appel_a_la_popularite",
+    "ad hominem": "ad_hominem",
+    "deductive fallacy": "sophisme_deductif",
+    "appeal to emotion": "appel_a_l_emotion",
+    "false dilemma": "faux_dilemme",
+    "equivocation": "equivoque",
+    "fallacy of extension": "homme_de_paille",
+    "fallacy of relevance": "diversion",
+    "fallacy of credibility": "appel_a_l_autorite",
+    "intentional fallacy": "sophisme_intentionnel",
+}
+
+# Libellés des clés propres à LOGIC
+LOGIC_LABELS: dict[str, str] = {
+    "sophisme_deductif": "Sophisme déductif",
+    "diversion": "Diversion (hareng rouge)",
+    "sophisme_intentionnel": "Sophisme intentionnel",
+}
+LOGIC_ALIASES: dict[str, tuple[str, ...]] = {
+    "sophisme_deductif": (
+        "sophisme formel", "formal fallacy", "erreur déductive", "fallacy of logic",
+    ),
+    "diversion": ("hareng rouge", "red herring", "hors sujet", "irrelevant conclusion"),
+    "sophisme_intentionnel": ("manipulation intentionnelle", "intentional"),
+}
+
+HEADING = re.compile(r"^###\s+(.+?)\s*$")
+SUBTYPE = re.compile(r"^-\s+\*\*(.+?)\*\*\s*:")
+VARIANT = re.compile(r"\(([^)]+)\)")
+NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Forme de comparaison: minuscules, sans accents, mots séparés par `_`."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return NON_WORD.sub("_", text.replace("œ", "oe").replace("æ", "ae")).strip("_")
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Distance de Levenshtein, ou `limit + 1` dès qu'elle dépasse `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _deletions(word: str, depth: int) -> set[str]:
+    """Toutes les formes obtenues en supprimant jusqu'à `depth` caractères."""
+    forms, frontier = {word}, {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        forms |= frontier
+    return forms
+
+
+def parse_catalog(text: str) -> list[tuple[str, list[str]]]:
+    """
+    Entrées du catalogue Markdown.
+
+    Returns:
+        Couples (libellé, alias) dans l'ordre du catalogue
+    """
+    entries: list[tuple[str, list[str]]] = []
+    for line in text.splitlines():
+        if match := HEADING.match(line):
+            title = match.group(1)
+            variants = VARIANT.findall(title)
+            names = [name.strip() for name in VARIANT.sub("", title).split("/") if name.strip()]
+            entries.append((names[0], names[1:] + variants))
+        elif entries and (match := SUBTYPE.match(line)):
+            entries[-1][1].append(match.group(1))
+    return entries
+
+
+@dataclass
+class FallacyIndex:
+    """Alias (forme repliée) -> clé canonique, et libellé de chaque clé."""
+
+    aliases: dict[str, str] = field(default_factory=dict)
+    labels: dict[str, str] = field(default_factory=dict)
+    _deletions: dict[str, set[str]] | None = field(default=None, repr=False)
+
+    def add(self, key: str, *names: str) -> None:
+        """Ajoute des alias à une clé (le premier alias connu l'emporte)."""
+        for name in (key, *names):
+            alias = fold(name)
+            if alias and alias not in self.aliases:
+                self.aliases[alias] = key
+                self._deletions = None
+
+    def _deletion_index(self) -> dict[str, set[str]]:
+        """Formes réduites (suppressions) de chaque alias -> alias."""
+        if self._deletions is None:
+            self._deletions = {}
+            for alias in self.aliases:
+                for form in _deletions(alias, MAX_EDIT_DISTANCE):
+                    self._deletions.setdefault(form, set()).add(alias)
+        return self._deletions
+
+    def _closest(self, folded: str) -> str | None:
+        """Alias le plus proche à distance d'édition bornée, ou None."""
+        limit = 1 if len(folded) <= SHORT_LABEL else MAX_EDIT_DISTANCE
+        index = self._deletion_index()
+        candidates: set[str] = set()
+        for form in _deletions(folded, limit):
+            candidates |= index.get(form, set())
+        best, best_distance = None, limit + 1
+        for alias in sorted(candidates):
+            distance = edit_distance(folded, alias, limit)
+            if distance < best_distance:
+                best, best_distance = alias, distance
+        return best
+
+    def lookup(self, name: str) -> str | None:
+        """Clé canonique d'un libellé, ou None s'il est inconnu."""
+        folded = fold(name)
+        if folded in self.aliases:
+            return self.aliases[folded]
+        alias = self._closest(folded) if folded else None
+        return self.aliases[alias] if alias else None
+
+    def label(self, key: str) -> str:
+        """Libellé lisible d'une clé canonique (la clé si elle est inconnue)."""
+        return self.labels.get(key, key)
+
+
+def build_index(catalog: str = "") -> FallacyIndex:
+    """Compile l'index depuis le texte du catalogue, les synonymes et LOGIC."""
+    index = FallacyIndex()
+    for label, aliases in parse_catalog(catalog):
+        key = fold(label)
+        index.labels.setdefault(key, label)
+        index.add(key, label, *aliases, *SYNONYMS.get(key, ()))
+    for key, label in LOGIC_LABELS.items():
+        index.labels.setdefault(key, label)
+        index.add(key, label, *LOGIC_ALIASES.get(key, ()))
+    for name, key in LOGIC_TYPES.items():
+        index.add(key, name)
+    # Synonymes d'entrées absentes du catalogue fourni
+    for key, names in SYNONYMS.items():
+        index.add(key, *names)
+    return index
+
+
+@cache
+def get_index() -> FallacyIndex:
+    """Index partagé, compilé au premier appel depuis `references/fallacies-catalog.md`."""
+    try:
+        catalog = CATALOG_PATH.read_text(encoding="utf-8")
+    except OSError:
+        catalog = ""
+    return build_index(catalog)
+
+
+@lru_cache(maxsize=4096)
+def normalize(name: str) -> str:
+    """
+    Clé canonique d'un nom de sophisme.
+
+    Un libellé inconnu garde sa forme repliée (minuscules, sans accents,
+    snake_case): deux écritures du même nom inconnu restent égales.
+    """
+    return get_index().lookup(name) or fold(name)
+
+
+def label(name: str) -> str:
+    """Libellé du catalogue pour un nom de sophisme (le nom lui-même s'il est inconnu)."""
+    key = get_index().lookup(name)
+    return get_index().label(key) if key else name
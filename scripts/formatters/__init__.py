@@ -0,0 +1,69 @@
+"""
+Registre des formateurs de rapport.
+
+Chaque format est associé à une référence `module:fonction` qui n'est importée
+qu'à la première utilisation: demander `--format md` ou `json` ne charge
+jamais openpyxl.
+
+Des formateurs tiers peuvent s'ajouter via le groupe d'entry points
+`rhetorical_analysis.formatters`, par exemple dans leur `pyproject.toml`:
+
+    [project.entry-points."rhetorical_analysis.formatters"]
+    html = "mon_paquet.html:save_report"
+
+Un formateur est appelé comme `save_report(analysis, output_path, **options)`
+avec un `scripts.model.Analysis`, et retourne True en cas de succès.
+"""
+
+from collections.abc import Callable
+from importlib import import_module
+
+ENTRY_POINT_GROUP = "rhetorical_analysis.formatters"
+
+STDOUT = "-"  # chemin de sortie désignant la sortie standard
+
+# Formats intégrés, dans l'ordre de `--format all`
+BUILTIN_FORMATTERS = {
+    "xlsx": "scripts.formatters.xlsx:save_report",
+    "json": "scripts.formatters.json:save_report",
+    "md": "scripts.formatters.markdown:save_report",
+}
+
+XLSX_ENGINES = {
+    "openpyxl": "scripts.formatters.excel:save_report",
+    "native": "scripts.formatters.xlsx_native:save_report",
+}
+
+_loaded: dict[str, Callable[..., bool]] = {}
+
+
+def load_object(reference: str) -> Callable[..., bool]:
+    """Importe l'objet désigné par une référence `module:attribut`."""
+    if reference not in _loaded:
+        module_name, _, attribute = reference.partition(":")
+        _loaded[reference] = getattr(import_module(module_name), attribute)
+    return _loaded[reference]
+
+
+def plugin_formatters() -> dict[str, str]:
+    """Formateurs déclarés par les paquets installés (format → référence)."""
+    # Importé ici: le parcours des métadonnées des paquets a un coût au démarrage
+    from importlib.metadata import entry_points
+
+    return {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def available_formats() -> list[str]:
+    """Formats intégrés puis formats tiers (un format intégré n'est jamais remplacé)."""
+    return [*BUILTIN_FORMATTERS, *(f for f in plugin_formatters() if f not in BUILTIN_FORMATTERS)]
+
+
+def get_formatter(fmt: str) -> Callable[..., bool]:
+    """
+    Retourne le formateur d'un format, en important son module à la demande.
+
+    Raises:
+        KeyError: si aucun formateur n'est enregistré pour ce format.
+    """
+    reference = BUILTIN_FORMATTERS.get(fmt) or plugin_formatters()[fmt]
+    return load_object(reference)
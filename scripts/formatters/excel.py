@@ -1,7 +1,43 @@
+from collections.abc import Iterable
+
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 
+from scripts.formatters.layout import (
+    BOLD,
+    CENTER,
+    HEADER,
+    LEGEND_HEADER,
+    LEGEND_SCALE_RANGE,
+    LEGEND_WIDTHS,
+    MAIN_HEADERS,
+    MAIN_ROW_HEIGHT,
+    MAIN_WIDTHS,
+    RELIABILITY_COLUMN,
+    SHEET_TITLES,
+    SOURCES_HEADERS,
+    SOURCES_WIDTHS,
+    SYNTHESIS_WIDTHS,
+    TEXT,
+    TITLE,
+    TOULMIN_HEADERS,
+    TOULMIN_WIDTHS,
+    WRAP,
+    legend_rows,
+    main_row,
+    reliability_band_formulas,
+    source_rows,
+    synthesis_entries,
+    toulmin_row,
+)
+from scripts.model import Analysis, as_analysis
+from scripts.reader import AnalysisReader, as_streamable
+
 # Styles
 STYLES = {
     "header_font": Font(bold=True, color="FFFFFF", size=11),
@@ -14,298 +50,293 @@ STYLES = {
         top=Side(style='thin'),
         bottom=Side(style='thin')
     ),
-    "reliability_high": PatternFill("solid", fgColor="C6EFCE"),    # Vert (4-5)
-    "reliability_medium": PatternFill("solid", fgColor="FFEB9C"),  # Jaune (3)
-    "reliability_low": PatternFill("solid", fgColor="FFC7CE"),     # Rouge (1-2)
 }
 
 
-def get_reliability_fill(score: int) -> PatternFill:
-    """Retourne le style de remplissage selon le score de fiabilité."""
-    if score >= 4:
-        return STYLES["reliability_high"]
-    elif score == 3:
-        return STYLES["reliability_medium"]
-    else:
-        return STYLES["reliability_low"]
+def named_styles() -> list[NamedStyle]:
+    """
+    Construit les styles nommés du rapport (une instance par classeur).
+
+    Chaque cellule ne porte que l'index du style de son rôle; les définitions
+    des styles et des règles conditionnelles ajoutent un coût fixe au fichier
+    (environ 0,5 Ko), qui n'est donc pas plus petit qu'avec des styles en ligne.
+    """
+    border = STYLES["thin_border"]
+    return [
+        NamedStyle(
+            name=HEADER,
+            font=STYLES["header_font"],
+            fill=STYLES["header_fill"],
+            alignment=STYLES["center_align"],
+            border=border,
+        ),
+        NamedStyle(
+            name=LEGEND_HEADER,
+            font=STYLES["header_font"],
+            fill=STYLES["header_fill"],
+            border=DEFAULT_BORDER,
+        ),
+        NamedStyle(name=TEXT, font=DEFAULT_FONT, alignment=STYLES["wrap_align"], border=border),
+        NamedStyle(name=CENTER, font=DEFAULT_FONT, alignment=STYLES["center_align"], border=border),
+        NamedStyle(
+            name=WRAP, font=DEFAULT_FONT, alignment=STYLES["wrap_align"], border=DEFAULT_BORDER
+        ),
+        NamedStyle(name=TITLE, font=Font(bold=True, size=14), border=DEFAULT_BORDER),
+        NamedStyle(name=BOLD, font=Font(bold=True), border=DEFAULT_BORDER),
+    ]
+
+
+def register_styles(wb: Workbook) -> None:
+    """Enregistre les styles nommés du rapport dans le classeur."""
+    for style in named_styles():
+        if style.name not in wb.named_styles:
+            wb.add_named_style(style)
+
+
+def add_reliability_rules(ws, cell_range: str) -> None:
+    """
+    Colore une plage de scores par règles de mise en forme conditionnelle.
+
+    Bandes: >= 4 vert, [3, 4[ jaune, < 3 rouge (voir `RELIABILITY_BANDS`).
 
+    Args:
+        ws: Feuille de calcul (standard ou write-only).
+        cell_range: Plage au format A1 (ex. "G2:G40").
+    """
+    for formula, color in reliability_band_formulas(cell_range):
+        # Les règles conditionnelles lisent bgColor : les deux couleurs sont renseignées
+        fill = PatternFill("solid", fgColor=color, bgColor=color)
+        ws.conditional_formatting.add(
+            cell_range, FormulaRule(formula=[formula], fill=fill, stopIfTrue=True)
+        )
 
-def format_fallacies(fallacies: list) -> str:
-    """Format fallacies list to string, supporting both string and dict formats."""
-    if not fallacies:
-        return "Aucun détecté"
 
-    result = []
-    for f in fallacies:
-        if isinstance(f, str):
-            result.append(f)
-        elif isinstance(f, dict):
-            name = f.get("name", "Inconnu")
-            severity = f.get("severity", "")
-            if severity:
-                result.append(f"{name} ({severity})")
-            else:
-                result.append(name)
+def write_headers(ws, headers: list[str], row: int = 1) -> None:
+    """Écrit une ligne d'en-têtes stylée."""
+    for col, header in enumerate(headers, 1):
+        ws.cell(row=row, column=col, value=header).style = HEADER
 
-    return "\n".join(result) if result else "Aucun détecté"
 
+def set_column_widths(ws, widths: list[int]) -> None:
+    """Applique les largeurs de colonnes."""
+    for i, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
 
-def create_main_analysis_sheet(wb: Workbook, data: dict) -> None:
+
+def create_main_analysis_sheet(wb: Workbook, analysis: Analysis) -> None:
     """Crée la feuille principale d'analyse des arguments."""
     ws = wb.active
     ws.title = "Analyse rhétorique"
 
-    # En-têtes
-    headers = [
-        "N°",
-        "Argument traité",
-        "Texte original (extrait)",
-        "Thèse (Claim)",
-        "Type de raisonnement",
-        "Sophismes détectés",
-        "Fiabilité (1-5)",
-        "Évaluation de la fiabilité",
-        "Commentaire"
-    ]
+    write_headers(ws, MAIN_HEADERS)
 
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = STYLES["header_font"]
-        cell.fill = STYLES["header_fill"]
-        cell.alignment = STYLES["center_align"]
-        cell.border = STYLES["thin_border"]
-
-    # Données
-    for row_idx, arg in enumerate(data.get("arguments", []), 2):
-        row_data = [
-            arg.get("id", row_idx - 1),
-            arg.get("label", ""),
-            arg.get("original_text", "")[:500] + ("..." if len(arg.get("original_text", "")) > 500 else ""),
-            arg.get("claim", ""),
-            arg.get("reasoning_type", ""),
-            format_fallacies(arg.get("fallacies", [])),
-            arg.get("reliability", 3),
-            arg.get("reliability_rationale", ""),
-            arg.get("comment", "")
-        ]
-
-        for col_idx, value in enumerate(row_data, 1):
+    arguments = analysis.arguments
+    for row_idx, arg in enumerate(arguments, 2):
+        for col_idx, value in enumerate(main_row(arg), 1):
             cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = STYLES["wrap_align"]
-            cell.border = STYLES["thin_border"]
+            cell.style = CENTER if col_idx == RELIABILITY_COLUMN else TEXT
 
-            # Coloration fiabilité
-            if col_idx == 7:
-                cell.alignment = STYLES["center_align"]
-                cell.fill = get_reliability_fill(value)
+    set_column_widths(ws, MAIN_WIDTHS)
 
-    # Largeurs de colonnes
-    col_widths = [5, 25, 45, 40, 40, 25, 12, 45, 40]
-    for i, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(i)].width = width
+    # Coloration fiabilité
+    if arguments:
+        column = get_column_letter(RELIABILITY_COLUMN)
+        add_reliability_rules(ws, f"{column}2:{column}{len(arguments) + 1}")
 
     # Hauteur des lignes
-    for row in range(2, len(data.get("arguments", [])) + 2):
-        ws.row_dimensions[row].height = 150
+    for row in range(2, len(arguments) + 2):
+        ws.row_dimensions[row].height = MAIN_ROW_HEIGHT
 
 
-def create_toulmin_sheet(wb: Workbook, data: dict) -> None:
+def create_toulmin_sheet(wb: Workbook, analysis: Analysis) -> None:
     """Crée une feuille détaillée avec la structure Toulmin complète."""
     ws = wb.create_sheet("Détail Toulmin")
 
-    headers = ["N°", "Claim", "Grounds", "Warrant", "Backing", "Qualifier", "Rebuttal"]
+    write_headers(ws, TOULMIN_HEADERS)
 
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = STYLES["header_font"]
-        cell.fill = STYLES["header_fill"]
-        cell.alignment = STYLES["center_align"]
-        cell.border = STYLES["thin_border"]
-
-    for row_idx, arg in enumerate(data.get("arguments", []), 2):
-        row_data = [
-            arg.get("id", row_idx - 1),
-            arg.get("claim", ""),
-            arg.get("grounds", ""),
-            arg.get("warrant", ""),
-            arg.get("backing", "Non explicité"),
-            arg.get("qualifier", "Non explicité"),
-            arg.get("rebuttal", "Non reconnu")
-        ]
-
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = STYLES["wrap_align"]
-            cell.border = STYLES["thin_border"]
+    for row_idx, arg in enumerate(analysis.arguments, 2):
+        for col_idx, value in enumerate(toulmin_row(arg), 1):
+            ws.cell(row=row_idx, column=col_idx, value=value).style = TEXT
 
-    col_widths = [5, 50, 50, 50, 40, 30, 40]
-    for i, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(i)].width = width
+    set_column_widths(ws, TOULMIN_WIDTHS)
 
 
-def create_sources_sheet(wb: Workbook, data: dict) -> None:
+def create_sources_sheet(wb: Workbook, analysis: Analysis) -> None:
     """Crée une feuille d'évaluation CRAAP des sources."""
     ws = wb.create_sheet("Évaluation sources (CRAAP)")
 
-    headers = ["Source", "Arg. N°", "Currency", "Relevance", "Authority", "Accuracy", "Purpose", "Score moyen"]
-
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = STYLES["header_font"]
-        cell.fill = STYLES["header_fill"]
-        cell.alignment = STYLES["center_align"]
-        cell.border = STYLES["thin_border"]
+    write_headers(ws, SOURCES_HEADERS)
 
     row_idx = 2
-    for arg in data.get("arguments", []):
-        for source in arg.get("sources_cited", []):
-            craap = source.get("craap_score", {})
-            scores = [
-                craap.get("currency", 0),
-                craap.get("relevance", 0),
-                craap.get("authority", 0),
-                craap.get("accuracy", 0),
-                craap.get("purpose", 0)
-            ]
-            avg_score = sum(scores) / len(scores) if scores else 0
-
-            row_data = [
-                source.get("name", ""),
-                arg.get("id", ""),
-                *scores,
-                round(avg_score, 1)
-            ]
-
+    for arg in analysis.arguments:
+        for row_data in source_rows(arg):
             for col_idx, value in enumerate(row_data, 1):
                 cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.alignment = STYLES["center_align"] if col_idx > 1 else STYLES["wrap_align"]
-                cell.border = STYLES["thin_border"]
-
-                # Coloration des scores
-                if col_idx >= 3:
-                    if isinstance(value, (int, float)):
-                        cell.fill = get_reliability_fill(int(value))
+                cell.style = CENTER if col_idx > 1 else TEXT
 
             row_idx += 1
 
-    col_widths = [40, 10, 12, 12, 12, 12, 12, 12]
-    for i, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(i)].width = width
+    set_column_widths(ws, SOURCES_WIDTHS)
+
+    # Coloration des scores
+    if row_idx > 2:
+        add_reliability_rules(ws, f"C2:{get_column_letter(len(SOURCES_HEADERS))}{row_idx - 1}")
 
 
-def create_synthesis_sheet(wb: Workbook, data: dict) -> None:
+def create_synthesis_sheet(wb: Workbook, analysis: Analysis) -> None:
     """Crée la feuille de synthèse."""
     ws = wb.create_sheet("Synthèse")
 
-    synthesis = data.get("synthesis", {})
-    metadata = data.get("metadata", {})
-
-    # Métadonnées
-    ws['A1'] = "MÉTADONNÉES"
-    ws['A1'].font = Font(bold=True, size=14)
-    ws['A2'] = f"Titre: {metadata.get('title', 'Non spécifié')}"
-    ws['A3'] = f"Source: {metadata.get('source', 'Non spécifié')}"
-    ws['A4'] = f"Date d'analyse: {metadata.get('date_analysis', 'Non spécifié')}"
-
-    # Synthèse
-    ws['A6'] = "SYNTHÈSE CRITIQUE"
-    ws['A6'].font = Font(bold=True, size=14)
-
-    ws['A8'] = "Points forts:"
-    ws['A8'].font = Font(bold=True)
-    row = 9
-    for strength in synthesis.get("strengths", []):
-        ws[f'A{row}'] = f"• {strength}"
-        row += 1
-
-    row += 1
-    ws[f'A{row}'] = "Points faibles:"
-    ws[f'A{row}'].font = Font(bold=True)
-    row += 1
-    for weakness in synthesis.get("weaknesses", []):
-        ws[f'A{row}'] = f"• {weakness}"
-        row += 1
-
-    row += 1
-    ws[f'A{row}'] = "Figures rhétoriques récurrentes:"
-    ws[f'A{row}'].font = Font(bold=True)
-    row += 1
-    for pattern in synthesis.get("recurring_patterns", []):
-        ws[f'A{row}'] = f"• {pattern}"
-        row += 1
-
-    row += 2
-    ws[f'A{row}'] = "Note méthodologique:"
-    ws[f'A{row}'].font = Font(bold=True)
-    row += 1
-    ws[f'A{row}'] = synthesis.get("methodological_note", "")
-    ws[f'A{row}'].alignment = STYLES["wrap_align"]
-
-    ws.column_dimensions['A'].width = 100
+    for row, value, style in synthesis_entries(analysis.metadata, analysis.synthesis):
+        cell = ws.cell(row=row, column=1, value=value)
+        if style:
+            cell.style = style
+
+    set_column_widths(ws, SYNTHESIS_WIDTHS)
 
 
 def create_legend_sheet(wb: Workbook) -> None:
     """Crée la feuille de légende."""
     ws = wb.create_sheet("Légende")
 
-    ws['A1'] = "ÉCHELLE DE FIABILITÉ"
-    ws['A1'].font = Font(bold=True, size=14)
+    for row, cells in legend_rows():
+        for col, (value, style) in enumerate(cells, 1):
+            cell = ws.cell(row=row, column=col, value=value)
+            if style:
+                cell.style = style
 
-    legend = [
-        (5, "Très haute", "Fait établi, consensus scientifique, sources multiples vérifiables"),
-        (4, "Bonne", "Sources sérieuses, raisonnement logique valide, nuances possibles"),
-        (3, "Moyenne", "Mélange faits/interprétations, sources partielles"),
-        (2, "Faible", "Raisonnement contestable, sophismes identifiés"),
-        (1, "Très faible", "Affirmations non sourcées, erreurs logiques majeures"),
-    ]
+    add_reliability_rules(ws, LEGEND_SCALE_RANGE)
+    set_column_widths(ws, LEGEND_WIDTHS)
 
-    headers = ["Note", "Niveau", "Description"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=3, column=col, value=header)
-        cell.font = STYLES["header_font"]
-        cell.fill = STYLES["header_fill"]
-
-    for i, (note, niveau, desc) in enumerate(legend, 4):
-        ws.cell(row=i, column=1, value=note).fill = get_reliability_fill(note)
-        ws.cell(row=i, column=2, value=niveau)
-        ws.cell(row=i, column=3, value=desc)
-
-    ws['A10'] = "CRITÈRES CRAAP"
-    ws['A10'].font = Font(bold=True, size=14)
-
-    craap = [
-        ("Currency", "L'information est-elle à jour ?"),
-        ("Relevance", "L'information est-elle pertinente pour le propos ?"),
-        ("Authority", "L'auteur/source est-il crédible dans ce domaine ?"),
-        ("Accuracy", "Les faits sont-ils vérifiables et exacts ?"),
-        ("Purpose", "Quelle est l'intention ? (informer, persuader, vendre...)"),
-    ]
 
-    for i, (critere, desc) in enumerate(craap, 12):
-        ws.cell(row=i, column=1, value=critere).font = Font(bold=True)
-        ws.cell(row=i, column=2, value=desc)
+def _stream_cell(ws, value, style: str | None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    if style:
+        cell.style = style
+    return cell
+
 
-    ws.column_dimensions['A'].width = 15
-    ws.column_dimensions['B'].width = 20
-    ws.column_dimensions['C'].width = 60
+def _stream_sparse_rows(ws, rows: Iterable[tuple[int, list[tuple[object, str | None]]]]) -> None:
+    """Écrit des lignes numérotées dans une feuille write-only en comblant les trous."""
+    next_row = 1
+    for row, cells in rows:
+        for _ in range(row - next_row):
+            ws.append([])
+        ws.append([_stream_cell(ws, value, style) for value, style in cells])
+        next_row = row + 1
 
 
-def save_report(data: dict, output_path: str) -> bool:
+def stream_workbook(analysis: Analysis | AnalysisReader) -> Workbook:
     """
-    Génère le fichier XLSX à partir du dictionnaire d'analyse.
+    Construit le classeur en mode write-only (mémoire constante).
+
+    Chaque argument est écrit immédiatement dans les trois feuilles tabulaires,
+    dont les lignes sont envoyées au fil de l'eau dans des fichiers temporaires
+    par openpyxl. Les mêmes cinq feuilles que le mode standard sont produites.
+    Les métadonnées et la synthèse ne sont lues qu'après les arguments, ce qui
+    permet à un lecteur incrémental de ne parcourir le fichier qu'une fois.
+
     Args:
-        data: Dictionnaire contenant l'analyse structurée.
+        analysis: Modèle analysé ou lecteur incrémental.
+
+    Returns:
+        Classeur write-only prêt à être sauvegardé.
+    """
+    wb = Workbook(write_only=True)
+    register_styles(wb)
+    main_ws, toulmin_ws, sources_ws, synthesis_ws, legend_ws = (
+        wb.create_sheet(title) for title in SHEET_TITLES
+    )
+
+    # Les dimensions de colonnes doivent précéder l'écriture des lignes
+    for ws, widths in [
+        (main_ws, MAIN_WIDTHS),
+        (toulmin_ws, TOULMIN_WIDTHS),
+        (sources_ws, SOURCES_WIDTHS),
+        (synthesis_ws, SYNTHESIS_WIDTHS),
+        (legend_ws, LEGEND_WIDTHS),
+    ]:
+        set_column_widths(ws, widths)
+
+    for ws, headers in [
+        (main_ws, MAIN_HEADERS),
+        (toulmin_ws, TOULMIN_HEADERS),
+        (sources_ws, SOURCES_HEADERS),
+    ]:
+        ws.append([_stream_cell(ws, header, HEADER) for header in headers])
+
+    main_styles = [TEXT] * len(MAIN_HEADERS)
+    main_styles[RELIABILITY_COLUMN - 1] = CENTER
+    source_styles = [TEXT] + [CENTER] * (len(SOURCES_HEADERS) - 1)
+
+    row_idx = 1
+    source_row_idx = 1
+    for arg in analysis.arguments:
+        row_idx += 1
+        # La dimension est lue à l'écriture de la ligne puis libérée
+        main_ws.row_dimensions[row_idx].height = MAIN_ROW_HEIGHT
+        main_ws.append([
+            _stream_cell(main_ws, value, style)
+            for value, style in zip(main_row(arg), main_styles)
+        ])
+        del main_ws.row_dimensions[row_idx]
+
+        toulmin_ws.append([_stream_cell(toulmin_ws, v, TEXT) for v in toulmin_row(arg)])
+
+        for row_data in source_rows(arg):
+            source_row_idx += 1
+            sources_ws.append([
+                _stream_cell(sources_ws, value, style)
+                for value, style in zip(row_data, source_styles)
+            ])
+
+    # Les règles conditionnelles sont écrites après les lignes, à la fermeture
+    if row_idx > 1:
+        column = get_column_letter(RELIABILITY_COLUMN)
+        add_reliability_rules(main_ws, f"{column}2:{column}{row_idx}")
+    if source_row_idx > 1:
+        last_column = get_column_letter(len(SOURCES_HEADERS))
+        add_reliability_rules(sources_ws, f"C2:{last_column}{source_row_idx}")
+
+    _stream_sparse_rows(
+        synthesis_ws,
+        (
+            (row, [(value, style)])
+            for row, value, style in synthesis_entries(analysis.metadata, analysis.synthesis)
+        ),
+    )
+    _stream_sparse_rows(legend_ws, legend_rows())
+    add_reliability_rules(legend_ws, LEGEND_SCALE_RANGE)
+
+    return wb
+
+
+def save_report(
+    data: dict | Analysis | AnalysisReader, output_path: str, streaming: bool = False
+) -> bool:
+    """
+    Génère le fichier XLSX à partir de l'analyse.
+    Args:
+        data: Dictionnaire contenant l'analyse structurée, modèle déjà analysé,
+            ou lecteur incrémental (consommé au fil de l'eau en mode streaming).
         output_path: Chemin vers le fichier XLSX de sortie.
+        streaming: Utilise un classeur write-only dont la mémoire ne croît pas
+            avec le nombre d'arguments (recommandé pour les gros corpus).
     Returns:
         True si succès, False sinon
     """
-    wb = Workbook()
-
-    create_main_analysis_sheet(wb, data)
-    create_toulmin_sheet(wb, data)
-    create_sources_sheet(wb, data)
-    create_synthesis_sheet(wb, data)
-    create_legend_sheet(wb)
+    if streaming:
+        wb = stream_workbook(as_streamable(data))
+    else:
+        analysis = as_analysis(data)
+        wb = Workbook()
+        register_styles(wb)
+
+        create_main_analysis_sheet(wb, analysis)
+        create_toulmin_sheet(wb, analysis)
+        create_sources_sheet(wb, analysis)
+        create_synthesis_sheet(wb, analysis)
+        create_legend_sheet(wb)
 
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1,15 +1,27 @@
 import json
 
+from scripts.model import Analysis, analysis_to_dict, as_analysis
+from scripts.reader import AnalysisReader
 
-def save_report(data: dict, output_path: str) -> bool:
+
+def save_report(data: dict | Analysis | AnalysisReader, output_path: str) -> bool:
     """
     Sauvegarde le dictionnaire d'analyse au format JSON.
+
+    Un modèle analysé est réécrit depuis son document d'origine, sans perte
+    des champs que le modèle ne représente pas (un lecteur incrémental est
+    donc chargé en entier); un modèle construit en mémoire est sérialisé
+    depuis ses champs.
     Args:
-        data: Dictionnaire contenant l'analyse structurée.
+        data: Dictionnaire contenant l'analyse structurée, modèle analysé,
+            ou lecteur incrémental.
         output_path: Chemin vers le fichier JSON de sortie.
     Returns:
         True si succès, False sinon
     """
+    if not isinstance(data, dict):
+        analysis = as_analysis(data)
+        data = analysis.raw if analysis.raw is not None else analysis_to_dict(analysis)
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,198 @@
+"""
+Mise en page des rapports tableur, indépendante du moteur d'écriture.
+
+Ce module décrit le contenu des cinq feuilles (en-têtes, lignes, largeurs,
+styles nommés, bandes de couleur de fiabilité) sans dépendre d'openpyxl, afin
+d'être partagé par le formateur openpyxl et le moteur XLSX natif.
+"""
+
+from collections.abc import Iterator
+
+from scripts.model import Argument, Metadata, Synthesis, shown
+
+SHEET_TITLES = [
+    "Analyse rhétorique",
+    "Détail Toulmin",
+    "Évaluation sources (CRAAP)",
+    "Synthèse",
+    "Légende",
+]
+
+# Styles nommés (référencés par nom dans les descriptions de feuilles)
+HEADER = "Analyse - En-tête"
+LEGEND_HEADER = "Analyse - En-tête légende"
+TEXT = "Analyse - Texte"
+CENTER = "Analyse - Centré"
+WRAP = "Analyse - Paragraphe"
+TITLE = "Analyse - Titre"
+BOLD = "Analyse - Gras"
+
+# Bandes de fiabilité: (seuil minimal, couleur RGB), évaluées dans l'ordre
+RELIABILITY_BANDS = [
+    (4, "C6EFCE"),     # Vert (4-5)
+    (3, "FFEB9C"),     # Jaune (3)
+    (None, "FFC7CE"),  # Rouge (1-2)
+]
+
+
+def reliability_band_formulas(cell_range: str) -> list[tuple[str, str]]:
+    """
+    Traduit les bandes de fiabilité en formules de mise en forme conditionnelle.
+
+    Les cellules non numériques ne sont pas colorées.
+
+    Args:
+        cell_range: Plage au format A1 (ex. "G2:G40"); les formules sont
+            relatives à sa première cellule.
+
+    Returns:
+        Liste de couples (formule, couleur RGB), par priorité décroissante.
+    """
+    ref = cell_range.split(":")[0]
+    number = f"ISNUMBER({ref})"
+    return [
+        (f"AND({number},{ref}>={threshold})" if threshold is not None else number, color)
+        for threshold, color in RELIABILITY_BANDS
+    ]
+
+
+MAIN_HEADERS = [
+    "N°",
+    "Argument traité",
+    "Texte original (extrait)",
+    "Thèse (Claim)",
+    "Type de raisonnement",
+    "Sophismes détectés",
+    "Fiabilité (1-5)",
+    "Évaluation de la fiabilité",
+    "Commentaire"
+]
+MAIN_WIDTHS = [5, 25, 45, 40, 40, 25, 12, 45, 40]
+MAIN_ROW_HEIGHT = 150
+RELIABILITY_COLUMN = 7
+
+TOULMIN_HEADERS = ["N°", "Claim", "Grounds", "Warrant", "Backing", "Qualifier", "Rebuttal"]
+TOULMIN_WIDTHS = [5, 50, 50, 50, 40, 30, 40]
+
+SOURCES_HEADERS = [
+    "Source", "Arg. N°", "Currency", "Relevance", "Authority", "Accuracy", "Purpose", "Score moyen"
+]
+SOURCES_WIDTHS = [40, 10, 12, 12, 12, 12, 12, 12]
+
+
+def main_row(arg: Argument) -> list:
+    """Construit la ligne de la feuille principale pour un argument."""
+    original_text = arg.original_text
+    return [
+        arg.id,
+        arg.label,
+        original_text[:500] + ("..." if len(original_text) > 500 else ""),
+        arg.claim,
+        arg.reasoning_type,
+        arg.format_fallacies("\n"),
+        shown(arg.reliability),
+        arg.reliability_rationale,
+        arg.comment
+    ]
+
+
+def toulmin_row(arg: Argument) -> list:
+    """Construit la ligne de la feuille Toulmin pour un argument."""
+    return [arg.id, arg.claim, arg.grounds, shown(arg.warrant), shown(arg.backing),
+            shown(arg.qualifier), arg.rebuttal]
+
+
+def source_rows(arg: Argument) -> Iterator[list]:
+    """Construit les lignes CRAAP des sources citées par un argument."""
+    for source in arg.sources:
+        yield [source.name, arg.id, *source.craap.scores, source.craap.average]
+
+
+LEGEND_SCALE = [
+    (5, "Très haute", "Fait établi, consensus scientifique, sources multiples vérifiables"),
+    (4, "Bonne", "Sources sérieuses, raisonnement logique valide, nuances possibles"),
+    (3, "Moyenne", "Mélange faits/interprétations, sources partielles"),
+    (2, "Faible", "Raisonnement contestable, sophismes identifiés"),
+    (1, "Très faible", "Affirmations non sourcées, erreurs logiques majeures"),
+]
+
+LEGEND_CRAAP = [
+    ("Currency", "L'information est-elle à jour ?"),
+    ("Relevance", "L'information est-elle pertinente pour le propos ?"),
+    ("Authority", "L'auteur/source est-il crédible dans ce domaine ?"),
+    ("Accuracy", "Les faits sont-ils vérifiables et exacts ?"),
+    ("Purpose", "Quelle est l'intention ? (informer, persuader, vendre...)"),
+]
+
+
+def synthesis_entries(
+    metadata: Metadata, synthesis: Synthesis
+) -> list[tuple[int, str, str | None]]:
+    """
+    Décrit le contenu de la feuille de synthèse (colonne A).
+
+    Returns:
+        Liste ordonnée de tuples (ligne, valeur, style nommé ou None).
+    """
+    # Métadonnées
+    entries = [
+        (1, "MÉTADONNÉES", TITLE),
+        (2, f"Titre: {metadata.title}", None),
+        (3, f"Source: {metadata.source}", None),
+        (4, f"Date d'analyse: {metadata.date_analysis}", None),
+        # Synthèse
+        (6, "SYNTHÈSE CRITIQUE", TITLE),
+        (8, "Points forts:", BOLD),
+    ]
+    row = 9
+    for strength in synthesis.strengths:
+        entries.append((row, f"• {strength}", None))
+        row += 1
+
+    row += 1
+    entries.append((row, "Points faibles:", BOLD))
+    row += 1
+    for weakness in synthesis.weaknesses:
+        entries.append((row, f"• {weakness}", None))
+        row += 1
+
+    row += 1
+    entries.append((row, "Figures rhétoriques récurrentes:", BOLD))
+    row += 1
+    for pattern in synthesis.recurring_patterns:
+        entries.append((row, f"• {pattern}", None))
+        row += 1
+
+    row += 2
+    entries.append((row, "Note méthodologique:", BOLD))
+    row += 1
+    entries.append((row, synthesis.methodological_note, WRAP))
+    return entries
+
+
+LEGEND_SCALE_RANGE = "A4:A8"
+
+
+def legend_rows() -> list[tuple[int, list[tuple[object, str | None]]]]:
+    """
+    Décrit le contenu de la feuille de légende.
+
+    Returns:
+        Liste ordonnée de tuples (ligne, cellules) où chaque cellule est un
+        couple (valeur, style nommé ou None).
+    """
+    rows = [
+        (1, [("ÉCHELLE DE FIABILITÉ", TITLE)]),
+        (3, [("Note", LEGEND_HEADER), ("Niveau", LEGEND_HEADER), ("Description", LEGEND_HEADER)]),
+    ]
+    for i, (note, niveau, desc) in enumerate(LEGEND_SCALE, 4):
+        rows.append((i, [(note, None), (niveau, None), (desc, None)]))
+
+    rows.append((10, [("CRITÈRES CRAAP", TITLE)]))
+    for i, (critere, desc) in enumerate(LEGEND_CRAAP, 12):
+        rows.append((i, [(critere, BOLD), (desc, None)]))
+    return rows
+
+
+LEGEND_WIDTHS = [15, 20, 60]
+SYNTHESIS_WIDTHS = [100]
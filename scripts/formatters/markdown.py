@@ -1,129 +1,147 @@
-def format_fallacies(fallacies: list) -> str:
-    """Format fallacies list to string, supporting both string and dict formats."""
-    if not fallacies:
-        return "Aucun détecté"
-
-    result = []
-    for f in fallacies:
-        if isinstance(f, str):
-            result.append(f)
-        elif isinstance(f, dict):
-            name = f.get("name", "Inconnu")
-            severity = f.get("severity", "")
-            if severity:
-                result.append(f"{name} ({severity})")
-            else:
-                result.append(name)
-
-    return ", ".join(result) if result else "Aucun détecté"
-
-
-def save_report(data: dict, output_path: str) -> bool:
-    """
-    Génère un rapport Markdown à partir du dictionnaire d'analyse.
-    Args:
-        data: Dictionnaire contenant l'analyse structurée.
-        output_path: Chemin vers le fichier Markdown de sortie.
-    Returns:
-        True si succès, False sinon
-    """
-    markdown_content = []
+import os
+import sys
+from collections.abc import Iterator
+from typing import TextIO
+
+from scripts.formatters import STDOUT
+from scripts.formatters.layout import LEGEND_CRAAP, LEGEND_SCALE
+from scripts.model import Analysis, shown
+from scripts.reader import AnalysisReader, as_streamable
+
+CHUNK_SIZE = 1 << 16  # caractères regroupés par écriture
 
+
+def iter_lines(analysis: Analysis | AnalysisReader) -> Iterator[str]:
+    """Produit les lignes du rapport Markdown, sans les accumuler."""
     # Metadata
-    metadata = data.get("metadata", {})
-    markdown_content.append(f"# Analyse Rhétorique: {metadata.get('title', 'Non spécifié')}")
-    markdown_content.append(f"**Source:** {metadata.get('source', 'Non spécifié')}")
-    markdown_content.append(f"**Date d'analyse:** {metadata.get('date_analysis', 'Non spécifié')}")
-    markdown_content.append(f"**Analyste:** {metadata.get('analyst', 'Non spécifié')}\n")
+    metadata = analysis.metadata
+    yield f"# Analyse Rhétorique: {metadata.title}"
+    yield f"**Source:** {metadata.source}"
+    yield f"**Date d'analyse:** {metadata.date_analysis}"
+    yield f"**Analyste:** {metadata.analyst}\n"
 
     # Synthesis
-    synthesis = data.get("synthesis", {})
-    markdown_content.append("## Synthèse Critique")
-    markdown_content.append("### Points forts:")
-    for strength in synthesis.get("strengths", []):
-        markdown_content.append(f"- {strength}")
-    markdown_content.append("\n### Points faibles:")
-    for weakness in synthesis.get("weaknesses", []):
-        markdown_content.append(f"- {weakness}")
-    markdown_content.append("\n### Figures rhétoriques récurrentes:")
-    for pattern in synthesis.get("recurring_patterns", []):
-        markdown_content.append(f"- {pattern}")
-    markdown_content.append(f"\n### Note méthodologique:\n{synthesis.get('methodological_note', '')}\n")
+    synthesis = analysis.synthesis
+    yield "## Synthèse Critique"
+    yield "### Points forts:"
+    for strength in synthesis.strengths:
+        yield f"- {strength}"
+    yield "\n### Points faibles:"
+    for weakness in synthesis.weaknesses:
+        yield f"- {weakness}"
+    yield "\n### Figures rhétoriques récurrentes:"
+    for pattern in synthesis.recurring_patterns:
+        yield f"- {pattern}"
+    yield f"\n### Note méthodologique:\n{synthesis.methodological_note}\n"
 
     # Arguments Analysis
-    markdown_content.append("## Analyse Détaillée des Arguments")
-    for arg in data.get("arguments", []):
-        markdown_content.append(f"### Argument N°{arg.get('id', '')}: {arg.get('label', '')}")
-        markdown_content.append(f"**Texte original (extrait):**\n> {arg.get('original_text', '')}\n")
-        markdown_content.append(f"**Thèse (Claim):** {arg.get('claim', '')}")
-        markdown_content.append(f"**Type de raisonnement:** {arg.get('reasoning_type', '')}")
-        markdown_content.append(f"**Sophismes détectés:** {format_fallacies(arg.get('fallacies', []))}")
-        markdown_content.append(f"**Fiabilité (1-5):** {arg.get('reliability', 3)}")
-        markdown_content.append(f"**Évaluation de la fiabilité:** {arg.get('reliability_rationale', '')}")
-        markdown_content.append(f"**Commentaire:** {arg.get('comment', '')}\n")
-
-        markdown_content.append("#### Détail Toulmin")
-        markdown_content.append(f"- **Grounds:** {arg.get('grounds', '')}")
-        markdown_content.append(f"- **Warrant:** {arg.get('warrant', '')}")
-        markdown_content.append(f"- **Backing:** {arg.get('backing', 'Non explicité')}")
-        markdown_content.append(f"- **Qualifier:** {arg.get('qualifier', 'Non explicité')}")
-        markdown_content.append(f"- **Rebuttal:** {arg.get('rebuttal', 'Non reconnu')}\n")
-
-        if arg.get("sources_cited"):
-            markdown_content.append("#### Sources Citées (CRAAP)")
-            markdown_content.append("| Source | Currency | Relevance | Authority | Accuracy | Purpose | Score moyen |")
-            markdown_content.append("|---|---|---|---|---|---|---|")
-            for source in arg.get("sources_cited", []):
-                craap = source.get("craap_score", {})
-                scores = [
-                    craap.get("currency", 0),
-                    craap.get("relevance", 0),
-                    craap.get("authority", 0),
-                    craap.get("accuracy", 0),
-                    craap.get("purpose", 0)
-                ]
-                avg_score = sum(scores) / len(scores) if scores else 0
-                markdown_content.append(
-                    f"| {source.get('name', '')} "
+    yield "## Analyse Détaillée des Arguments"
+    for arg in analysis.arguments:
+        yield f"### Argument N°{arg.id}: {arg.label}"
+        yield f"**Texte original (extrait):**\n> {arg.original_text}\n"
+        yield f"**Thèse (Claim):** {arg.claim}"
+        yield f"**Type de raisonnement:** {arg.reasoning_type}"
+        yield f"**Sophismes détectés:** {arg.format_fallacies(', ')}"
+        yield f"**Fiabilité (1-5):** {shown(arg.reliability)}"
+        yield f"**Évaluation de la fiabilité:** {arg.reliability_rationale}"
+        yield f"**Commentaire:** {arg.comment}\n"
+
+        yield "#### Détail Toulmin"
+        yield f"- **Grounds:** {arg.grounds}"
+        yield f"- **Warrant:** {shown(arg.warrant)}"
+        yield f"- **Backing:** {shown(arg.backing)}"
+        yield f"- **Qualifier:** {shown(arg.qualifier)}"
+        yield f"- **Rebuttal:** {arg.rebuttal}\n"
+
+        if arg.sources:
+            yield "#### Sources Citées (CRAAP)"
+            yield "| Source | Currency | Relevance | Authority | Accuracy | Purpose | Score moyen |"
+            yield "|---|---|---|---|---|---|---|"
+            for source in arg.sources:
+                scores = source.craap.scores
+                yield (
+                    f"| {source.name} "
                     f"| {scores[0]} | {scores[1]} | {scores[2]} | {scores[3]} | {scores[4]} "
-                    f"| {round(avg_score, 1)} |"
+                    f"| {source.craap.average} |"
                 )
-            markdown_content.append("\n")
+            yield "\n"
 
     # Legend
-    markdown_content.append("## Légende")
-    markdown_content.append("### Échelle de Fiabilité")
-    markdown_content.append("| Note | Niveau | Description |")
-    markdown_content.append("|---|---|---|")
-    legend = [
-        (5, "Très haute", "Fait établi, consensus scientifique, sources multiples vérifiables"),
-        (4, "Bonne", "Sources sérieuses, raisonnement logique valide, nuances possibles"),
-        (3, "Moyenne", "Mélange faits/interprétations, sources partielles"),
-        (2, "Faible", "Raisonnement contestable, sophismes identifiés"),
-        (1, "Très faible", "Affirmations non sourcées, erreurs logiques majeures"),
-    ]
-    for note, niveau, desc in legend:
-        markdown_content.append(f"| {note} | {niveau} | {desc} |")
-
-    markdown_content.append("\n### Critères CRAAP")
-    markdown_content.append("| Critère | Description |")
-    markdown_content.append("|---|---|")
-    craap_criteria = [
-        ("Currency", "L'information est-elle à jour ?"),
-        ("Relevance", "L'information est-elle pertinente pour le propos ?"),
-        ("Authority", "L'auteur/source est-il crédible dans ce domaine ?"),
-        ("Accuracy", "Les faits sont-ils vérifiables et exacts ?"),
-        ("Purpose", "Quelle est l'intention ? (informer, persuader, vendre...)"),
-    ]
-    for critere, desc in craap_criteria:
-        markdown_content.append(f"| {critere} | {desc} |")
+    yield "## Légende"
+    yield "### Échelle de Fiabilité"
+    yield "| Note | Niveau | Description |"
+    yield "|---|---|---|"
+    for note, niveau, desc in LEGEND_SCALE:
+        yield f"| {note} | {niveau} | {desc} |"
+
+    yield "\n### Critères CRAAP"
+    yield "| Critère | Description |"
+    yield "|---|---|"
+    for critere, desc in LEGEND_CRAAP:
+        yield f"| {critere} | {desc} |"
+
+
+def iter_chunks(analysis: Analysis | AnalysisReader, size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Regroupe les lignes du rapport en blocs d'environ `size` caractères.
+
+    La concaténation des blocs donne le rapport complet (lignes séparées par
+    un saut de ligne, sans saut de ligne final).
+    """
+    pending, length, separator = [], 0, ""
+    for line in iter_lines(analysis):
+        pending.append(line)
+        length += len(line) + 1
+        if length >= size:
+            yield separator + "\n".join(pending)
+            pending, length, separator = [], 0, "\n"
+    if pending:
+        yield separator + "\n".join(pending)
+
+
+def write_report(data: dict | Analysis | AnalysisReader, stream: TextIO) -> None:
+    """Écrit le rapport Markdown bloc par bloc dans un flux texte."""
+    for chunk in iter_chunks(as_streamable(data)):
+        stream.write(chunk)
+
+
+def save_report(data: dict | Analysis | AnalysisReader, output_path: str) -> bool:
+    """
+    Génère un rapport Markdown à partir de l'analyse, écrit au fil de l'eau.
+    Args:
+        data: Dictionnaire contenant l'analyse structurée, modèle déjà analysé,
+            ou lecteur incrémental.
+        output_path: Chemin vers le fichier Markdown de sortie, ou `-` pour
+            la sortie standard (les messages passent alors sur stderr).
+    Returns:
+        True si succès, False sinon
+    """
+    analysis = as_streamable(data)
+    if isinstance(analysis, AnalysisReader):
+        # Document invalide: erreur avant de créer la sortie, pas de rapport tronqué
+        analysis.validate()
+
+    if str(output_path) == STDOUT:
+        try:
+            write_report(analysis, sys.stdout)
+            sys.stdout.flush()
+            return True
+        except BrokenPipeError:
+            # Lecteur fermé avant la fin (ex. `| head`): il a lu ce qu'il
+            # voulait, ce n'est pas un échec. On évite une seconde erreur à la
+            # fermeture de l'interpréteur
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return True
+        except Exception as e:
+            print(f"❌ Erreur lors de l'écriture du rapport Markdown: {e}", file=sys.stderr)
+            return False
 
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(markdown_content))
+        with open(output_path, 'w', encoding='utf-8', buffering=CHUNK_SIZE) as f:
+            write_report(analysis, f)
         print(f"✅ Fichier généré: {output_path}")
         return True
     except Exception as e:
         print(f"❌ Erreur lors de la sauvegarde du fichier Markdown: {e}")
-        return False
\ No newline at end of file
+        return False
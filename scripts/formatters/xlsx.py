@@ -0,0 +1,20 @@
+"""
+Formateur XLSX: délègue au moteur choisi (openpyxl ou natif).
+
+Le moteur n'est importé qu'à l'appel, si bien que le moteur natif ne charge
+jamais openpyxl.
+"""
+
+from pathlib import Path
+
+from scripts.formatters import XLSX_ENGINES, load_object
+from scripts.model import Analysis
+from scripts.reader import AnalysisReader
+
+
+def save_report(
+    data: dict | Analysis | AnalysisReader, output_path: Path, streaming: bool = False,
+    engine: str = "openpyxl",
+) -> bool:
+    """Génère le rapport XLSX avec le moteur choisi (openpyxl ou natif)."""
+    return load_object(XLSX_ENGINES[engine])(data, output_path, streaming=streaming)
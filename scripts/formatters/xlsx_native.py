@@ -0,0 +1,359 @@
+"""
+Moteur XLSX natif, sans dépendance.
+
+Écrit directement les parties SpreadsheetML du classeur dans une archive
+`zipfile`, avec la même mise en page que le formateur openpyxl (voir
+`scripts.formatters.layout`). Les chaînes passent par une table partagée
+(sharedStrings.xml) qui déduplique les valeurs répétées comme
+"Non explicité" ou "Aucun détecté".
+"""
+
+import json
+import re
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Iterable
+from xml.sax.saxutils import escape, quoteattr
+
+from scripts.formatters.layout import (
+    BOLD,
+    CENTER,
+    HEADER,
+    LEGEND_HEADER,
+    LEGEND_SCALE_RANGE,
+    LEGEND_WIDTHS,
+    MAIN_HEADERS,
+    MAIN_ROW_HEIGHT,
+    MAIN_WIDTHS,
+    RELIABILITY_BANDS,
+    RELIABILITY_COLUMN,
+    SHEET_TITLES,
+    SOURCES_HEADERS,
+    SOURCES_WIDTHS,
+    SYNTHESIS_WIDTHS,
+    TEXT,
+    TITLE,
+    TOULMIN_HEADERS,
+    TOULMIN_WIDTHS,
+    WRAP,
+    legend_rows,
+    main_row,
+    reliability_band_formulas,
+    source_rows,
+    synthesis_entries,
+    toulmin_row,
+)
+from scripts.model import Analysis
+from scripts.reader import AnalysisReader, as_streamable
+
+NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Caractères interdits en XML 1.0 (openpyxl les refuse, on les retire)
+ILLEGAL_CHARACTERS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Index des formats de cellule (cellXfs) de STYLES_XML, par style nommé
+STYLE_INDEX = {None: 0, HEADER: 1, LEGEND_HEADER: 2, TEXT: 3, CENTER: 4, WRAP: 5, TITLE: 6, BOLD: 7}
+
+_FONT = '<name val="Calibri"/><family val="2"/>'
+_TOP_WRAP = '<alignment vertical="top" wrapText="1"/>'
+_CENTER_WRAP = '<alignment horizontal="center" vertical="top" wrapText="1"/>'
+_DXFS = "".join(
+    f'<dxf><fill><patternFill patternType="solid"><fgColor rgb="FF{color}"/>'
+    f'<bgColor rgb="FF{color}"/></patternFill></fill></dxf>'
+    for _, color in RELIABILITY_BANDS
+)
+
+STYLES_XML = (
+    XML_DECL
+    + f'<styleSheet xmlns="{NS}">'
+    '<fonts count="4">'
+    f'<font><sz val="11"/><color theme="1"/>{_FONT}<scheme val="minor"/></font>'
+    f'<font><b/><sz val="11"/><color rgb="FFFFFFFF"/>{_FONT}</font>'
+    f'<font><b/><sz val="14"/>{_FONT}</font>'
+    f'<font><b/><sz val="11"/>{_FONT}</font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF2F5496"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/>'
+    '<bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="8">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1"'
+    f' applyBorder="1" applyAlignment="1">{_CENTER_WRAP}</xf>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"'
+    f' applyAlignment="1">{_TOP_WRAP}</xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"'
+    f' applyAlignment="1">{_CENTER_WRAP}</xf>'
+    f'<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">{_TOP_WRAP}</xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="3" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    f'<dxfs count="{len(RELIABILITY_BANDS)}">{_DXFS}</dxfs>'
+    '</styleSheet>'
+)
+
+
+def column_letter(index: int) -> str:
+    """Convertit un index de colonne (à partir de 1) en lettres (1 → A, 27 → AA)."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class SharedStrings:
+    """Table des chaînes partagées: chaque valeur distincte n'est stockée qu'une fois."""
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self.count = 0
+
+    def add(self, value: str) -> int:
+        """Retourne l'index de la chaîne, en l'ajoutant si nécessaire."""
+        self.count += 1
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._index)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def write(self, stream) -> None:
+        """Écrit sharedStrings.xml dans un flux binaire."""
+        stream.write(
+            f'{XML_DECL}<sst xmlns="{NS}" count="{self.count}" uniqueCount="{len(self)}">'.encode()
+        )
+        for value in self._index:
+            stream.write(f'<si><t xml:space="preserve">{escape(value)}</t></si>'.encode())
+        stream.write(b"</sst>")
+
+
+class SheetWriter:
+    """
+    Écrit une feuille ligne par ligne dans un fichier temporaire.
+
+    Les lignes sont sérialisées dès leur ajout; seule la table des chaînes
+    partagées reste en mémoire.
+    """
+
+    def __init__(self, title: str, widths: list[int], strings: SharedStrings) -> None:
+        self.title = title
+        self.strings = strings
+        self.row = 0
+        self.conditional_ranges: list[str] = []
+        self._columns = [column_letter(i) for i in range(1, len(widths) + 1)]
+        self._file = tempfile.TemporaryFile()
+        cols = "".join(
+            f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+            for i, width in enumerate(widths, 1)
+        )
+        self._file.write(
+            f'{XML_DECL}<worksheet xmlns="{NS}" xmlns:r="{REL_NS}">'
+            f'<cols>{cols}</cols><sheetData>'.encode()
+        )
+
+    def _cell(self, ref: str, value, style: str | None) -> str:
+        s = STYLE_INDEX[style]
+        style_attr = f' s="{s}"' if s else ""
+        if value is None or value == "":
+            return f'<c r="{ref}"{style_attr}/>' if s else ""
+        if isinstance(value, bool):
+            return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)):
+            return f'<c r="{ref}"{style_attr}><v>{value!r}</v></c>'
+        text = ILLEGAL_CHARACTERS_RE.sub("", str(value))
+        return f'<c r="{ref}"{style_attr} t="s"><v>{self.strings.add(text)}</v></c>'
+
+    def append(self, cells: Iterable[tuple[object, str | None]], height: float | None = None,
+               row: int | None = None) -> None:
+        """
+        Ajoute une ligne.
+
+        Args:
+            cells: Couples (valeur, style nommé ou None), à partir de la colonne A.
+            height: Hauteur de ligne personnalisée.
+            row: Numéro de ligne (par défaut, la ligne suivante); les lignes
+                intermédiaires restent vides.
+        """
+        self.row = row if row is not None else self.row + 1
+        columns = self._columns
+        body = "".join(
+            self._cell(f"{columns[i] if i < len(columns) else column_letter(i + 1)}{self.row}",
+                       value, style)
+            for i, (value, style) in enumerate(cells)
+        )
+        height_attr = f' ht="{height}" customHeight="1"' if height else ""
+        self._file.write(f'<row r="{self.row}"{height_attr}>{body}</row>'.encode())
+
+    def add_reliability_rules(self, cell_range: str) -> None:
+        """Colore une plage de scores selon les bandes de fiabilité (mise en forme conditionnelle)."""
+        self.conditional_ranges.append(cell_range)
+
+    def close(self, zf: zipfile.ZipFile, name: str) -> None:
+        """Termine la feuille et la copie dans l'archive."""
+        tail = ["</sheetData>"]
+        priority = 1
+        for cell_range in self.conditional_ranges:
+            tail.append(f'<conditionalFormatting sqref="{cell_range}">')
+            for dxf_id, (formula, _) in enumerate(reliability_band_formulas(cell_range)):
+                tail.append(
+                    f'<cfRule type="expression" dxfId="{dxf_id}" priority="{priority}"'
+                    f' stopIfTrue="1"><formula>{escape(formula)}</formula></cfRule>'
+                )
+                priority += 1
+            tail.append("</conditionalFormatting>")
+        tail.append("</worksheet>")
+        self._file.write("".join(tail).encode())
+
+        self._file.seek(0)
+        with zf.open(name, "w") as dest:
+            shutil.copyfileobj(self._file, dest, 1 << 20)
+        self._file.close()
+
+
+def _package_parts(sheet_count: int) -> dict[str, str]:
+    """Construit les parties fixes du paquet (types, relations, classeur)."""
+    sheets = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, title in enumerate(SHEET_TITLES[:sheet_count], 1)
+    )
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    sheet_types = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    return {
+        "[Content_Types].xml": (
+            f'{XML_DECL}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{sheet_types}'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/workbook.xml": (
+            f'{XML_DECL}<workbook xmlns="{NS}" xmlns:r="{REL_NS}">'
+            f'<bookViews><workbookView/></bookViews><sheets>{sheets}</sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">{sheet_rels}'
+            f'<Relationship Id="rId{sheet_count + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId{sheet_count + 2}" Type="{REL_NS}/sharedStrings"'
+            ' Target="sharedStrings.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/styles.xml": STYLES_XML,
+    }
+
+
+def write_workbook(analysis: Analysis | AnalysisReader, output_path) -> None:
+    """
+    Écrit le classeur en une seule passe sur les arguments.
+
+    Les métadonnées et la synthèse ne sont lues qu'après les arguments.
+
+    Args:
+        analysis: Modèle analysé ou lecteur incrémental.
+        output_path: Chemin du fichier XLSX de sortie.
+    """
+    strings = SharedStrings()
+    widths = [MAIN_WIDTHS, TOULMIN_WIDTHS, SOURCES_WIDTHS, SYNTHESIS_WIDTHS, LEGEND_WIDTHS]
+    main_ws, toulmin_ws, sources_ws, synthesis_ws, legend_ws = sheets = [
+        SheetWriter(title, w, strings) for title, w in zip(SHEET_TITLES, widths)
+    ]
+
+    for ws, headers in [
+        (main_ws, MAIN_HEADERS),
+        (toulmin_ws, TOULMIN_HEADERS),
+        (sources_ws, SOURCES_HEADERS),
+    ]:
+        ws.append((header, HEADER) for header in headers)
+
+    main_styles = [TEXT] * len(MAIN_HEADERS)
+    main_styles[RELIABILITY_COLUMN - 1] = CENTER
+    source_styles = [TEXT] + [CENTER] * (len(SOURCES_HEADERS) - 1)
+
+    for arg in analysis.arguments:
+        main_ws.append(zip(main_row(arg), main_styles), height=MAIN_ROW_HEIGHT)
+        toulmin_ws.append((value, TEXT) for value in toulmin_row(arg))
+        for row_data in source_rows(arg):
+            sources_ws.append(zip(row_data, source_styles))
+
+    if main_ws.row > 1:
+        column = column_letter(RELIABILITY_COLUMN)
+        main_ws.add_reliability_rules(f"{column}2:{column}{main_ws.row}")
+    if sources_ws.row > 1:
+        sources_ws.add_reliability_rules(
+            f"C2:{column_letter(len(SOURCES_HEADERS))}{sources_ws.row}"
+        )
+
+    for row, value, style in synthesis_entries(analysis.metadata, analysis.synthesis):
+        synthesis_ws.append([(value, style)], row=row)
+    for row, cells in legend_rows():
+        legend_ws.append(cells, row=row)
+    legend_ws.add_reliability_rules(LEGEND_SCALE_RANGE)
+
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _package_parts(len(sheets)).items():
+            zf.writestr(name, content)
+        for i, ws in enumerate(sheets, 1):
+            ws.close(zf, f"xl/worksheets/sheet{i}.xml")
+        with zf.open("xl/sharedStrings.xml", "w") as stream:
+            strings.write(stream)
+
+
+def save_report(
+    data: dict | Analysis | AnalysisReader, output_path: str, streaming: bool = False
+) -> bool:
+    """
+    Génère le fichier XLSX avec le moteur natif.
+    Args:
+        data: Dictionnaire contenant l'analyse structurée, modèle déjà analysé,
+            ou lecteur incrémental (consommé au fil de l'eau).
+        output_path: Chemin vers le fichier XLSX de sortie.
+        streaming: Accepté pour compatibilité avec le moteur openpyxl; le moteur
+            natif écrit toujours les lignes au fil de l'eau.
+    Returns:
+        True si succès, False sinon
+    """
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        write_workbook(as_streamable(data), output_path)
+        print(f"✅ Fichier généré: {output_path}")
+        return True
+    except json.JSONDecodeError:
+        # Entrée invalide découverte en cours de lecture: signalée par l'appelant
+        raise
+    except Exception as e:
+        print(f"❌ Erreur lors de la sauvegarde: {e}")
+        return False
@@ -3,25 +3,333 @@
 Générateur de tableau d'analyse rhétorique
 
 Ce script prend en entrée un fichier JSON contenant l'analyse structurée
-et génère un rapport formaté (XLSX, JSON, ou Markdown).
+et génère un ou plusieurs rapports formatés (XLSX, JSON, ou Markdown).
+L'analyse n'est lue qu'une fois, quel que soit le nombre de formats demandés.
+
+En mode batch (répertoire, motif glob ou manifeste `@fichier.txt` en entrée),
+chaque analyse est rendue dans un pool de processus et le second argument
+désigne le répertoire de sortie.
 
 Usage:
-    python generate_analysis.py <input.json> <output_file> [--format <format>]
+    python generate_analysis.py <input.json> <output_file> [--format <format>[,<format>...]]
+    python generate_analysis.py <dir|glob|@manifest> <output_dir> [--format <formats>] [--jobs N]
+
+Avec plusieurs formats, le chemin de sortie est un modèle: `{stem}` (nom du
+fichier d'entrée), `{ext}` et `{format}` y sont substitués. Sans `{ext}`,
+l'extension du chemin est remplacée par celle de chaque format. Le rapport
+Markdown peut être écrit sur la sortie standard avec `-` comme chemin.
 
 Exemple:
   python generate_analysis.py analysis.json rapport_analyse.xlsx
   python generate_analysis.py analysis.json analysis.json --format json
   python generate_analysis.py analysis.json rapport.md --format md
+  python generate_analysis.py analysis.json - --format md | less
+  python generate_analysis.py analysis.json "rapports/{stem}.{ext}" --format all
+  python generate_analysis.py corpus/ rapports/ --format md --jobs 8
+  python generate_analysis.py "corpus/**/*.json" rapports/
+  python generate_analysis.py @manifest.txt rapports/
 """
 
 import argparse
+import contextlib
+import glob
+import io
 import json
+import os
+import string
 import sys
 from pathlib import Path
 
-import scripts.formatters.excel as excel
-import scripts.formatters.json as json_formatter
-import scripts.formatters.markdown as markdown
+from scripts.formatters import (
+    BUILTIN_FORMATTERS,
+    STDOUT,
+    XLSX_ENGINES,
+    available_formats,
+    get_formatter,
+)
+from scripts.model import Analysis
+from scripts.reader import AnalysisReader, as_streamable
+
+GLOB_CHARS = ("*", "?", "[")
+
+DEFAULT_OUTPUT_TEMPLATE = "{stem}.{ext}"
+TEMPLATE_FIELDS = ("stem", "ext", "format")
+
+
+def parse_formats(value: str) -> list[str]:
+    """
+    Analyse la liste de formats passée à `--format`.
+
+    Args:
+        value: Formats séparés par des virgules, ou `all`.
+
+    Returns:
+        Liste ordonnée et dédupliquée des formats demandés.
+    """
+    if value.strip() == "all":
+        return available_formats()
+    formats = []
+    for fmt in (v.strip() for v in value.split(",")):
+        # Les formats tiers ne sont recherchés que si le format n'est pas intégré
+        if fmt not in BUILTIN_FORMATTERS and fmt not in available_formats():
+            choices = ", ".join([*available_formats(), "all"])
+            raise argparse.ArgumentTypeError(f"invalid choice: '{fmt}' (choose from {choices})")
+        if fmt not in formats:
+            formats.append(fmt)
+    return formats
+
+
+def fill_template(template: str, stem: str, fmt: str) -> str:
+    """
+    Remplace les champs `{stem}`, `{ext}` et `{format}` d'un modèle de sortie.
+
+    Les accolades littérales s'écrivent `{{` et `}}`.
+
+    Raises:
+        ValueError: champ inconnu ou accolade isolée.
+    """
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(template) if field is not None]
+    except ValueError:
+        raise ValueError(
+            f"modèle de sortie invalide: {template} (accolade isolée, écrire {{{{ ou }}}})"
+        ) from None
+    unknown = sorted({field for field in fields if field not in TEMPLATE_FIELDS})
+    if unknown:
+        available = ", ".join(f"{{{field}}}" for field in TEMPLATE_FIELDS)
+        raise ValueError(
+            f"modèle de sortie invalide: {template} (champ(s) inconnu(s): "
+            f"{', '.join(f'{{{field}}}' for field in unknown)}; disponibles: {available})"
+        )
+    return template.format(stem=stem, ext=fmt, format=fmt)
+
+
+def expand_output_path(template: Path, input_path: Path, fmt: str, multiple: bool) -> Path:
+    """
+    Dérive le chemin de sortie d'un format à partir d'un modèle.
+
+    Args:
+        template: Chemin de sortie, pouvant contenir `{stem}`, `{ext}` et `{format}`.
+        input_path: Fichier d'analyse source (fournit `{stem}`).
+        fmt: Format de sortie.
+        multiple: Vrai si plusieurs formats sont produits pour une même entrée.
+
+    Returns:
+        Chemin de sortie pour ce format.
+
+    Raises:
+        ValueError: modèle invalide (voir `fill_template`).
+    """
+    text = str(template)
+    if text == STDOUT:
+        return template
+    if "{" in text or "}" in text:
+        return Path(fill_template(text, input_path.stem, fmt))
+    return template.with_suffix(f".{fmt}") if multiple else template
+
+
+def is_batch_input(spec: str) -> bool:
+    """Indique si l'entrée désigne un lot (répertoire, glob ou manifeste)."""
+    return spec.startswith("@") or any(c in spec for c in GLOB_CHARS) or Path(spec).is_dir()
+
+
+def collect_inputs(spec: str) -> list[Path]:
+    """
+    Résout une spécification d'entrée batch en liste de fichiers JSON.
+
+    Args:
+        spec: Répertoire (parcouru récursivement), motif glob (`**` supporté)
+            ou manifeste préfixé par `@` (un chemin par ligne, `#` pour les commentaires).
+
+    Returns:
+        Liste triée et dédupliquée des fichiers d'entrée.
+    """
+    if spec.startswith("@"):
+        manifest = Path(spec[1:])
+        paths = []
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = Path(line)
+                paths.append(path if path.is_absolute() else manifest.parent / path)
+    elif Path(spec).is_dir():
+        paths = list(Path(spec).rglob("*.json"))
+    else:
+        paths = [Path(p) for p in glob.glob(spec, recursive=True)]
+
+    return sorted(set(paths))
+
+
+def output_paths_for(
+    inputs: list[Path], output_dir: Path, formats: list[str],
+    template: str = DEFAULT_OUTPUT_TEMPLATE,
+) -> list[list[tuple[str, Path]]]:
+    """
+    Calcule les sorties de chaque entrée en conservant l'arborescence relative.
+
+    Returns:
+        Pour chaque entrée, la liste des couples (format, chemin de sortie).
+
+    Raises:
+        ValueError: modèle invalide (voir `fill_template`).
+    """
+    if not inputs:
+        return []
+    parents = [str(p.resolve().parent) for p in inputs]
+    root = Path(os.path.commonpath(parents))
+    outputs = []
+    for p in inputs:
+        rel_dir = output_dir / p.resolve().parent.relative_to(root)
+        outputs.append([
+            (fmt, rel_dir / fill_template(template, p.stem, fmt))
+            for fmt in formats
+        ])
+    return outputs
+
+
+def load_analysis(input_path: Path) -> dict:
+    """Charge un fichier d'analyse JSON."""
+    with open(input_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def streams(fmt: str, options: dict) -> bool:
+    """Indique si le formateur consomme les arguments au fil de l'eau."""
+    if fmt == "xlsx":
+        return options.get("streaming", False) or options.get("engine") == "native"
+    return fmt == "md"
+
+
+def open_analysis(
+    input_path: Path, outputs: list[tuple[str, Path]], options: dict[str, dict] | None = None
+) -> dict | AnalysisReader:
+    """
+    Ouvre un fichier d'analyse pour les formats demandés.
+
+    Si tous les formateurs écrivent au fil de l'eau, l'analyse est lue de façon
+    incrémentale (mémoire bornée par un argument); sinon elle est chargée.
+    Avec le lecteur incrémental, un JSON invalide n'est détecté qu'au rendu.
+    """
+    options = options or {}
+    if all(streams(fmt, options.get(fmt, {})) for fmt, _ in outputs):
+        return AnalysisReader(input_path)
+    return load_analysis(input_path)
+
+
+def render(
+    data: dict | Analysis | AnalysisReader, outputs: list[tuple[str, Path]],
+    options: dict[str, dict] | None = None,
+) -> bool:
+    """
+    Alimente chaque formateur demandé avec la même analyse déjà chargée.
+
+    Le document est converti une seule fois en modèle typé, partagé par
+    tous les formateurs; un lecteur incrémental leur est transmis tel quel.
+
+    Args:
+        data: Dictionnaire contenant l'analyse structurée, modèle analysé,
+            ou lecteur incrémental.
+        outputs: Couples (format, chemin de sortie).
+        options: Paramètres supplémentaires par format (ex. `{"xlsx": {"streaming": True}}`).
+
+    Returns:
+        True si tous les formats ont été générés, False sinon
+    """
+    options = options or {}
+    analysis = as_streamable(data)
+    success = True
+    for fmt, output_path in outputs:
+        success = get_formatter(fmt)(analysis, output_path, **options.get(fmt, {})) and success
+    return success
+
+
+def render_file(
+    input_path: Path, outputs: list[tuple[str, Path]], options: dict[str, dict] | None = None
+) -> tuple[bool, str]:
+    """
+    Rend un fichier d'analyse dans tous les formats demandés
+    (exécuté dans un processus du pool).
+
+    La sortie console des formateurs est capturée pour que les messages
+    des différents processus ne s'entremêlent pas.
+
+    Returns:
+        Tuple (succès, message d'erreur éventuel)
+    """
+    try:
+        data = open_analysis(input_path, outputs, options)
+    except FileNotFoundError:
+        return False, "Fichier non trouvé"
+    except json.JSONDecodeError as e:
+        return False, f"JSON invalide ({e})"
+
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        try:
+            success = render(data, outputs, options)
+        except json.JSONDecodeError as e:  # détecté en cours de lecture incrémentale
+            return False, f"JSON invalide ({e})"
+        except Exception as e:  # un fichier défectueux ne doit pas interrompre le lot
+            print(f"❌ Erreur: {e}")
+            success = False
+
+    if success:
+        return True, ""
+    errors = [line for line in captured.getvalue().splitlines() if line.startswith("❌")]
+    return False, errors[-1].lstrip("❌ ").strip() if errors else "Échec du formateur"
+
+
+def _render_task(task: tuple[Path, list[tuple[str, Path]], dict]) -> tuple[bool, str]:
+    return render_file(*task)
+
+
+def run_batch(
+    inputs: list[Path], output_dir: Path, formats: list[str], jobs: int,
+    template: str = DEFAULT_OUTPUT_TEMPLATE, options: dict[str, dict] | None = None,
+) -> int:
+    """
+    Rend un lot de fichiers en parallèle et affiche un bilan par fichier.
+
+    Args:
+        inputs: Fichiers d'analyse JSON à rendre.
+        output_dir: Répertoire racine des rapports.
+        formats: Formats de sortie (chaque entrée n'est lue qu'une fois).
+        jobs: Nombre de processus (1 = exécution séquentielle dans le processus courant).
+        template: Modèle du nom des rapports (`{stem}`, `{ext}`, `{format}`).
+        options: Paramètres supplémentaires par format.
+
+    Returns:
+        Nombre de fichiers en échec.
+    """
+    outputs = output_paths_for(inputs, output_dir, formats, template)
+    tasks = [(path, out, options or {}) for path, out in zip(inputs, outputs)]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        results = map(_render_task, tasks)
+        executor = None
+    else:
+        # Importé ici: multiprocessing alourdit le démarrage du mode fichier unique
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Des paquets de tâches amortissent le coût IPC sur les gros corpus
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(_render_task, tasks, chunksize=chunksize)
+
+    failures = 0
+    try:
+        for (input_path, outputs, _), (success, error) in zip(tasks, results):
+            if success:
+                print(f"✅ {input_path} → {', '.join(str(p) for _, p in outputs)}")
+            else:
+                failures += 1
+                print(f"❌ {input_path}: {error}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print(f"\n📊 Bilan: {len(tasks) - failures} succès, {failures} échec(s) sur {len(tasks)} fichier(s)")
+    return failures
 
 
 def main():
@@ -31,45 +339,103 @@ def main():
     )
     parser.add_argument(
         "input_file",
-        type=Path,
-        help="Chemin vers le fichier JSON d'entrée contenant l'analyse structurée."
+        help=(
+            "Chemin vers le fichier JSON d'entrée contenant l'analyse structurée,\n"
+            "ou lot: répertoire, motif glob, ou manifeste préfixé par @."
+        )
     )
     parser.add_argument(
         "output_file",
         type=Path,
-        help="Chemin vers le fichier de sortie du rapport."
+        help=(
+            "Chemin vers le fichier de sortie du rapport (répertoire en mode batch).\n"
+            "Peut contenir {stem}, {ext} et {format} ({{ et }} pour des accolades).\n"
+            "`-` écrit le rapport md sur la sortie standard."
+        )
     )
     parser.add_argument(
         "--format",
-        choices=["xlsx", "json", "md"],
-        default="xlsx",
-        help="Format du fichier de sortie (par défaut: xlsx)."
+        type=parse_formats,
+        default=["xlsx"],
+        help=(
+            "Format(s) de sortie séparés par des virgules: xlsx, json, md, ou all\n"
+            "(par défaut: xlsx). Les formats tiers déclarés dans le groupe d'entry\n"
+            "points rhetorical_analysis.formatters sont aussi acceptés."
+        )
+    )
+    parser.add_argument(
+        "--output-template",
+        default=DEFAULT_OUTPUT_TEMPLATE,
+        help=f"Modèle du nom des rapports en mode batch (par défaut: {DEFAULT_OUTPUT_TEMPLATE})."
+    )
+    parser.add_argument(
+        "--xlsx-streaming",
+        action="store_true",
+        help="Écrit le XLSX en mode write-only, à mémoire constante (gros corpus)."
+    )
+    parser.add_argument(
+        "--xlsx-engine",
+        choices=list(XLSX_ENGINES),
+        default="openpyxl",
+        help=(
+            "Moteur d'écriture XLSX (par défaut: openpyxl). `native` écrit le\n"
+            "SpreadsheetML directement, sans dépendance."
+        )
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Nombre de processus en mode batch (par défaut: nombre de cœurs)."
     )
 
     args = parser.parse_args()
+    options = {"xlsx": {"streaming": args.xlsx_streaming, "engine": args.xlsx_engine}}
+
+    if is_batch_input(args.input_file):
+        try:
+            inputs = collect_inputs(args.input_file)
+        except FileNotFoundError:
+            print(f"❌ Erreur: Manifeste non trouvé: {args.input_file[1:]}")
+            sys.exit(1)
+        if not inputs:
+            print(f"❌ Erreur: Aucun fichier JSON trouvé pour: {args.input_file}")
+            sys.exit(1)
+        try:
+            failures = run_batch(
+                inputs, args.output_file, args.format, args.jobs, args.output_template, options
+            )
+        except ValueError as e:
+            print(f"❌ Erreur: {e}")
+            sys.exit(1)
+        sys.exit(0 if failures == 0 else 1)
 
-    # Charger les données d'analyse
+    input_file = Path(args.input_file)
+    if str(args.output_file) == STDOUT and args.format != ["md"]:
+        print("❌ Erreur: La sortie standard (-) n'est disponible que pour le format md")
+        sys.exit(1)
+    multiple = len(args.format) > 1
     try:
-        with open(args.input_file, encoding='utf-8') as f:
-            data = json.load(f)
+        outputs = [
+            (fmt, expand_output_path(args.output_file, input_file, fmt, multiple))
+            for fmt in args.format
+        ]
+    except ValueError as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+
+    # Charger (ou ouvrir en lecture incrémentale) puis dispatcher la même
+    # analyse vers chaque formateur demandé
+    try:
+        data = open_analysis(input_file, outputs, options)
+        success = render(data, outputs, options)
     except FileNotFoundError:
-        print(f"❌ Erreur: Fichier non trouvé: {args.input_file}")
+        print(f"❌ Erreur: Fichier non trouvé: {input_file}")
         sys.exit(1)
     except json.JSONDecodeError:
-        print(f"❌ Erreur: Le fichier JSON d'entrée est invalide: {args.input_file}")
+        print(f"❌ Erreur: Le fichier JSON d'entrée est invalide: {input_file}")
         sys.exit(1)
 
-    # Dispatcher vers le bon formateur
-    if args.format == "xlsx":
-        success = excel.save_report(data, args.output_file)
-    elif args.format == "json":
-        success = json_formatter.save_report(data, args.output_file)
-    elif args.format == "md":
-        success = markdown.save_report(data, args.output_file)
-    else:
-        print(f"❌ Erreur: Format de sortie '{args.format}' non supporté.")
-        success = False
-
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Convertit un jeu de données externe en annotations gold du benchmark.
+
+Les fichiers d'entrée sont lus au fil de l'eau et convertis en parallèle (un
+fichier par tâche du pool); chaque argument est écrit dès qu'il est lu, si
+bien que la mémoire reste bornée quelle que soit la taille du jeu.
+
+Formats de sortie:
+- `json`: analyses au format du skill, lisibles par `evaluate.py --batch`
+  (`--shard-size N` découpe les gros fichiers en analyses de N arguments);
+- `ndjson`: un argument par ligne, avec le nom de son document.
+
+Usage:
+    python scripts/import_dataset.py fixedlogic external/logical-fallacy/dataset-fixed/ \\
+        -o benchmark/external/fixedlogic/
+    python scripts/import_dataset.py mafalda gold_standard_dataset.jsonl \\
+        -o benchmark/external/mafalda/ --shard-size 500
+    python scripts/import_dataset.py aaec ArgumentAnnotatedEssays-2.0/brat-project-final/ \
+        -o benchmark/external/aaec/
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+from scripts.importers import IMPORTERS, Document, input_files, load_reader
+
+OUTPUT_FORMATS = ("json", "ndjson")
+
+
+class ImportStats(NamedTuple):
+    """Bilan d'un import: fichiers écrits, arguments et types hors catalogue."""
+
+    files: int
+    arguments: int
+    unknown: Counter
+
+    def __add__(self, other: "ImportStats") -> "ImportStats":
+        return ImportStats(
+            self.files + other.files, self.arguments + other.arguments,
+            self.unknown + other.unknown,
+        )
+
+
+class _DocumentWriter:
+    """Écrit les arguments d'un document, en ouvrant un nouveau fichier par lot."""
+
+    def __init__(self, document: Document, output_dir: Path, fmt: str, shard_size: int):
+        self.document = document
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.files = 0
+        self._file: TextIO | None = None
+        self._count = 0
+
+    def open_file(self) -> None:
+        self.files += 1
+        suffix = f"_{self.files:04}" if self.shard_size else ""
+        path = self.output_dir / f"{self.document.name}{suffix}.{self.fmt}"
+        self._file = open(path, "w", encoding="utf-8")
+        self._count = 0
+        if self.fmt == "json":
+            header = json.dumps({"metadata": self.document.metadata}, ensure_ascii=False)
+            self._file.write(f'{header[:-1]}, "arguments": [\n')
+
+    def close(self) -> None:
+        if self._file is not None:
+            if self.fmt == "json":
+                self._file.write("\n]}\n")
+            self._file.close()
+            self._file = None
+
+    def write(self, argument: dict) -> None:
+        if self._file is None or (self.shard_size and self._count >= self.shard_size):
+            self.close()
+            self.open_file()
+        if self.fmt == "json":
+            prefix = ",\n" if self._count else ""
+            self._file.write(prefix + json.dumps(argument, ensure_ascii=False))
+        else:
+            record = {"document": self.document.name, **argument}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._count += 1
+
+
+def write_document(
+    document: Document, output_dir: Path, fmt: str = "json", shard_size: int = 0
+) -> ImportStats:
+    """Écrit un document au fil de ses arguments (un fichier, ou un par lot de `shard_size`)."""
+    from scripts import fallacy_index
+
+    labels = fallacy_index.get_index().labels
+    writer = _DocumentWriter(document, output_dir, fmt, shard_size)
+    arguments, unknown = 0, Counter()
+    try:
+        for argument in document.arguments:
+            writer.write(argument)
+            arguments += 1
+            for fallacy in argument.get("fallacies", ()):
+                if fallacy["name"] not in labels:
+                    unknown[fallacy.get("source_label", fallacy["name"])] += 1
+        if not writer.files:
+            # Document sans argument: une analyse vide reste évaluable
+            writer.open_file()
+    finally:
+        writer.close()
+    return ImportStats(writer.files, arguments, unknown)
+
+
+def import_file(task: tuple[str, Path, Path, str, int]) -> ImportStats:
+    """Convertit un fichier d'entrée (exécuté dans un processus du pool)."""
+    dataset, path, output_dir, fmt, shard_size = task
+    stats = ImportStats(0, 0, Counter())
+    for document in load_reader(dataset)(path):
+        stats += write_document(document, output_dir, fmt, shard_size)
+    return stats
+
+
+def check_output_names(files: list[Path]) -> None:
+    """
+    Vérifie que les fichiers d'entrée ne produisent pas deux sorties de même nom.
+
+    Une sortie porte le nom de son fichier d'entrée, sans le répertoire: deux
+    fichiers homonymes de sous-répertoires différents s'écraseraient.
+
+    Raises:
+        ValueError: fichiers d'entrée de même nom.
+    """
+    by_name: dict[str, list[Path]] = defaultdict(list)
+    for path in files:
+        by_name[path.stem].append(path)
+    conflicts = [paths for paths in by_name.values() if len(paths) > 1]
+    if conflicts:
+        listing = "; ".join(", ".join(map(str, paths)) for paths in conflicts)
+        raise ValueError(
+            f"fichiers d'entrée de même nom, leurs sorties s'écraseraient: {listing} "
+            "(importer ces répertoires séparément, dans des sorties distinctes)"
+        )
+
+
+def import_dataset(
+    dataset: str,
+    paths: list[Path],
+    output_dir: Path,
+    fmt: str = "json",
+    shard_size: int = 0,
+    jobs: int = 1,
+) -> ImportStats:
+    """
+    Convertit les fichiers d'un jeu de données.
+
+    Les sorties sont écrites dans un répertoire temporaire voisin de
+    `output_dir`, puis déplacées dans `output_dir` une fois tous les fichiers
+    convertis: un import interrompu ne laisse pas de gold partiel.
+
+    Args:
+        dataset: Jeu de données (clé de `IMPORTERS`).
+        paths: Fichiers ou répertoires d'entrée.
+        output_dir: Répertoire de sortie (créé si besoin).
+        fmt: `json` (analyses du skill) ou `ndjson` (un argument par ligne).
+        shard_size: Nombre maximal d'arguments par fichier de sortie (0: sans limite).
+        jobs: Nombre de processus (1 = exécution séquentielle).
+
+    Returns:
+        Bilan cumulé de tous les fichiers.
+
+    Raises:
+        ValueError: fichiers d'entrée de même nom (voir `check_output_names`),
+            ou fichier illisible pour ce jeu de données.
+        OSError: lecture ou écriture impossible.
+    """
+    files = input_files(dataset, paths)
+    check_output_names(files)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=f".{output_dir.name}.", dir=output_dir.parent) as tmp:
+        staging = Path(tmp)
+        tasks = [(dataset, path, staging, fmt, shard_size) for path in files]
+        if jobs <= 1 or len(tasks) <= 1:
+            results = map(import_file, tasks)
+            executor = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = executor.map(
+                import_file, tasks, chunksize=max(1, len(tasks) // (jobs * 4))
+            )
+        try:
+            stats = sum(results, ImportStats(0, 0, Counter()))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        output_dir.mkdir(exist_ok=True)
+        for path in staging.iterdir():
+            os.replace(path, output_dir / path.name)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import d'un jeu de données externe")
+    parser.add_argument(
+        "dataset",
+        choices=list(IMPORTERS),
+        help="; ".join(f"{name}: {importer.description}" for name, importer in IMPORTERS.items()),
+    )
+    parser.add_argument("inputs", nargs="+", help="Fichiers ou répertoires du jeu de données")
+    parser.add_argument("--output", "-o", required=True, help="Répertoire de sortie")
+    parser.add_argument(
+        "--format", "-f",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Analyses du skill (json) ou un argument par ligne (ndjson)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Arguments par fichier de sortie (par défaut: un fichier par fichier d'entrée)",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Nombre de processus (par défaut: nombre de cœurs)",
+    )
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.inputs]
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        print(f"❌ Erreur: introuvable: {', '.join(missing)}")
+        sys.exit(1)
+
+    try:
+        stats = import_dataset(
+            args.dataset, paths, Path(args.output), args.format, args.shard_size, args.jobs
+        )
+    except (ValueError, KeyError, IndexError, json.JSONDecodeError, OSError) as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+
+    print(f"✅ {stats.arguments} exemple(s) importé(s) dans {stats.files} fichier(s) ({args.output})")
+    if stats.unknown:
+        print("⚠️  Types hors catalogue (conservés sous leur forme repliée):")
+        for label, count in stats.unknown.most_common():
+            print(f"   - {label}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Import de jeux de données externes au format d'analyse du skill.
+
+Chaque importeur est un lecteur `module:fonction` importé à la première
+utilisation, associé aux motifs des fichiers qu'il sait lire. Un lecteur
+reçoit un fichier et produit des `Document` dont les arguments sont générés
+au fil de la lecture: un document n'est jamais entièrement en mémoire, et
+les fichiers d'entrée sont traités en parallèle (voir `scripts.import_dataset`).
+
+Les arguments produits suivent le schéma du skill; les sophismes sont
+ramenés aux clés du catalogue (`scripts.fallacy_index`). Les positions dans
+le texte source, quand le jeu de données les fournit, sont conservées dans
+des champs `start`/`end` (décalages en caractères, fin exclue).
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from importlib import import_module
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Document(NamedTuple):
+    """
+    Analyse à écrire: nom du fichier de sortie, métadonnées et arguments.
+
+    Le nom est celui du fichier d'entrée sans extension (`path.stem`), ce qui
+    permet de détecter les sorties en conflit avant l'import.
+    """
+
+    name: str
+    metadata: dict
+    arguments: Iterable[dict]
+
+
+class Importer(NamedTuple):
+    """Lecteur (`module:fonction`) et motifs des fichiers d'entrée."""
+
+    reader: str
+    patterns: tuple[str, ...]
+    description: str
+
+
+IMPORTERS = {
+    "logic": Importer(
+        "scripts.importers.fallacies:read_logic", ("*.csv",),
+        "LOGIC / LogicClimate (CSV, un exemple par ligne)",
+    ),
+    "fixedlogic": Importer(
+        "scripts.importers.fallacies:read_logic", ("*.csv",),
+        "FixedLogic, version nettoyée de LOGIC (CSV)",
+    ),
+    "mafalda": Importer(
+        "scripts.importers.fallacies:read_mafalda", ("*.jsonl",),
+        "MAFALDA (JSONL, sophismes annotés par segment)",
+    ),
+    "aaec": Importer(
+        "scripts.importers.aaec:read_aaec", ("*.ann",),
+        "Argument Annotated Essays Corpus (brat .ann/.txt, structure de Toulmin)",
+    ),
+}
+
+
+def load_reader(dataset: str) -> Callable[[Path], Iterator[Document]]:
+    """Importe le lecteur d'un jeu de données."""
+    module_name, _, attribute = IMPORTERS[dataset].reader.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+def input_files(dataset: str, paths: Iterable[Path]) -> list[Path]:
+    """Fichiers d'entrée: fichiers donnés, ou fichiers des répertoires selon les motifs."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            matched = {f for pattern in IMPORTERS[dataset].patterns for f in path.rglob(pattern)}
+            files.extend(sorted(matched))
+        else:
+            files.append(path)
+    return files
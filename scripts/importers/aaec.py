@@ -0,0 +1,188 @@
+"""
+Importeur de l'Argument Annotated Essays Corpus (AAEC, Stab & Gurevych, 2017).
+
+Chaque essai est une paire brat `essayNNN.txt` / `essayNNN.ann`:
+
+    T1	MajorClaim 503 575	we should attach more importance to cooperation
+    T2	Claim 591 714	...
+    A1	Stance T2 For
+    R1	supports Arg1:T3 Arg2:T2
+
+Les composants sont ramenés à des arguments de Toulmin:
+
+- une thèse (`Claim`) donne un argument: `claim` est son texte, `grounds` les
+  prémisses qui la soutiennent (directement ou par une chaîne de `supports`),
+  `rebuttal` les prémisses qui l'attaquent (et celles qui les soutiennent);
+- la thèse principale (`MajorClaim`, une ou plusieurs reformulations) donne
+  un argument dont les `grounds` sont les thèses `For` et le `rebuttal` les
+  thèses `Against`.
+
+Les positions sont conservées: `start`/`end` de la thèse de l'argument et,
+dans `components`, le type, le rôle et la position de chaque composant
+(décalages en caractères dans le `.txt`, fin exclue).
+
+L'AAEC n'annote ni `warrant`, ni `backing`, ni `qualifier`, ni la fiabilité:
+ces champs valent `null` (non annotés) plutôt que la valeur par défaut du
+modèle, et l'évaluation les ignore.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from scripts.importers import Document
+from scripts.model import NOT_ACKNOWLEDGED
+
+MAJOR_CLAIM, CLAIM = "MajorClaim", "Claim"
+
+
+class Component(NamedTuple):
+    """Composant argumentatif annoté (segment du texte)."""
+
+    id: str
+    type: str
+    start: int
+    end: int
+    text: str
+
+
+class Brat(NamedTuple):
+    """Annotations brat d'un essai."""
+
+    components: dict[str, Component]
+    # (type de relation, source, cible)
+    relations: list[tuple[str, str, str]]
+    # thèse -> "For" ou "Against" (position par rapport à la thèse principale)
+    stances: dict[str, str]
+
+
+def parse_brat(ann: str) -> Brat:
+    """Analyse le contenu d'un fichier `.ann` (composants, relations, positions)."""
+    components, relations, stances = {}, [], {}
+    for line in ann.splitlines():
+        fields = line.split("\t")
+        if len(fields) < 2:
+            continue
+        identifier, annotation = fields[0], fields[1].split()
+        if identifier.startswith("T"):
+            kind, spans = annotation[0], " ".join(annotation[1:]).split(";")
+            # Segment discontinu: du premier début à la dernière fin
+            start, end = int(spans[0].split()[0]), int(spans[-1].split()[-1])
+            text = fields[2] if len(fields) > 2 else ""
+            components[identifier] = Component(identifier, kind, start, end, text)
+        elif identifier.startswith("R"):
+            source = annotation[1].partition(":")[2]
+            target = annotation[2].partition(":")[2]
+            relations.append((annotation[0], source, target))
+        elif identifier.startswith("A") and annotation[0] == "Stance":
+            stances[annotation[1]] = annotation[2]
+    return Brat(components, relations, stances)
+
+
+def _join(components: list[Component]) -> str:
+    return " ".join(c.text for c in sorted(components, key=lambda c: c.start))
+
+
+def _entry(component: Component, role: str) -> dict:
+    return {
+        "id": component.id, "type": component.type, "role": role,
+        "start": component.start, "end": component.end,
+    }
+
+
+def toulmin_arguments(brat: Brat, text: str = "") -> list[dict]:
+    """
+    Arguments de Toulmin d'un essai, dans l'ordre du texte.
+
+    Args:
+        brat: Annotations de l'essai (`parse_brat`).
+        text: Contenu du `.txt`; s'il est fourni, le texte des composants en
+            est extrait par position.
+    """
+    components = brat.components
+    if text:
+        components = {
+            key: c._replace(text=text[c.start:c.end]) for key, c in components.items()
+        }
+    incoming = defaultdict(list)
+    for kind, source, target in brat.relations:
+        if source in components and target in components:
+            incoming[target].append((source, kind))
+
+    def branch(root: str) -> tuple[list[Component], list[Component]]:
+        """Prémisses rattachées à une thèse: soutiens et attaques."""
+        grounds, rebuttal, seen = [], [], {root}
+        stack = [(source, kind == "attacks") for source, kind in incoming[root]]
+        while stack:
+            node, attacking = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            (rebuttal if attacking else grounds).append(components[node])
+            stack.extend(
+                (source, attacking or kind == "attacks") for source, kind in incoming[node]
+            )
+        return grounds, rebuttal
+
+    arguments = []
+    majors = sorted(
+        (c for c in components.values() if c.type == MAJOR_CLAIM), key=lambda c: c.start
+    )
+    if majors:
+        claims = [c for c in components.values() if c.type == CLAIM]
+        grounds = [c for c in claims if brat.stances.get(c.id, "For") != "Against"]
+        rebuttal = [c for c in claims if brat.stances.get(c.id) == "Against"]
+        arguments.append((majors, grounds, rebuttal))
+    for claim in (c for c in components.values() if c.type == CLAIM):
+        arguments.append(([claim], *branch(claim.id)))
+    arguments.sort(key=lambda argument: argument[0][0].start)
+
+    result = []
+    for i, (claims, grounds, rebuttal) in enumerate(arguments, 1):
+        head = claims[0]
+        if head.type == CLAIM and text:
+            # Thèse et prémisses de soutien: passage continu du paragraphe
+            own = claims + grounds
+            original = text[min(c.start for c in own):max(c.end for c in own)]
+        else:
+            # Reformulations de la thèse principale (introduction et conclusion)
+            original = _join(claims)
+        result.append({
+            "id": i,
+            "label": f"{head.type} {head.id}",
+            "original_text": original,
+            "claim": _join(claims),
+            "grounds": _join(grounds),
+            # Non annotés dans l'AAEC: ignorés par l'évaluation
+            "warrant": None,
+            "backing": None,
+            "qualifier": None,
+            "rebuttal": _join(rebuttal) or NOT_ACKNOWLEDGED,
+            "fallacies": [],
+            "reliability": None,
+            "start": head.start,
+            "end": head.end,
+            "components": [
+                *(_entry(c, "claim") for c in claims),
+                *(_entry(c, "grounds") for c in sorted(grounds, key=lambda c: c.start)),
+                *(_entry(c, "rebuttal") for c in sorted(rebuttal, key=lambda c: c.start)),
+            ],
+        })
+    return result
+
+
+def read_aaec(path: Path) -> Iterator[Document]:
+    """Un essai brat (`.ann`, et le `.txt` du même nom s'il existe): une analyse."""
+    text_path = path.with_suffix(".txt")
+    # newline="": les positions brat comptent les fins de ligne telles quelles
+    text = ""
+    if text_path.exists():
+        with open(text_path, encoding="utf-8", newline="") as f:
+            text = f.read()
+    brat = parse_brat(path.read_text(encoding="utf-8"))
+    title = text.split("\n", 1)[0].strip() if text else path.stem
+    metadata = {"title": title, "source": f"AAEC {path.stem}", "analyst": "gold (AAEC)"}
+    yield Document(path.stem, metadata, toulmin_arguments(brat, text))
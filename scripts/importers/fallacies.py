@@ -0,0 +1,140 @@
+"""
+Importeurs des jeux de données de sophismes: LOGIC, FixedLogic et MAFALDA.
+
+- LOGIC (Jin et al., 2022) et sa version nettoyée FixedLogic: fichiers CSV,
+  un exemple par ligne (texte dans `source_article`, type dans
+  `updated_label`; LogicClimate: `logical_fallacies`, éventuellement
+  plusieurs types séparés par des virgules).
+- MAFALDA (Helwe et al., 2024): JSONL, un texte par ligne et ses sophismes
+  annotés par segment (`labels`: `[début, fin, type]`).
+
+Chaque fichier devient une analyse dont les arguments sont les exemples, lus
+ligne à ligne. Les types sont ramenés aux clés du catalogue; un type sans
+équivalent garde sa forme repliée (`appeal_to_ridicule`) et le libellé
+d'origine reste dans `source_label`. Ces jeux ne notent pas la fiabilité:
+`reliability` vaut `null` (non annotée), et l'évaluation ignore alors les
+métriques de fiabilité au lieu de comparer le modèle au score par défaut.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+
+from scripts import fallacy_index
+from scripts.importers import Document
+
+TEXT_COLUMNS = ("source_article", "text", "sentence", "statement")
+LABEL_COLUMNS = ("updated_label", "logical_fallacies", "label", "fallacy", "fallacy_type")
+LABEL_SEPARATORS = re.compile(r"[,;|]")
+# Exemples sans sophisme
+NO_FALLACY = frozenset({"", "nothing", "none", "no_fallacy", "no_fallacies", "not_a_fallacy"})
+CSV_FIELD_LIMIT = 1 << 30
+
+
+@lru_cache(maxsize=1024)
+def map_fallacy(label: str) -> tuple[str, bool]:
+    """
+    Clé du catalogue d'un type de sophisme du jeu de données.
+
+    Returns:
+        Tuple (clé canonique ou forme repliée, type reconnu par l'index)
+    """
+    key = fallacy_index.get_index().lookup(label)
+    return (key, True) if key else (fallacy_index.fold(label), False)
+
+
+def fallacy_entry(label: str, start: int | None = None, end: int | None = None) -> dict | None:
+    """Sophisme au format du skill (None pour « aucun sophisme »)."""
+    key, known = map_fallacy(label)
+    if not known and key in NO_FALLACY:
+        return None
+    entry = {"name": key, "source_label": label.strip()}
+    if start is not None:
+        entry["start"], entry["end"] = start, end
+    return entry
+
+
+def split_labels(cell: str) -> list[str]:
+    """Types d'une cellule CSV (`a`, `a, b` ou `['a', 'b']`)."""
+    return [
+        label for part in LABEL_SEPARATORS.split(cell)
+        if (label := part.strip().strip("[]'\"").strip())
+    ]
+
+
+def _metadata(dataset: str, path: Path) -> dict:
+    return {
+        "title": f"{dataset} — {path.stem}",
+        "source": path.name,
+        "analyst": f"gold ({dataset})",
+    }
+
+
+def _pick_column(fieldnames: list[str], candidates: tuple[str, ...], path: Path) -> str:
+    columns = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in columns:
+            return columns[candidate]
+    raise ValueError(
+        f"{path.name}: aucune colonne parmi {', '.join(candidates)} "
+        f"(colonnes: {', '.join(fieldnames)})"
+    )
+
+
+def _logic_arguments(path: Path) -> Iterator[dict]:
+    csv.field_size_limit(CSV_FIELD_LIMIT)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        text_column = _pick_column(reader.fieldnames or [], TEXT_COLUMNS, path)
+        label_column = _pick_column(reader.fieldnames or [], LABEL_COLUMNS, path)
+        for row, record in enumerate(reader, 1):
+            text = (record[text_column] or "").strip()
+            if not text:
+                continue
+            fallacies = [
+                entry for label in split_labels(record[label_column] or "")
+                if (entry := fallacy_entry(label))
+            ]
+            yield {
+                "id": row,
+                "label": f"{path.stem} #{row}",
+                "original_text": text,
+                "fallacies": fallacies,
+                "reliability": None,
+            }
+
+
+def read_logic(path: Path) -> Iterator[Document]:
+    """Un fichier CSV LOGIC/FixedLogic: une analyse, un argument par ligne."""
+    yield Document(path.stem, _metadata("LOGIC", path), _logic_arguments(path))
+
+
+def _mafalda_arguments(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get("text", "")
+            fallacies = []
+            for span in record.get("labels") or []:
+                start, end, label = span[0], span[1], span[2]
+                if entry := fallacy_entry(label, start, end):
+                    fallacies.append(entry)
+            yield {
+                "id": line_number,
+                "label": f"{path.stem} #{record.get('id', line_number)}",
+                "original_text": text,
+                "fallacies": fallacies,
+                "reliability": None,
+            }
+
+
+def read_mafalda(path: Path) -> Iterator[Document]:
+    """Un fichier JSONL MAFALDA: une analyse, un argument par texte."""
+    yield Document(path.stem, _metadata("MAFALDA", path), _mafalda_arguments(path))
@@ -0,0 +1,287 @@
+"""
+Modèle en mémoire d'une analyse rhétorique.
+
+Le JSON produit par le skill est analysé une seule fois en dataclasses
+compactes (`__slots__`) partagées par tous les formateurs et par
+l'évaluateur: les deux formes de sophismes (chaîne ou objet), les valeurs
+par défaut et la moyenne CRAAP sont résolues ici, et les libellés répétés
+sont internés.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from scripts import fallacy_index
+
+if TYPE_CHECKING:
+    from scripts.reader import AnalysisReader
+
+NOT_SPECIFIED = "Non spécifié"
+NOT_EXPLICIT = "Non explicité"
+NOT_ACKNOWLEDGED = "Non reconnu"
+NOT_ANNOTATED = "Non annoté"
+NO_FALLACY = "Aucun détecté"
+UNKNOWN_FALLACY = "Inconnu"
+DEFAULT_RELIABILITY = 3
+
+CRAAP_CRITERIA = ("currency", "relevance", "authority", "accuracy", "purpose")
+
+
+def shown(value: Any) -> Any:
+    """Valeur affichée d'un champ: « Non annoté » s'il vaut None (gold importé)."""
+    return NOT_ANNOTATED if value is None else value
+
+
+def _label(value: Any) -> str:
+    """Interne un libellé susceptible de se répéter dans un corpus."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Fallacy:
+    """Sophisme détecté dans un argument."""
+
+    name: str
+    severity: str = ""
+    description: str = ""
+    # Segment du texte de l'argument (`original_text`) qui porte le sophisme,
+    # en caractères, fin exclue (jeux de données annotés par segment)
+    start: int | None = None
+    end: int | None = None
+
+    @property
+    def key(self) -> str:
+        """Clé canonique du sophisme (voir `fallacy_index`)."""
+        return fallacy_index.normalize(self.name)
+
+    @property
+    def label(self) -> str:
+        """Nom lisible: libellé du catalogue pour un identifiant `snake_case`."""
+        if "_" in self.name and " " not in self.name:
+            return fallacy_index.label(self.name)
+        return self.name
+
+    @property
+    def display(self) -> str:
+        """Libellé affiché: nom suivi de la gravité éventuelle."""
+        return f"{self.label} ({self.severity})" if self.severity else self.label
+
+    @classmethod
+    def parse(cls, value: str | dict) -> Fallacy:
+        """Construit un sophisme depuis la forme chaîne ou objet du schéma."""
+        if isinstance(value, dict):
+            return cls(
+                name=_label(value.get("name", UNKNOWN_FALLACY)),
+                severity=_label(value.get("severity", "")),
+                description=value.get("description", ""),
+                start=value.get("start"),
+                end=value.get("end"),
+            )
+        return cls(name=_label(value))
+
+
+@dataclass(slots=True)
+class CraapScore:
+    """Scores CRAAP (1-5) d'une source; 0 si le critère n'est pas renseigné."""
+
+    currency: float = 0
+    relevance: float = 0
+    authority: float = 0
+    accuracy: float = 0
+    purpose: float = 0
+
+    @property
+    def scores(self) -> list[float]:
+        """Scores dans l'ordre des critères CRAAP."""
+        return [self.currency, self.relevance, self.authority, self.accuracy, self.purpose]
+
+    @property
+    def average(self) -> float:
+        """Score moyen arrondi à une décimale."""
+        return round(sum(self.scores) / len(CRAAP_CRITERIA), 1)
+
+    @classmethod
+    def parse(cls, value: dict | None) -> CraapScore:
+        value = value or {}
+        return cls(*(value.get(criterion, 0) for criterion in CRAAP_CRITERIA))
+
+
+@dataclass(slots=True)
+class Source:
+    """Source citée par un argument."""
+
+    name: str
+    craap: CraapScore = field(default_factory=CraapScore)
+
+    @classmethod
+    def parse(cls, value: dict) -> Source:
+        return cls(name=_label(value.get("name", "")), craap=CraapScore.parse(value.get("craap_score")))
+
+
+@dataclass(slots=True)
+class Argument:
+    """Argument analysé selon le modèle de Toulmin."""
+
+    id: int | str
+    label: str = ""
+    original_text: str = ""
+    claim: str = ""
+    grounds: str = ""
+    # None: composant non annoté (gold importé d'un jeu de données qui ne le
+    # distingue pas), ignoré par l'évaluation
+    warrant: str | None = ""
+    backing: str | None = NOT_EXPLICIT
+    qualifier: str | None = NOT_EXPLICIT
+    rebuttal: str = NOT_ACKNOWLEDGED
+    reasoning_type: str = ""
+    fallacies: list[Fallacy] = field(default_factory=list)
+    # None: non annotée (gold importé d'un jeu de données sans score de fiabilité)
+    reliability: int | None = DEFAULT_RELIABILITY
+    reliability_rationale: str = ""
+    sources: list[Source] = field(default_factory=list)
+    comment: str = ""
+
+    def format_fallacies(self, separator: str) -> str:
+        """Liste les sophismes pour l'affichage, ou « Aucun détecté »."""
+        return separator.join(f.display for f in self.fallacies) or NO_FALLACY
+
+    @classmethod
+    def parse(cls, value: dict, index: int) -> Argument:
+        """
+        Construit un argument depuis sa forme JSON.
+
+        Args:
+            value: Argument au format du schéma.
+            index: Position de l'argument (à partir de 1), utilisée comme
+                identifiant si `id` est absent.
+        """
+        return cls(
+            id=value.get("id", index),
+            label=value.get("label", ""),
+            original_text=value.get("original_text", ""),
+            claim=value.get("claim", ""),
+            grounds=value.get("grounds", ""),
+            warrant=value.get("warrant", ""),
+            backing=_label(value.get("backing", NOT_EXPLICIT)),
+            qualifier=_label(value.get("qualifier", NOT_EXPLICIT)),
+            rebuttal=_label(value.get("rebuttal", NOT_ACKNOWLEDGED)),
+            reasoning_type=_label(value.get("reasoning_type", "")),
+            fallacies=[Fallacy.parse(f) for f in value.get("fallacies") or [] if f],
+            reliability=value.get("reliability", DEFAULT_RELIABILITY),
+            reliability_rationale=value.get("reliability_rationale", ""),
+            sources=[Source.parse(s) for s in value.get("sources_cited") or []],
+            comment=value.get("comment", ""),
+        )
+
+
+@dataclass(slots=True)
+class Metadata:
+    """Informations sur l'article analysé."""
+
+    title: str = NOT_SPECIFIED
+    source: str = NOT_SPECIFIED
+    date_analysis: str = NOT_SPECIFIED
+    analyst: str = NOT_SPECIFIED
+
+    @classmethod
+    def parse(cls, value: dict | None) -> Metadata:
+        value = value or {}
+        return cls(
+            title=value.get("title", NOT_SPECIFIED),
+            source=value.get("source", NOT_SPECIFIED),
+            date_analysis=value.get("date_analysis", NOT_SPECIFIED),
+            analyst=_label(value.get("analyst", NOT_SPECIFIED)),
+        )
+
+
+@dataclass(slots=True)
+class Synthesis:
+    """Synthèse critique de l'analyse."""
+
+    strengths: list[str] = field(default_factory=list)
+    weaknesses: list[str] = field(default_factory=list)
+    recurring_patterns: list[str] = field(default_factory=list)
+    methodological_note: str = ""
+
+    @classmethod
+    def parse(cls, value: dict | None) -> Synthesis:
+        value = value or {}
+        return cls(
+            strengths=list(value.get("strengths", [])),
+            weaknesses=list(value.get("weaknesses", [])),
+            recurring_patterns=[_label(p) for p in value.get("recurring_patterns", [])],
+            methodological_note=value.get("methodological_note", ""),
+        )
+
+
+@dataclass(slots=True)
+class Analysis:
+    """Analyse complète: métadonnées, arguments et synthèse."""
+
+    metadata: Metadata = field(default_factory=Metadata)
+    arguments: list[Argument] = field(default_factory=list)
+    synthesis: Synthesis = field(default_factory=Synthesis)
+    # Document JSON d'origine, conservé pour une réécriture sans perte
+    raw: dict | None = field(default=None, repr=False, compare=False)
+
+
+def parse_analysis(data: dict) -> Analysis:
+    """
+    Analyse un document JSON du skill en modèle typé.
+
+    Args:
+        data: Dictionnaire contenant l'analyse structurée.
+
+    Returns:
+        Analysis référençant le document d'origine dans `raw`.
+    """
+    return Analysis(
+        metadata=Metadata.parse(data.get("metadata")),
+        arguments=[Argument.parse(arg, i) for i, arg in enumerate(data.get("arguments", []), 1)],
+        synthesis=Synthesis.parse(data.get("synthesis")),
+        raw=data,
+    )
+
+
+def _argument_to_dict(arg: Argument) -> dict:
+    """Forme JSON d'un argument: sophismes en objets, sources dans `sources_cited`."""
+    data = asdict(arg)
+    data["fallacies"] = [
+        {key: value for key, value in fallacy.items() if value is not None}
+        for fallacy in data["fallacies"]
+    ]
+    data["sources_cited"] = [
+        {"name": source["name"], "craap_score": source["craap"]} for source in data.pop("sources")
+    ]
+    return data
+
+
+def analysis_to_dict(analysis: Analysis) -> dict:
+    """
+    Forme JSON d'un modèle (inverse de `parse_analysis`).
+
+    Utilisée pour un modèle construit en mémoire, sans document d'origine:
+    les champs que le modèle ne représente pas sont absents.
+    """
+    return {
+        "metadata": asdict(analysis.metadata),
+        "arguments": [_argument_to_dict(arg) for arg in analysis.arguments],
+        "synthesis": asdict(analysis.synthesis),
+    }
+
+
+def as_analysis(data: dict | Analysis | AnalysisReader) -> Analysis:
+    """
+    Retourne le modèle typé, en analysant le dictionnaire si nécessaire.
+
+    Un lecteur incrémental est entièrement chargé: les consommateurs capables
+    de traiter les arguments au fil de l'eau utilisent `reader.as_streamable`.
+    """
+    if isinstance(data, Analysis):
+        return data
+    if isinstance(data, dict):
+        return parse_analysis(data)
+    return data.load()
@@ -0,0 +1,223 @@
+"""
+Lecture incrémentale des fichiers d'analyse JSON.
+
+`json.load` matérialise tout le document avant le moindre traitement, ce qui
+devient prohibitif pour les corpus fusionnés de plusieurs centaines de Mo.
+`AnalysisReader` parcourt le fichier par blocs et produit les arguments un à
+un: la mémoire de pointe est bornée par la taille d'un argument, pas par
+celle du fichier.
+
+Les membres de premier niveau sont décodés avec `json.JSONDecoder.raw_decode`
+et le tableau `arguments` élément par élément. Les erreurs de syntaxe lèvent
+`json.JSONDecodeError`, comme `json.load`, avec leur position dans le fichier.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+from scripts.model import Analysis, Argument, Metadata, Synthesis, as_analysis, parse_analysis
+
+CHUNK_SIZE = 1 << 20  # caractères lus par bloc
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Une erreur aussi près de la fin du tampon peut venir d'un littéral coupé
+# (`tru`, `-Infinit`, `1.`, `\u00`): le bloc suivant peut le compléter
+TRUNCATED_TAIL = 16
+# Fin de tampon qui peut prolonger un nombre (`1` puis `.5`, `e-3`...)
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class _Scanner:
+    """Curseur sur un flux texte lu par blocs."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # position du tampon dans le fichier
+        self._line = 0  # lignes entièrement abandonnées
+        self._line_start = 0  # début (dans le fichier) de la ligne du tampon
+
+    def _fill(self, size: int) -> bool:
+        """Ajoute un bloc au tampon, en abandonnant la partie déjà consommée."""
+        chunk = self._stream.read(size)
+        if not chunk:
+            return False
+        consumed = self._buffer[:self._pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._line += newlines
+            self._line_start = self._offset + consumed.rfind("\n") + 1
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def error(self, message: str, pos: int | None = None) -> json.JSONDecodeError:
+        """Erreur de syntaxe à une position du tampon, rapportée au fichier."""
+        error = json.JSONDecodeError(message, self._buffer, self._pos if pos is None else pos)
+        if error.lineno == 1:
+            error.colno = self._offset + error.pos - self._line_start + 1
+        error.lineno += self._line
+        error.pos += self._offset
+        error.args = (f"{message}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """Vrai si l'erreur peut venir d'une valeur coupée par la fin du tampon."""
+        return (
+            error.msg.startswith("Unterminated string")
+            or error.pos >= len(self._buffer) - TRUNCATED_TAIL
+        )
+
+    def peek(self) -> str:
+        """Retourne le prochain caractère significatif sans le consommer ("" en fin de flux)."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str, message: str) -> None:
+        if self.peek() != char:
+            raise self.error(message)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Décode la prochaine valeur JSON complète."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Seule une valeur inachevée justifie de lire la suite: une erreur
+                # en plein tampon est définitive, le reste du fichier n'est pas lu
+                if self._truncated(e) and self._fill(size):
+                    size *= 2  # croissance géométrique pour les grandes valeurs
+                    continue
+                raise self.error(e.msg, e.pos) from None
+            # Un nombre en fin de tampon peut se poursuivre dans le bloc suivant
+            if NUMBER_TAIL.match(self._buffer, end) and self._fill(size):
+                continue
+            self._pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        """Décode un tableau JSON élément par élément."""
+        self.expect("[", "Expecting '['")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self._pos += 1
+                return
+            self.expect(",", "Expecting ',' delimiter")
+
+    def members(self) -> Iterator[str]:
+        """Parcourt les clés d'un objet JSON; l'appelant consomme chaque valeur."""
+        self.expect("{", "Expecting '{'")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self.error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(":", "Expecting ':' delimiter")
+            yield key
+            if self.peek() == "}":
+                self._pos += 1
+                return
+            self.expect(",", "Expecting ',' delimiter")
+
+    def expect_end(self) -> None:
+        if self.peek():
+            raise self.error("Extra data")
+
+
+class AnalysisReader:
+    """
+    Lecteur incrémental d'un fichier d'analyse.
+
+    Expose la même interface que `Analysis` (`metadata`, `arguments`,
+    `synthesis`), mais chaque accès à `arguments` relit le fichier et produit
+    les arguments au fil de l'eau. Une lecture complète des arguments mémorise
+    au passage les métadonnées et la synthèse: les consommateurs qui n'en ont
+    besoin qu'après les arguments (formateurs XLSX en streaming, évaluateur)
+    ne lisent le fichier qu'une fois. Sinon, une passe préalable saute les
+    arguments sans les conserver.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(self.path)
+        self._chunk_size = chunk_size
+        self._header: tuple[Metadata, Synthesis] | None = None
+
+    def _read(self, parse_arguments: bool) -> Iterator[Argument]:
+        metadata, synthesis = None, None
+        with open(self.path, encoding="utf-8") as f:
+            scanner = _Scanner(f, self._chunk_size)
+            for key in scanner.members():
+                if key == "arguments":
+                    for index, value in enumerate(scanner.array(), 1):
+                        if parse_arguments:
+                            yield Argument.parse(value, index)
+                elif key == "metadata":
+                    metadata = scanner.value()
+                elif key == "synthesis":
+                    synthesis = scanner.value()
+                else:
+                    scanner.value()
+            scanner.expect_end()
+        self._header = Metadata.parse(metadata), Synthesis.parse(synthesis)
+
+    @property
+    def arguments(self) -> Iterator[Argument]:
+        """Arguments produits un à un (nouvelle lecture du fichier à chaque accès)."""
+        return self._read(parse_arguments=True)
+
+    def _read_header(self) -> tuple[Metadata, Synthesis]:
+        if self._header is None:
+            for _ in self._read(parse_arguments=False):
+                pass
+        return self._header
+
+    def validate(self) -> None:
+        """
+        Lit le document en entier sans conserver les arguments.
+
+        Lève l'erreur de lecture éventuelle (`ValueError`) et mémorise les
+        métadonnées et la synthèse pour les accès suivants.
+        """
+        self._read_header()
+
+    @property
+    def metadata(self) -> Metadata:
+        return self._read_header()[0]
+
+    @property
+    def synthesis(self) -> Synthesis:
+        return self._read_header()[1]
+
+    def load(self) -> Analysis:
+        """Charge tout le document en mémoire (formateurs non incrémentaux)."""
+        with open(self.path, encoding="utf-8") as f:
+            return parse_analysis(json.load(f))
+
+
+def as_streamable(data: dict | Analysis | AnalysisReader) -> Analysis | AnalysisReader:
+    """Retourne le lecteur incrémental tel quel, ou le modèle typé sinon."""
+    return data if isinstance(data, AnalysisReader) else as_analysis(data)
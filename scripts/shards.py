@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Fusion des fragments d'un benchmark évalués séparément.
+
+Un lot `evaluate.py --batch` se découpe en N fragments déterministes
+(`--shard K/N`): chacun s'évalue dans son propre processus ou sur sa propre
+machine et écrit l'état agrégeable de ses métriques de corpus (`--state`):
+comptes par article et par type de sophisme, matrice de confusion de la
+fiabilité (voir `scripts.corpus_metrics.CorpusState`). L'état ne dépend que
+des articles du fragment, pas de la machine ni du nombre de processus.
+
+La fusion vérifie que les états forment un découpage complet (même N, mêmes
+options, chaque fragment une fois, aucun article en double), puis calcule
+les métriques du corpus entier: ce sont exactement celles d'un seul
+`evaluate.py --batch` sur tout le lot.
+
+Usage:
+    python scripts/evaluate.py --batch gold/ model/ --shard 1/4 --state results/shard-1.json
+    ...
+    python -m scripts.shards results/shard-*.json -o results/corpus.json
+
+Nécessite NumPy (extra `benchmark`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from scripts.corpus_metrics import CorpusState
+from scripts.evaluate import (
+    Shard,
+    print_average_mae,
+    print_bootstrap_report,
+    print_corpus_report,
+)
+
+STATE_FORMAT = 1
+
+
+def write_state(path: Path, state: CorpusState, shard: Shard, options: dict) -> None:
+    """Écrit l'état d'un fragment (JSON)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "format": STATE_FORMAT,
+        "shard": [shard.index, shard.count],
+        "options": options,
+        "corpus": state.to_dict(),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False)
+
+
+def read_state(path: Path) -> tuple[Shard, dict, CorpusState]:
+    """
+    Lit l'état d'un fragment.
+
+    Returns:
+        Tuple (fragment, options d'évaluation, état du corpus)
+
+    Raises:
+        ValueError: si le fichier n'est pas un état de fragment lisible.
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("format") != STATE_FORMAT:
+        raise ValueError(f"{path.name}: format d'état inconnu ({document.get('format')})")
+    return Shard(*document["shard"]), document["options"], CorpusState.from_dict(document["corpus"])
+
+
+def merge_states(paths: list[Path]) -> CorpusState:
+    """
+    Réunit les états des fragments d'un même lot.
+
+    Raises:
+        ValueError: découpages ou options différents, fragment manquant ou en
+            double, article présent dans plusieurs fragments.
+    """
+    states = [(path, *read_state(path)) for path in paths]
+    counts = {shard.count for _, shard, _, _ in states}
+    if len(counts) != 1:
+        raise ValueError(f"Fragments de découpages différents: {sorted(counts)}")
+    options = {json.dumps(option, sort_keys=True) for _, _, option, _ in states}
+    if len(options) != 1:
+        raise ValueError("Fragments évalués avec des options différentes")
+
+    (count,) = counts
+    seen: dict[int, Path] = {}
+    for path, shard, _, _ in states:
+        if shard.index in seen:
+            raise ValueError(f"Fragment {shard} en double: {seen[shard.index].name}, {path.name}")
+        seen[shard.index] = path
+    missing = sorted(set(range(1, count + 1)) - seen.keys())
+    if missing:
+        raise ValueError(
+            "Fragment(s) manquant(s): " + ", ".join(str(Shard(index, count)) for index in missing)
+        )
+    return CorpusState.merge([state for *_, state in states])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusion des états de fragments du benchmark")
+    parser.add_argument("states", nargs="+", type=Path, help="États des fragments (--state)")
+    parser.add_argument(
+        "--output", "-o", type=Path, help="Métriques du corpus fusionné (JSON)"
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Intervalles de confiance par N rééchantillonnages des articles",
+    )
+    parser.add_argument("--quiet", "-q", action="store_true", help="Mode silencieux")
+    args = parser.parse_args()
+
+    try:
+        state = merge_states(args.states)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+
+    metrics = state.compute()
+    print(f"🧩 {len(args.states)} fragment(s) fusionné(s)")
+    if state.articles:
+        # Moyennes des articles, comme le rapport de `evaluate.py --batch`
+        print("\n📊 MOYENNES GLOBALES:")
+        print(f"   Fallacy F1: {sum(metrics.fallacy_article_f1) / len(state.articles):.2%}")
+        print_average_mae([error / count for *_, error, count in state.article_counts if count])
+    print_corpus_report(metrics, verbose=not args.quiet)
+    if args.bootstrap:
+        intervals = state.bootstrap(args.bootstrap)
+        print_bootstrap_report(intervals, metrics, args.bootstrap, "article")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        result = {**metrics.to_dict(), "fallacy_per_type": metrics.fallacy_per_type}
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"✅ Métriques du corpus exportées dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
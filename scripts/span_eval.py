@@ -0,0 +1,242 @@
+"""
+Évaluation par segment (techniques de propagande, sophismes localisés).
+
+Reprend la mesure de la tâche SemEval-2020 Task 11 (identification des
+segments): pour des segments prédits S et de référence T d'une même
+technique,
+
+    P = 1/|S| · Σ_{s∈S, t∈T} |s ∩ t| / |s|
+    R = 1/|T| · Σ_{s∈S, t∈T} |s ∩ t| / |t|
+
+si bien qu'un segment partiellement trouvé compte au prorata du
+recouvrement. Les scores sont donnés par technique, en micro (sommes sur
+toutes les techniques) et en macro (moyenne des techniques).
+
+Dans chaque document, les segments d'une même technique qui se chevauchent
+sont d'abord fusionnés: un fragment n'est compté qu'une fois. Triés, ils sont
+alors disjoints: un balayage à deux curseurs visite chaque couple qui se recouvre
+sans comparer toutes les paires, soit O(n log n) par document (tri compris).
+
+Les segments viennent:
+- d'une analyse JSON: sophismes munis de `start`/`end` (positions dans
+  `original_text`), un document par argument;
+- d'un fichier d'étiquettes PTC (`article_id<TAB>technique<TAB>début<TAB>fin`).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from scripts import fallacy_index
+from scripts.model import Analysis
+from scripts.reader import AnalysisReader, as_streamable
+
+Span = tuple[int, int]
+# document -> technique -> segments
+SpanIndex = dict[Hashable, dict[str, list[Span]]]
+
+
+def merge_spans(spans: Iterable[Span]) -> list[Span]:
+    """Trie les segments et fusionne ceux qui se chevauchent (segments vides ignorés)."""
+    merged: list[Span] = []
+    for start, end in sorted(span for span in spans if span[1] > span[0]):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlap_sums(gold: list[Span], predicted: list[Span]) -> tuple[float, float]:
+    """
+    Sommes de recouvrement de deux listes triées de segments disjoints.
+
+    Returns:
+        Tuple (Σ |s ∩ t| / |s|, Σ |s ∩ t| / |t|), s prédit et t de référence
+    """
+    precision = recall = 0.0
+    i = j = 0
+    while i < len(predicted) and j < len(gold):
+        (ps, pe), (gs, ge) = predicted[i], gold[j]
+        overlap = min(pe, ge) - max(ps, gs)
+        if overlap > 0:
+            precision += overlap / (pe - ps)
+            recall += overlap / (ge - gs)
+        # Le segment qui finit le premier ne peut plus recouvrir les suivants
+        if pe <= ge:
+            i += 1
+        else:
+            j += 1
+    return precision, recall
+
+
+def _f1(precision: float, recall: float) -> float:
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+@dataclass
+class SpanMetrics:
+    """Précision, rappel et F1 par recouvrement de segments."""
+
+    documents: int = 0
+    precision: float = 0.0
+    recall: float = 0.0
+    f1: float = 0.0
+    macro_precision: float = 0.0
+    macro_recall: float = 0.0
+    macro_f1: float = 0.0
+    # technique -> {"precision", "recall", "f1", "gold", "predicted"}
+    per_technique: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "documents": self.documents,
+            "span_precision": round(self.precision, 3),
+            "span_recall": round(self.recall, 3),
+            "span_f1": round(self.f1, 3),
+            "span_macro_precision": round(self.macro_precision, 3),
+            "span_macro_recall": round(self.macro_recall, 3),
+            "span_macro_f1": round(self.macro_f1, 3),
+            "per_technique": {
+                technique: {name: round(value, 3) for name, value in scores.items()}
+                for technique, scores in sorted(self.per_technique.items())
+            },
+        }
+
+
+def evaluate_spans(gold: SpanIndex, predicted: SpanIndex) -> SpanMetrics:
+    """
+    Compare les segments prédits aux segments de référence, document par document.
+
+    Args:
+        gold: Segments de référence (voir `spans_from_analysis`, `read_ptc_labels`)
+        predicted: Segments prédits, mêmes clés de document
+
+    Returns:
+        SpanMetrics (techniques triées par nom)
+    """
+    # technique -> [Σ précision, Σ rappel, |T|, |S|]
+    sums: dict[str, list[float]] = defaultdict(lambda: [0.0, 0.0, 0, 0])
+    for document in gold.keys() | predicted.keys():
+        gold_spans, pred_spans = gold.get(document, {}), predicted.get(document, {})
+        for technique in gold_spans.keys() | pred_spans.keys():
+            reference = merge_spans(gold_spans.get(technique, ()))
+            candidate = merge_spans(pred_spans.get(technique, ()))
+            precision, recall = overlap_sums(reference, candidate)
+            total = sums[technique]
+            total[0] += precision
+            total[1] += recall
+            total[2] += len(reference)
+            total[3] += len(candidate)
+
+    metrics = SpanMetrics(documents=len(gold.keys() | predicted.keys()))
+    for technique, (precision, recall, gold_count, pred_count) in sorted(sums.items()):
+        p = precision / pred_count if pred_count else 0.0
+        r = recall / gold_count if gold_count else 0.0
+        metrics.per_technique[technique] = {
+            "precision": p, "recall": r, "f1": _f1(p, r),
+            "gold": gold_count, "predicted": pred_count,
+        }
+    pred_total = sum(total[3] for total in sums.values())
+    gold_total = sum(total[2] for total in sums.values())
+    metrics.precision = sum(total[0] for total in sums.values()) / pred_total if pred_total else 0.0
+    metrics.recall = sum(total[1] for total in sums.values()) / gold_total if gold_total else 0.0
+    metrics.f1 = _f1(metrics.precision, metrics.recall)
+    if metrics.per_technique:
+        scores = metrics.per_technique.values()
+        metrics.macro_precision = sum(s["precision"] for s in scores) / len(scores)
+        metrics.macro_recall = sum(s["recall"] for s in scores) / len(scores)
+        metrics.macro_f1 = sum(s["f1"] for s in scores) / len(scores)
+    return metrics
+
+
+def spans_from_analysis(
+    analysis: dict | Analysis | AnalysisReader, document: Hashable = None
+) -> SpanIndex:
+    """
+    Segments des sophismes localisés (`start`/`end`) d'une analyse.
+
+    Args:
+        analysis: Analyse (format JSON du skill, modèle ou lecteur incrémental)
+        document: Préfixe des clés de document (nom du fichier en mode répertoire)
+
+    Returns:
+        Index (document, id d'argument) -> technique -> segments
+    """
+    index: SpanIndex = {}
+    for arg in as_streamable(analysis).arguments:
+        for fallacy in arg.fallacies:
+            if fallacy.start is None or fallacy.end is None:
+                continue
+            spans = index.setdefault((document, arg.id), {})
+            spans.setdefault(fallacy.key, []).append((int(fallacy.start), int(fallacy.end)))
+    return index
+
+
+def read_ptc_labels(path: Path) -> SpanIndex:
+    """
+    Segments d'un fichier d'étiquettes PTC (une technique par ligne).
+
+    Les lignes ont la forme `article_id<TAB>technique<TAB>début<TAB>fin`;
+    les noms de techniques passent par l'index des sophismes, comme ceux des
+    analyses.
+    """
+    index: SpanIndex = {}
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 4 or not fields[0].strip():
+                continue
+            try:
+                start, end = int(fields[2]), int(fields[3])
+            except ValueError:
+                raise ValueError(f"{path.name}:{line_number}: positions invalides") from None
+            technique = fallacy_index.normalize(fields[1])
+            index.setdefault(fields[0], {}).setdefault(technique, []).append((start, end))
+    return index
+
+
+def load_spans(path: Path) -> SpanIndex:
+    """
+    Segments d'un fichier ou d'un répertoire.
+
+    Un fichier `.json` est une analyse; un autre fichier, des étiquettes PTC.
+    Un répertoire réunit ses analyses `*.json` (clés préfixées par le nom du
+    fichier, pour apparier gold et prédiction par nom) et ses fichiers
+    d'étiquettes `*.labels`.
+    """
+    if not path.is_dir():
+        if path.suffix == ".json":
+            return spans_from_analysis(AnalysisReader(path))
+        return read_ptc_labels(path)
+    index: SpanIndex = {}
+    for file in sorted(path.glob("*.json")):
+        index.update(spans_from_analysis(AnalysisReader(file), file.stem))
+    for file in sorted(path.glob("*.labels")):
+        for document, spans in read_ptc_labels(file).items():
+            for technique, values in spans.items():
+                index.setdefault(document, {}).setdefault(technique, []).extend(values)
+    return index
+
+
+def print_span_report(metrics: SpanMetrics, verbose: bool = True) -> None:
+    """Affiche les scores par segment (micro, macro et par technique)."""
+    print(f"\n🔎 ÉVALUATION PAR SEGMENT ({metrics.documents} document(s)):")
+    print(
+        f"   Micro: P={metrics.precision:.2%} R={metrics.recall:.2%} F1={metrics.f1:.2%}"
+    )
+    print(
+        f"   Macro: P={metrics.macro_precision:.2%} R={metrics.macro_recall:.2%} "
+        f"F1={metrics.macro_f1:.2%}"
+    )
+    if verbose and metrics.per_technique:
+        print("\n   Détail par technique (segments gold / prédits):")
+        for technique, scores in metrics.per_technique.items():
+            print(
+                f"   - {technique} ({scores['gold']}/{scores['predicted']}): "
+                f"P={scores['precision']:.2f} R={scores['recall']:.2f} F1={scores['f1']:.2f}"
+            )
@@ -0,0 +1,159 @@
+"""
+Recouvrement lexical entre composants Toulmin gold et prédits.
+
+- Tokenisation adaptée au français: minuscules, accents retirés, élisions
+  séparées (l', d', qu', jusqu'...) et articles ignorés. Un seul
+  `str.translate` suivi d'un `split` (sans expression régulière), mise en
+  cache par texte: les textes gold reviennent à chaque évaluation.
+- ROUGE-L (F-mesure de la plus longue sous-séquence commune), calculé par
+  l'algorithme bit-parallèle de Hyyrö sur les entiers Python: O(n·m/64)
+  au lieu de la table O(n·m) de la programmation dynamique.
+- F1 sur les tokens (multiensembles), comme pour SQuAD.
+
+Les valeurs par défaut du modèle (« Non explicité », « Non reconnu ») ne
+sont pas un contenu annoté: elles comptent comme un composant vide. Un
+composant non annoté dans le gold (None, jeux de données importés) n'est
+pas évalué.
+"""
+
+import string
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+from scripts.model import NOT_ACKNOWLEDGED, NOT_EXPLICIT
+
+TOULMIN_COMPONENTS = ("claim", "grounds", "warrant", "backing", "qualifier", "rebuttal")
+
+# Articles et partitifs, sans poids pour le recouvrement, et formes élidées
+# isolées par la ponctuation (l'argument -> l argument, qu'il -> qu il)
+STOPWORDS = frozenset({
+    "le", "la", "les", "un", "une", "des", "du", "de", "au", "aux",
+    "c", "d", "j", "l", "m", "n", "s", "t", "qu", "jusqu", "lorsqu", "puisqu", "quoiqu",
+})
+PUNCTUATION = string.punctuation + "’‘“”«»…–—•·"
+
+TOKEN_CACHE_SIZE = 1 << 16
+
+
+def _token_table() -> dict[int, str]:
+    """Table de `str.translate`: accents des lettres latines retirés, ponctuation en espaces."""
+    table = {ord(c): " " for c in PUNCTUATION}
+    for code in range(0xC0, 0x250):
+        base = "".join(
+            c for c in unicodedata.normalize("NFKD", chr(code)) if not unicodedata.combining(c)
+        )
+        if base != chr(code):
+            table[code] = base
+    return table
+
+
+TOKEN_TABLE = _token_table()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenize(text: str) -> tuple[str, ...]:
+    """Tokens d'un texte français (mis en cache)."""
+    return tuple(
+        word for word in text.lower().translate(TOKEN_TABLE).split() if word not in STOPWORDS
+    )
+
+
+# Tokens des valeurs par défaut des composants (voir `scripts.model`)
+PLACEHOLDER_TOKENS = frozenset(tokenize(text) for text in (NOT_EXPLICIT, NOT_ACKNOWLEDGED))
+
+
+def component_tokens(text: str) -> tuple[str, ...]:
+    """Tokens d'un composant Toulmin; aucun pour une valeur par défaut du modèle."""
+    tokens = tokenize(text)
+    return () if tokens in PLACEHOLDER_TOKENS else tokens
+
+
+def lcs_length(a: tuple[str, ...], b: tuple[str, ...]) -> int:
+    """Longueur de la plus longue sous-séquence commune (bit-parallèle)."""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks: dict[str, int] = {}
+    for i, token in enumerate(a):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    row = full
+    for token in b:
+        matches = row & masks.get(token, 0)
+        row = ((row + matches) | (row - matches)) & full
+    # Chaque bit à zéro correspond à un élément de la sous-séquence commune
+    return len(a) - row.bit_count()
+
+
+def _f_measure(overlap: int, predicted: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / predicted, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def common_tokens(a: tuple[str, ...], b: tuple[str, ...]) -> int:
+    """Nombre de tokens communs, avec multiplicité."""
+    unique_a, unique_b = set(a), set(b)
+    if len(unique_a) == len(a) and len(unique_b) == len(b):
+        # Cas le plus fréquent, sans répétition: simple intersection
+        return len(unique_a & unique_b)
+    counts = Counter(a)
+    common = 0
+    for token in b:
+        if counts[token] > 0:
+            counts[token] -= 1
+            common += 1
+    return common
+
+
+def rouge_l(reference: str, predicted: str) -> float:
+    """F-mesure ROUGE-L entre deux textes."""
+    ref, pred = tokenize(reference), tokenize(predicted)
+    return _f_measure(lcs_length(ref, pred), len(pred), len(ref))
+
+
+def token_f1(reference: str, predicted: str) -> float:
+    """F1 sur les tokens communs (avec multiplicité)."""
+    ref, pred = tokenize(reference), tokenize(predicted)
+    return _f_measure(common_tokens(ref, pred), len(pred), len(ref))
+
+
+def toulmin_overlap(
+    gold: dict[int, tuple[str | None, ...]], predicted: dict[int, tuple[str | None, ...]]
+) -> dict[str, dict[str, float]]:
+    """
+    Recouvrement moyen de chaque composant Toulmin sur les arguments alignés.
+
+    Args:
+        gold: Composants (dans l'ordre de TOULMIN_COMPONENTS) par argument gold
+        predicted: Composants par argument prédit, mêmes identifiants
+
+    Returns:
+        Par composant: {"rouge_l", "token_f1", "count"}; un composant vide
+        (ou laissé à sa valeur par défaut) des deux côtés ou non annoté
+        (None) est ignoré, vide d'un seul côté il compte pour 0.
+    """
+    totals = {name: [0.0, 0.0, 0] for name in TOULMIN_COMPONENTS}
+    for arg_id in gold.keys() & predicted.keys():
+        for name, reference, candidate in zip(TOULMIN_COMPONENTS, gold[arg_id], predicted[arg_id]):
+            if reference is None or candidate is None:
+                continue
+            ref, pred = component_tokens(reference), component_tokens(candidate)
+            if not ref and not pred:
+                continue
+            total = totals[name]
+            if ref == pred:
+                total[0] += 1.0
+                total[1] += 1.0
+            else:
+                total[0] += _f_measure(lcs_length(ref, pred), len(pred), len(ref))
+                total[1] += _f_measure(common_tokens(ref, pred), len(pred), len(ref))
+            total[2] += 1
+    return {
+        name: {"rouge_l": rouge / count, "token_f1": f1 / count, "count": count}
+        for name, (rouge, f1, count) in totals.items()
+        if count
+    }
@@ -0,0 +1,90 @@
+"""Tests pour l'accord ordinal des scores de fiabilité."""
+
+import itertools
+import random
+
+import pytest
+
+from scripts.agreement import (
+    kendall_tau,
+    quadratic_kappa,
+    reliability_confusion,
+    reliability_level,
+    spearman,
+)
+from scripts.evaluate import evaluate_analysis
+
+
+def average_ranks(values):
+    ordered = sorted(values)
+    return [ordered.index(v) + (ordered.count(v) + 1) / 2 for v in values]
+
+
+def pearson(x, y):
+    mx, my = sum(x) / len(x), sum(y) / len(y)
+    cov = sum((a - mx) * (b - my) for a, b in zip(x, y))
+    vx = sum((a - mx) ** 2 for a in x)
+    vy = sum((b - my) ** 2 for b in y)
+    return cov / (vx * vy) ** 0.5
+
+
+def kendall_pairs(x, y):
+    """Tau-b par énumération des paires."""
+    concordant = discordant = ties_x = ties_y = 0
+    for (a, b), (c, d) in itertools.combinations(zip(x, y), 2):
+        sign = (a - c) * (b - d)
+        concordant += sign > 0
+        discordant += sign < 0
+        ties_x += a == c
+        ties_y += b == d
+    total = len(x) * (len(x) - 1) / 2
+    return (concordant - discordant) / ((total - ties_x) * (total - ties_y)) ** 0.5
+
+
+def confusion_of(gold, pred):
+    return reliability_confusion(dict(enumerate(gold)), dict(enumerate(pred)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_statistics_match_pairwise_definitions(seed):
+    rnd = random.Random(seed)
+    gold = [rnd.randint(1, 5) for _ in range(60)]
+    pred = [min(5, max(1, g + rnd.choice([-2, -1, 0, 0, 1]))) for g in gold]
+    confusion = confusion_of(gold, pred)
+    assert spearman(confusion) == pytest.approx(pearson(average_ranks(gold), average_ranks(pred)))
+    assert kendall_tau(confusion) == pytest.approx(kendall_pairs(gold, pred))
+
+
+def test_quadratic_kappa_known_values():
+    assert quadratic_kappa(confusion_of([1, 2, 3, 4, 5], [1, 2, 3, 4, 5])) == 1.0
+    # Prédiction inversée: désaccord maximal
+    assert quadratic_kappa(confusion_of([1, 5], [5, 1])) == pytest.approx(-1.0)
+    # Définition directe: 1 - Σ(g - p)² / moyenne de (g - p')² sur tous les couples croisés
+    gold, pred = [1, 2, 3, 4, 4], [1, 3, 3, 4, 5]
+    observed = sum((g - p) ** 2 for g, p in zip(gold, pred))
+    expected = sum((g - p) ** 2 for g in gold for p in pred) / len(gold)
+    assert quadratic_kappa(confusion_of(gold, pred)) == pytest.approx(1 - observed / expected)
+
+
+def test_degenerate_inputs():
+    empty = confusion_of([], [])
+    assert (spearman(empty), kendall_tau(empty), quadratic_kappa(empty)) == (0.0, 0.0, 0.0)
+    constant = confusion_of([3, 3, 3], [2, 3, 4])
+    assert spearman(constant) == 0.0
+    assert kendall_tau(constant) == 0.0
+
+
+def test_scores_outside_scale_are_clamped():
+    assert [reliability_level(s) for s in (0, 1, 3.4, 5, 9)] == [0, 0, 2, 4, 4]
+
+
+def test_evaluate_analysis_reports_agreement():
+    gold = {"arguments": [{"id": i, "reliability": r} for i, r in enumerate([1, 2, 3, 4, 5], 1)]}
+    pred = {"arguments": [{"id": i, "reliability": r} for i, r in enumerate([2, 2, 3, 5, 5], 1)]}
+    metrics = evaluate_analysis(gold, pred)
+    assert metrics.reliability_confusion[0] == [0, 1, 0, 0, 0]
+    assert 0 < metrics.reliability_qwk < 1
+    assert metrics.reliability_correlation == pytest.approx(
+        pearson(average_ranks([1, 2, 3, 4, 5]), average_ranks([2, 2, 3, 5, 5]))
+    )
+    assert metrics.to_dict()["reliability_kendall"] == round(metrics.reliability_kendall, 3)
@@ -0,0 +1,163 @@
+"""Tests pour l'alignement des arguments par similarité."""
+
+import itertools
+import random
+
+import pytest
+
+from scripts import alignment
+from scripts.alignment import align_arguments, hungarian, jaccard, lsh_candidates, tokenize
+from scripts.evaluate import evaluate_analysis
+
+WORDS = [f"mot{i}" for i in range(2000)]
+
+
+def brute_force(cost):
+    """Affectation optimale par énumération (petites matrices)."""
+    n, m = len(cost), len(cost[0])
+    return min(
+        itertools.permutations(range(m), n),
+        key=lambda cols: sum(cost[i][j] for i, j in enumerate(cols)),
+    )
+
+
+def test_hungarian_matches_brute_force():
+    rnd = random.Random(3)
+    for n, m in [(1, 1), (2, 3), (3, 3), (4, 6), (5, 5)]:
+        cost = [[rnd.random() for _ in range(m)] for _ in range(n)]
+        assignment = hungarian(cost)
+        assert len(set(assignment)) == n
+        best = brute_force(cost)
+        assert sum(cost[i][j] for i, j in enumerate(assignment)) == pytest.approx(
+            sum(cost[i][j] for i, j in enumerate(best))
+        )
+
+
+def test_tokenize_and_jaccard():
+    assert tokenize("Le climat, LE CLIMAT et l'IA") == {"climat"}
+    assert jaccard(tokenize("la crise climatique"), tokenize("crise énergétique")) == 1 / 3
+    assert jaccard(frozenset(), frozenset()) == 0.0
+
+
+def test_alignment_follows_text_not_ids():
+    gold = {
+        1: "L'IA générative consomme énormément d'électricité",
+        2: "Les entreprises privatisent la recherche publique",
+        3: "Les chercheurs doivent refuser ces outils",
+    }
+    # Le modèle a fusionné puis redécoupé: ids décalés et un argument en trop
+    predicted = {
+        "a": "Introduction sans rapport avec le reste",
+        "b": "Consomme énormément d'électricité: l'IA générative",
+        "c": "Refuser ces outils est le devoir des chercheurs",
+        "d": "La recherche publique est privatisée par les entreprises",
+    }
+    assert align_arguments(gold, predicted) == {"b": 1, "c": 3, "d": 2}
+
+
+def test_alignment_is_one_to_one_and_respects_threshold():
+    gold = {1: "alpha beta gamma delta", 2: "epsilon zeta eta theta"}
+    predicted = {1: "alpha beta gamma delta", 2: "alpha beta gamma omega", 3: "iota kappa"}
+    mapping = align_arguments(gold, predicted, threshold=0.5)
+    assert mapping == {1: 1}
+
+
+def test_lsh_finds_similar_pairs_on_long_articles():
+    rnd = random.Random(7)
+    gold = {i: frozenset(rnd.sample(WORDS, 30)) for i in range(300)}
+    # Chaque prédiction garde 25 des 30 mots de son argument gold (Jaccard ~0,7)
+    predicted = {
+        i + 1000: frozenset(rnd.sample(sorted(tokens), 25)) | {f"bruit{i}"}
+        for i, tokens in gold.items()
+    }
+    candidates = lsh_candidates(gold, predicted)
+    assert all((i, i + 1000) in candidates for i in gold)
+    # Bien moins que les 90 000 couples possibles
+    assert len(candidates) < len(gold) * len(predicted) // 20
+
+
+def test_alignment_uses_lsh_above_exact_limit(monkeypatch):
+    monkeypatch.setattr(alignment, "EXACT_PAIRS", 0)
+    rnd = random.Random(11)
+    gold = {i: " ".join(rnd.sample(WORDS, 20)) for i in range(50)}
+    predicted = {f"p{i}": text for i, text in reversed(gold.items())}
+    assert align_arguments(gold, predicted) == {f"p{i}": i for i in gold}
+
+
+def french_corpus(n, seed=5):
+    """Arguments en français: mots grammaticaux fréquents, vocabulaire de Zipf, sujet commun."""
+    rnd = random.Random(seed)
+    function_words = ["le", "la", "les", "des", "de", "du", "un", "une", "et", "est", "que",
+                      "qui", "pour", "dans", "par", "sur", "pas", "plus", "avec", "sont", "cette",
+                      "ces", "mais", "aussi", "l'", "d'", "qu'"]
+    syllables = ["ca", "pi", "ta", "lis", "me", "é", "co", "no", "mie", "pro", "duc", "tion",
+                 "ré", "for", "ma", "cli", "mat", "ner", "gie", "tra", "vail", "sa", "lai", "re"]
+    vocabulary = sorted({"".join(rnd.choices(syllables, k=rnd.randint(2, 4)))
+                         for _ in range(4000)})
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    topic = ["climat", "énergie", "gouvernement", "réforme"]
+
+    def sentence():
+        words = [*rnd.choices(vocabulary, weights, k=14), *rnd.sample(topic, 2)]
+        words += rnd.choices(function_words, k=12)
+        rnd.shuffle(words)
+        return " ".join(words)
+
+    gold = {i: sentence() for i in range(n)}
+    predicted = {}
+    for i, text in gold.items():
+        words = text.split()
+        # Le modèle reformule: 30 % des mots remplacés
+        for k in rnd.sample(range(len(words)), len(words) * 3 // 10):
+            words[k] = rnd.choice(vocabulary)
+        predicted[f"p{(i * 7) % n}-{i}"] = " ".join(words)
+    return gold, predicted
+
+
+def test_alignment_scales_on_french_corpus(monkeypatch):
+    gold, predicted = french_corpus(1500)
+    stats = {"candidates": 0, "largest": 0}
+    find_candidates, solve = alignment.lsh_candidates, alignment.hungarian
+
+    def counting_candidates(*args):
+        candidates = find_candidates(*args)
+        stats["candidates"] = len(candidates)
+        return candidates
+
+    def measuring_hungarian(cost):
+        stats["largest"] = max(stats["largest"], len(cost) + len(cost[0]))
+        return solve(cost)
+
+    monkeypatch.setattr(alignment, "lsh_candidates", counting_candidates)
+    monkeypatch.setattr(alignment, "hungarian", measuring_hungarian)
+    mapping = align_arguments(gold, predicted)
+
+    # Mots grammaticaux et sujet commun ne rendent pas tous les couples candidats
+    assert 0 < stats["candidates"] < len(gold) * len(predicted) // 50
+    assert stats["largest"] <= alignment.MAX_COMPONENT
+    correct = sum(mapping.get(p) == int(p.split("-")[1]) for p in predicted)
+    assert correct >= 0.95 * len(gold)
+
+
+def test_band_rows_follow_threshold():
+    assert alignment.band_rows(alignment.DEFAULT_THRESHOLD) == 2
+    assert alignment.band_rows(0.5) > alignment.band_rows(0.2) >= alignment.band_rows(0.05)
+
+
+def test_evaluate_analysis_with_similarity_alignment():
+    gold = {"arguments": [
+        {"id": 1, "claim": "Les éoliennes tuent les oiseaux", "fallacies": ["généralisation_hâtive"],
+         "reliability": 2},
+        {"id": 2, "claim": "Le nucléaire est une énergie décarbonée", "fallacies": [],
+         "reliability": 5},
+    ]}
+    predicted = {"arguments": [
+        {"id": 1, "claim": "Le nucléaire est décarboné", "fallacies": [], "reliability": 4},
+        {"id": 2, "claim": "Les éoliennes tuent des oiseaux", "fallacies": ["généralisation_hâtive"],
+         "reliability": 2},
+    ]}
+    by_id = evaluate_analysis(gold, predicted)
+    assert by_id.fallacy_f1 == 0.0
+    aligned = evaluate_analysis(gold, predicted, align_threshold=0.2)
+    assert aligned.fallacy_f1 == 1.0
+    assert aligned.reliability_mae == 0.5
@@ -0,0 +1,31 @@
+"""Tests pour le benchmark de démarrage des CLI."""
+
+from scripts.bench_startup import find_regressions, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |       1500 | site
+import time:       800 |        800 |     numpy.core
+import time:      2000 |       4000 |   numpy
+import time:       500 |       6000 | openpyxl
+Traceback sans rapport
+"""
+
+
+def test_parse_importtime_keeps_top_level_imports():
+    assert parse_importtime(IMPORTTIME) == [("openpyxl", 6.0), ("site", 1.5)]
+
+
+def test_find_regressions_requires_relative_and_absolute_increase():
+    baseline = {"generate-md": {"wall_ms": 80.0, "import_ms": 50.0, "rss_mb": 14.0}}
+    results = {"generate-md": {"wall_ms": 300.0, "import_ms": 58.0, "rss_mb": 14.5}}
+    regressions = find_regressions(results, baseline, threshold=0.1)
+    # +16 % sur les imports reste sous l'écart absolu minimal (15 ms)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("generate-md: Démarrage 300 ms (référence 80 ms, +275%)")
+
+
+def test_find_regressions_ignores_scenarios_without_baseline():
+    results = {"evaluate": {"wall_ms": 500.0, "import_ms": 400.0, "rss_mb": 90.0}}
+    assert find_regressions(results, {}, threshold=0.2) == []
@@ -0,0 +1,115 @@
+"""Tests pour le catalogue du corpus."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.catalog import Catalog, UpdateStats
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+
+
+@pytest.fixture
+def benchmark(tmp_path):
+    root = tmp_path / "benchmark"
+    (root / "annotations" / "gold").mkdir(parents=True)
+    (root / "annotations" / "model").mkdir()
+    shutil.copy(GOLD, root / "annotations" / "gold" / "001.json")
+    data = json.loads(GOLD.read_text(encoding="utf-8"))
+    data.pop("_meta")
+    data["metadata"].update(type="journalistique", language="FR", analyst="claude")
+    data["arguments"][0]["fallacies"] = [{"name": "Attaque personnelle"}]
+    (root / "annotations" / "model" / "001.json").write_text(json.dumps(data), encoding="utf-8")
+    articles = root / "articles" / "french" / "militant"
+    articles.mkdir(parents=True)
+    (articles / "001_atecopol.html").write_text(
+        "<html><head><title>Oui, mais l'IAg&nbsp;?</title></head>"
+        "<body><p>Un coût <b>écologique</b> colossal.</p></body></html>",
+        encoding="utf-8",
+    )
+    return root
+
+
+def paths(rows):
+    return [row["path"] for row in rows]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        yield catalog
+
+
+def test_index_facets(benchmark, catalog):
+    assert catalog.update(benchmark) == UpdateStats(added=3)
+    gold, model, article = catalog.query()
+    assert article["path"] == "articles/french/militant/001_atecopol.html"
+    assert (article["kind"], article["type"], article["language"]) == ("article", "militant", "fr")
+    assert article["title"] == "Oui, mais l'IAg\xa0?"
+    assert (gold["corpus"], gold["type"], gold["annotator"], gold["arguments"]) == (
+        "gold", "militant", "human_expert", 8,
+    )
+    assert gold["fallacies"] == ["fausse_equivalence", "generalisation_hative", "petition_de_principe"]
+    assert (model["language"], model["annotator"]) == ("fr", "claude")
+    assert "ad_hominem" in model["fallacies"]
+    assert len(gold["sha256"]) == 64
+
+
+def test_queries(benchmark, catalog):
+    catalog.update(benchmark)
+    assert paths(catalog.query(type="militant", language="french", corpus="gold")) == [
+        "annotations/gold/001.json",
+    ]
+    assert paths(catalog.query(fallacies=["ad hominem"])) == ["annotations/model/001.json"]
+    assert catalog.query(corpus="gold", fallacies=["ad hominem"]) == []
+    assert paths(catalog.query(fallacies=["petition de principe", "généralisation hâtive"])) == [
+        "annotations/gold/001.json", "annotations/model/001.json",
+    ]
+    # Plein texte: accents ignorés, syntaxe FTS5
+    assert paths(catalog.query(kind="article", text="ecologique")) == [
+        "articles/french/militant/001_atecopol.html",
+    ]
+    assert len(catalog.query(text='"infrastructure sociotechnique"', limit=1)) == 1
+
+
+def test_incremental_update(benchmark, catalog):
+    catalog.update(benchmark)
+    gold = benchmark / "annotations" / "gold" / "001.json"
+    model = benchmark / "annotations" / "model" / "001.json"
+    # Fichier touché sans changement: empreinte identique, pas de réindexation
+    os.utime(gold, (1, 1))
+    assert catalog.update(benchmark) == UpdateStats(unchanged=3)
+
+    data = json.loads(model.read_text(encoding="utf-8"))
+    data["arguments"][0]["fallacies"] = []
+    model.write_text(json.dumps(data), encoding="utf-8")
+    (benchmark / "articles" / "french" / "militant" / "001_atecopol.html").unlink()
+    assert catalog.update(benchmark) == UpdateStats(updated=1, unchanged=1, removed=1)
+    assert catalog.query(fallacies=["ad hominem"]) == []
+    assert catalog.query(text="colossal", kind="article") == []
+
+
+def test_cli_catalog(benchmark, tmp_path):
+    db = tmp_path / "cli.sqlite"
+    commands = [
+        ["--db", str(db), "update", str(benchmark)],
+        ["--db", str(db), "query", "--type", "militant", "--language", "FR",
+         "--corpus", "gold", "--json"],
+        ["--db", str(db), "query", "--text", "AND AND"],
+    ]
+    results = [
+        subprocess.run(
+            [sys.executable, "-m", "scripts.catalog", *command], capture_output=True, text=True
+        )
+        for command in commands
+    ]
+    assert results[0].returncode == 0, f"Stdout: {results[0].stdout}, Stderr: {results[0].stderr}"
+    assert "3 ajouté(s)" in results[0].stdout
+    assert [row["path"] for row in json.loads(results[1].stdout)] == ["annotations/gold/001.json"]
+    assert results[2].returncode == 1
+    assert "requête plein texte invalide" in results[2].stdout
@@ -0,0 +1,146 @@
+"""Tests pour la comparaison de plusieurs exécutions."""
+
+import csv
+import itertools
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.compare_runs import (  # noqa: E402
+    compare_runs,
+    export_comparison_csv,
+    holm,
+    paired_permutation,
+    unit_statistics,
+)
+from scripts.corpus_metrics import CorpusAccumulator  # noqa: E402
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+
+
+@pytest.fixture
+def runs(tmp_path):
+    """Un gold de 6 articles et deux exécutions: une médiocre, une quasi parfaite."""
+    gold = json.loads(GOLD.read_text(encoding="utf-8"))
+    gold_dir = tmp_path / "gold"
+    run_dirs = [tmp_path / "claude_v1", tmp_path / "claude_v2"]
+    for directory in (gold_dir, *run_dirs):
+        directory.mkdir()
+    for i in range(6):
+        (gold_dir / f"{i:03}.json").write_text(json.dumps(gold), encoding="utf-8")
+        weak = {**gold, "arguments": [
+            {**arg, "fallacies": [], "reliability": 1} for arg in gold["arguments"]
+        ]}
+        (run_dirs[0] / f"{i:03}.json").write_text(json.dumps(weak), encoding="utf-8")
+        (run_dirs[1] / f"{i:03}.json").write_text(json.dumps(gold), encoding="utf-8")
+    (gold_dir / "sans_prediction.json").write_text(json.dumps(gold), encoding="utf-8")
+    return gold_dir, run_dirs
+
+
+def test_holm():
+    assert holm(np.array([0.01, 0.04, 0.03])).tolist() == pytest.approx([0.03, 0.06, 0.06])
+    assert holm(np.array([0.5, 0.9])).tolist() == [1.0, 1.0]
+
+
+def test_units_match_corpus_metrics():
+    corpus = CorpusAccumulator()
+    corpus.add("a", {1: ["x"], 2: ["y"]}, {1: ["x", "y"], 2: []}, {1: 3, 2: 4}, {1: 1, 2: 4})
+    corpus.add("b", {1: ["y"]}, {1: ["y"]}, {1: 5}, {1: 4})
+    metrics = corpus.compute()
+    units = corpus.article_units(["y", "absent", "x"])
+    assert units.shape == (2, 11)
+    precision, recall, f1, mae, f1_y, f1_absent, f1_x = unit_statistics(units.sum(axis=0))
+    assert (precision, recall, f1) == pytest.approx(
+        (metrics.fallacy_micro_precision, metrics.fallacy_micro_recall, metrics.fallacy_micro_f1)
+    )
+    assert mae == pytest.approx(metrics.reliability_mae_micro)
+    assert (f1_y, f1_absent, f1_x) == pytest.approx(
+        (metrics.fallacy_per_type["y"]["f1"], 0.0, metrics.fallacy_per_type["x"]["f1"])
+    )
+
+
+def test_permutation_test_approaches_exact_enumeration():
+    rng = np.random.default_rng(3)
+    units_a = rng.integers(0, 4, size=(5, 5)).astype(float)
+    units_b = rng.integers(0, 4, size=(5, 5)).astype(float)
+    observed, p_values = paired_permutation(units_a, units_b, permutations=20000, seed=1)
+    # Enumération exacte des 2^5 échanges
+    extreme = np.zeros_like(observed)
+    for swaps in itertools.product([0, 1], repeat=5):
+        mask = np.array(swaps, dtype=bool)[:, None]
+        a, b = np.where(mask, units_b, units_a), np.where(mask, units_a, units_b)
+        delta = unit_statistics(b.sum(axis=0)) - unit_statistics(a.sum(axis=0))
+        extreme += np.abs(delta) >= np.abs(observed) - 1e-12
+    assert p_values == pytest.approx(extreme / 32, abs=0.02)
+
+
+def test_identical_runs_are_not_significant():
+    units = np.arange(20, dtype=float).reshape(4, 5)
+    observed, p_values = paired_permutation(units, units, permutations=100)
+    assert not observed.any()
+    assert (p_values == 1.0).all()
+
+
+def test_compare_runs(runs, capsys):
+    gold_dir, run_dirs = runs
+    comparison = compare_runs(gold_dir, run_dirs, permutations=2000)
+    assert comparison.runs == ["claude_v1", "claude_v2"]
+    assert comparison.articles == ["000", "001", "002", "003", "004", "005"]
+    assert "sans_prediction ignoré" in capsys.readouterr().out
+    assert comparison.metrics["claude_v2"].fallacy_micro_f1 == 1.0
+    assert comparison.metrics["claude_v1"].fallacy_micro_recall == 0.0
+    tests = comparison.significance["claude_v2"]
+    assert tests["fallacy_recall"]["delta"] == 1.0
+    # 6 articles: la plus petite p-valeur atteignable est 2 / 2^6
+    assert tests["fallacy_recall"]["p_value"] < 0.05
+    for by_run in comparison.per_type.values():
+        assert by_run["claude_v2"]["delta"] == 1.0
+        assert by_run["claude_v2"]["p_holm"] >= by_run["claude_v2"]["p_value"]
+
+    parallel = compare_runs(gold_dir, run_dirs, jobs=2, permutations=2000)
+    assert parallel.significance == comparison.significance
+    assert parallel.per_type == comparison.per_type
+
+
+def test_export_comparison(runs, tmp_path):
+    gold_dir, run_dirs = runs
+    comparison = compare_runs(gold_dir, run_dirs, permutations=0)
+    per_type = export_comparison_csv(comparison, tmp_path / "scores" / "comparison_matrix.csv")
+    with open(tmp_path / "scores" / "comparison_matrix.csv", encoding="utf-8") as f:
+        baseline, run = csv.DictReader(f)
+    assert baseline["fallacy_f1_delta"] == ""
+    assert run["fallacy_f1_delta"] == "1.0000"
+    assert run["fallacy_f1_p_value"] == ""
+    assert per_type.name == "comparison_matrix_per_type.csv"
+
+
+def test_cli_compare(runs, tmp_path):
+    gold_dir, run_dirs = runs
+    output = tmp_path / "comparison_matrix.csv"
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "scripts.evaluate", "--compare", str(gold_dir),
+            *map(str, run_dirs), "--permutations", "500", "--quiet", "-o", str(output),
+        ],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert "claude_v2 vs claude_v1" in result.stdout
+    assert len(output.read_text().splitlines()) == 3
+
+
+def test_cli_several_predictions_require_compare(runs):
+    gold_dir, run_dirs = runs
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.evaluate", "--batch", str(gold_dir), *map(str, run_dirs)],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 1
+    assert "--compare" in result.stdout
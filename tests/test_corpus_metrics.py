@@ -0,0 +1,157 @@
+"""Tests pour les métriques de corpus."""
+
+import random
+
+import pytest
+
+from scripts.evaluate import compute_fallacy_metrics, compute_reliability_mae
+
+pytest.importorskip("numpy")
+
+from scripts.corpus_metrics import CorpusAccumulator  # noqa: E402
+
+TYPES = ["ad_hominem", "homme_de_paille", "pente_glissante", "faux_dilemme", "appel_à_la_peur"]
+
+
+def random_article(rnd: random.Random, size: int):
+    gold_fallacies, pred_fallacies, gold_reliability, pred_reliability = {}, {}, {}, {}
+    for arg_id in range(1, size + 1):
+        if rnd.random() < 0.9:
+            gold_fallacies[arg_id] = rnd.sample(TYPES, rnd.randint(0, 2))
+            gold_reliability[arg_id] = rnd.randint(1, 5)
+        if rnd.random() < 0.9:
+            pred_fallacies[arg_id] = rnd.sample(TYPES, rnd.randint(0, 2))
+            pred_reliability[arg_id] = rnd.randint(1, 5)
+    return gold_fallacies, pred_fallacies, gold_reliability, pred_reliability
+
+
+@pytest.fixture
+def articles():
+    rnd = random.Random(42)
+    return [random_article(rnd, rnd.randint(0, 30)) for _ in range(25)]
+
+
+@pytest.fixture
+def metrics(articles):
+    corpus = CorpusAccumulator()
+    for i, article in enumerate(articles):
+        corpus.add(f"article_{i}", *article)
+    return corpus.compute()
+
+
+def merged(articles, index):
+    """Fusionne une annotation de tous les articles en préfixant les identifiants."""
+    return {(i, arg_id): value for i, a in enumerate(articles) for arg_id, value in a[index].items()}
+
+
+def test_article_f1_matches_set_implementation(articles, metrics):
+    expected = [compute_fallacy_metrics(gold, pred)[2] for gold, pred, _, _ in articles]
+    assert metrics.fallacy_article_f1 == pytest.approx(expected)
+
+
+def test_micro_and_per_type_match_merged_corpus(articles, metrics):
+    precision, recall, f1, details = compute_fallacy_metrics(merged(articles, 0), merged(articles, 1))
+    assert metrics.fallacy_micro_precision == pytest.approx(precision)
+    assert metrics.fallacy_micro_recall == pytest.approx(recall)
+    assert metrics.fallacy_micro_f1 == pytest.approx(f1)
+    assert set(metrics.fallacy_per_type) == set(details)
+    for fallacy_type, scores in details.items():
+        assert metrics.fallacy_per_type[fallacy_type]["f1"] == pytest.approx(scores["f1"])
+    macro_f1 = sum(d["f1"] for d in details.values()) / len(details)
+    assert metrics.fallacy_macro_f1 == pytest.approx(macro_f1)
+
+
+def test_reliability_micro_and_macro(articles, metrics):
+    assert metrics.reliability_mae_micro == pytest.approx(
+        compute_reliability_mae(merged(articles, 2), merged(articles, 3))
+    )
+    per_article = [
+        compute_reliability_mae(gold, pred)
+        for _, _, gold, pred in articles
+        if gold.keys() & pred.keys()
+    ]
+    assert metrics.reliability_mae_macro == pytest.approx(sum(per_article) / len(per_article))
+
+
+def test_support_counts_gold_occurrences():
+    corpus = CorpusAccumulator()
+    corpus.add("a", {1: ["ad_hominem"], 2: ["ad_hominem"]}, {1: ["ad_hominem"]}, {}, {})
+    per_type = corpus.compute().fallacy_per_type
+    assert per_type["ad_hominem"] == {"precision": 1.0, "recall": 0.5, "f1": pytest.approx(2 / 3),
+                                      "support": 2}
+
+
+def test_empty_articles_and_corpus():
+    assert CorpusAccumulator().compute().fallacy_micro_f1 == 0.0
+    corpus = CorpusAccumulator()
+    corpus.add("vide", {}, {}, {}, {})
+    corpus.add("sans_sophisme", {1: []}, {1: []}, {1: 3}, {1: 4})
+    corpus.add("vide_final", {}, {}, {}, {})
+    metrics = corpus.compute()
+    assert metrics.argument_count == 1
+    assert metrics.fallacy_article_f1 == [0.0, 0.0, 0.0]
+    assert metrics.reliability_mae_macro == 1.0
+
+
+@pytest.mark.parametrize("level", ["article", "argument"])
+def test_bootstrap_intervals_contain_estimates(articles, metrics, level):
+    corpus = CorpusAccumulator()
+    for i, article in enumerate(articles):
+        corpus.add(f"article_{i}", *article)
+    intervals = corpus.bootstrap(2000, level)
+    for name, estimate in [
+        ("fallacy_precision", metrics.fallacy_micro_precision),
+        ("fallacy_recall", metrics.fallacy_micro_recall),
+        ("fallacy_f1", metrics.fallacy_micro_f1),
+        ("reliability_mae", metrics.reliability_mae_micro),
+    ]:
+        low, high = intervals[name]
+        assert low < estimate < high
+    # Graine fixe par défaut: résultats reproductibles
+    assert corpus.bootstrap(2000, level) == intervals
+
+
+def test_bootstrap_argument_profiles_match_index_resampling(articles):
+    """Le tirage multinomial sur les profils équivaut au tirage des index."""
+    import numpy as np
+
+    corpus = CorpusAccumulator()
+    for i, article in enumerate(articles):
+        corpus.add(f"article_{i}", *article)
+    counts = np.stack(corpus._row_counts(), axis=1).astype(float)
+    rng = np.random.default_rng(1)
+    by_index = counts[rng.integers(0, len(counts), size=(4000, len(counts)))].sum(axis=1)
+    by_profile = CorpusAccumulator._resample_profiles(counts, 4000, rng)
+    assert by_profile.mean(axis=0) == pytest.approx(by_index.mean(axis=0), rel=0.01)
+    assert by_profile.std(axis=0) == pytest.approx(by_index.std(axis=0), rel=0.1)
+
+
+def test_bootstrap_edge_cases():
+    with pytest.raises(ValueError):
+        CorpusAccumulator().bootstrap(10, "corpus")
+    assert CorpusAccumulator().bootstrap(10)["fallacy_f1"] == (0.0, 0.0)
+    corpus = CorpusAccumulator()
+    corpus.add("unique", {1: ["ad_hominem"]}, {1: ["ad_hominem"]}, {1: 3}, {1: 5})
+    assert corpus.bootstrap(100) == {
+        "fallacy_precision": (1.0, 1.0),
+        "fallacy_recall": (1.0, 1.0),
+        "fallacy_f1": (1.0, 1.0),
+        "reliability_mae": (2.0, 2.0),
+    }
+
+
+def test_corpus_agreement_matches_merged_confusion(articles, metrics):
+    from scripts.agreement import quadratic_kappa, reliability_confusion, spearman
+
+    confusion = reliability_confusion(merged(articles, 2), merged(articles, 3))
+    assert metrics.reliability_confusion == confusion
+    assert metrics.reliability_correlation == pytest.approx(spearman(confusion))
+    assert metrics.reliability_qwk == pytest.approx(quadratic_kappa(confusion))
+
+
+def test_unannotated_reliability_is_skipped():
+    corpus = CorpusAccumulator()
+    corpus.add("importe", {1: ["ad_hominem"]}, {1: ["ad_hominem"]}, {}, {1: 2})
+    metrics = corpus.compute()
+    assert metrics.reliability_count == 0
+    assert metrics.to_dict()["reliability_mae_micro"] is None
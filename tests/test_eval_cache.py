@@ -0,0 +1,101 @@
+"""Tests pour le cache des évaluations."""
+
+import json
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts import evaluate
+from scripts.eval_cache import EvaluationCache, default_cache_path
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    gold_dir, pred_dir = tmp_path / "gold", tmp_path / "model"
+    gold_dir.mkdir()
+    pred_dir.mkdir()
+    for i in range(3):
+        shutil.copy(GOLD, gold_dir / f"{i:03}.json")
+        shutil.copy(GOLD, pred_dir / f"{i:03}.json")
+    return gold_dir, pred_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with EvaluationCache(tmp_path / "cache" / "eval.sqlite") as cache:
+        yield cache
+
+
+def test_default_path_follows_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_path() == tmp_path / "rhetorical-analysis" / "evaluate.sqlite"
+
+
+def test_key_depends_on_contents_version_and_options(cache, corpus, tmp_path):
+    gold_dir, pred_dir = corpus
+    gold, pred = gold_dir / "000.json", pred_dir / "000.json"
+    key = cache.key(gold, pred)
+    # Même contenu sous un autre nom: même clé
+    assert cache.key(gold_dir / "001.json", pred_dir / "001.json") == key
+    assert cache.key(gold, pred, 0.2) != key
+
+    analysis = json.loads(pred.read_text(encoding="utf-8"))
+    analysis["arguments"][0]["reliability"] = 1
+    pred.write_text(json.dumps(analysis), encoding="utf-8")
+    assert cache.key(gold, pred) != key
+
+    cache.version = "autre version"
+    assert cache.key(gold_dir / "001.json", pred_dir / "001.json") != key
+
+
+def test_batch_reuses_unchanged_pairs(cache, corpus, monkeypatch):
+    first = evaluate.batch_evaluate(*corpus, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    gold_dir, pred_dir = corpus
+    analysis = json.loads((pred_dir / "002.json").read_text(encoding="utf-8"))
+    for arg in analysis["arguments"]:
+        arg["fallacies"] = []
+    (pred_dir / "002.json").write_text(json.dumps(analysis), encoding="utf-8")
+
+    computed = []
+    evaluate_files = evaluate.evaluate_files
+    monkeypatch.setattr(
+        evaluate, "evaluate_files", lambda task: computed.append(task[1].name) or evaluate_files(task)
+    )
+    second = evaluate.batch_evaluate(*corpus, cache=cache)
+    assert computed == ["002.json"]
+    assert second[:2] == first[:2]
+    assert second[2] != first[2]
+
+
+def test_cached_annotations_feed_corpus_metrics(cache, corpus):
+    pytest.importorskip("numpy")
+    from scripts.corpus_metrics import CorpusAccumulator
+
+    evaluate.batch_evaluate(*corpus, cache=cache)
+    fresh, cached = CorpusAccumulator(), CorpusAccumulator()
+    evaluate.batch_evaluate(*corpus, corpus=fresh)
+    evaluate.batch_evaluate(*corpus, corpus=cached, cache=cache)
+    assert cache.hits == 3
+    assert cached.compute() == fresh.compute()
+
+
+def test_evict_by_age_then_size(cache):
+    for i in range(4):
+        cache.put(f"clé{i}", b"x" * 1000)
+    cache.get("clé0")  # relue: la plus récente
+
+    cache._db.execute("UPDATE evaluations SET accessed = ? WHERE key = 'clé3'",
+                      (time.time() - cache.max_age - 1,))
+    assert cache.evict() == 1
+    assert cache.get("clé3") is None
+
+    cache.max_bytes = 2500
+    assert cache.evict() == 1
+    remaining = {key for key in ("clé0", "clé1", "clé2") if cache.get(key) is not None}
+    assert remaining == {"clé0", "clé2"}
@@ -0,0 +1,154 @@
+"""Tests pour les sorties incrémentales des résultats d'évaluation."""
+
+import csv
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import evaluate
+from scripts.eval_sinks import (
+    CSV_COLUMNS,
+    CsvSink,
+    NdjsonSink,
+    ResultSink,
+    open_sink,
+    sink_format,
+)
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    gold_dir, pred_dir = tmp_path / "gold", tmp_path / "model"
+    gold_dir.mkdir()
+    pred_dir.mkdir()
+    for i in range(3):
+        shutil.copy(GOLD, gold_dir / f"{i:03}.json")
+        shutil.copy(GOLD, pred_dir / f"{i:03}.json")
+    return gold_dir, pred_dir
+
+
+@pytest.fixture
+def metrics():
+    gold = {"arguments": [
+        {"id": 1, "claim": "La dette menace", "fallacies": ["Homme de paille"], "reliability": 2},
+        {"id": 2, "claim": "Les impôts baissent", "fallacies": [], "reliability": 4},
+    ]}
+    predicted = {"arguments": [
+        {"id": 1, "claim": "La dette menace", "fallacies": ["strawman"], "reliability": 3},
+        {"id": 2, "claim": "Les impôts", "fallacies": ["pente glissante"], "reliability": 4},
+    ]}
+    return evaluate.evaluate_analysis(gold, predicted)
+
+
+def test_format_from_extension():
+    assert sink_format(Path("a.ndjson")) == sink_format(Path("a.JSONL")) == "ndjson"
+    assert sink_format(Path("a.parquet")) == "parquet"
+    assert sink_format(Path("a.csv")) == sink_format(Path("a.txt")) == "csv"
+
+
+def test_ndjson_record_is_complete_and_flushed(tmp_path, metrics):
+    path = tmp_path / "eval.ndjson"
+    with open_sink(path) as sink:
+        assert isinstance(sink, NdjsonSink)
+        sink.write("001", metrics)
+        # Lisible avant la fermeture
+        record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["article"] == "001"
+    assert record["fallacy_details"]["homme_de_paille"]["f1"] == 1.0
+    assert record["reliability_confusion"] == metrics.reliability_confusion
+    assert record["toulmin"]["claim"]["count"] == 2
+
+
+def test_csv_keeps_columns_and_adds_details(tmp_path, metrics):
+    path = tmp_path / "eval.csv"
+    with CsvSink(path) as sink:
+        sink.write("001", metrics)
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    with open(path, encoding="utf-8") as f:
+        (row,) = csv.DictReader(f)
+    assert list(row) == CSV_COLUMNS
+    # Les lecteurs positionnels de l'ancien export restent valides
+    assert CSV_COLUMNS[:7] == [
+        "article", "fallacy_precision", "fallacy_recall", "fallacy_f1", "reliability_mae",
+        "arg_count_gold", "arg_count_pred",
+    ]
+    assert row["fallacy_f1"] == f"{metrics.fallacy_f1:.3f}"
+    assert row["toulmin_grounds_rouge_l"] == ""
+    assert "pente_glissante" in json.loads(row["fallacy_details"])
+
+
+def test_csv_formats_metrics_by_column(tmp_path):
+    # Aucun sophisme ni prédiction: dénominateurs nuls, scores entiers (0)
+    article = {"arguments": [{"id": 1, "fallacies": [], "reliability": 3}]}
+    metrics = evaluate.evaluate_analysis(article, article)
+    assert metrics.fallacy_precision == 0 and isinstance(metrics.fallacy_precision, int)
+    path = tmp_path / "eval.csv"
+    with CsvSink(path) as sink:
+        sink.write("vide", metrics)
+    with open(path, encoding="utf-8") as f:
+        (row,) = csv.DictReader(f)
+    assert (row["fallacy_precision"], row["fallacy_recall"], row["fallacy_f1"]) == (
+        "0.000", "0.000", "0.000"
+    )
+    assert row["reliability_mae"] == "0.000"
+    assert (row["arg_count_gold"], row["reliability_count"]) == ("1", "1")
+
+
+def test_batch_writes_each_article_as_it_finishes(corpus):
+    written = []
+
+    class Recorder(ResultSink):
+        def __init__(self):
+            super().__init__(Path("memoire"))
+
+        def write(self, name, metrics):
+            written.append(name)
+
+        def close(self):
+            pass
+
+    results = evaluate.batch_evaluate(*corpus, jobs=2, sink=Recorder())
+    assert written == [name for name, _ in results] == ["000", "001", "002"]
+
+
+def test_result_sink_is_abstract():
+    class Incomplete(ResultSink):
+        def write(self, name, metrics):
+            pass
+
+    with pytest.raises(TypeError, match="close"):
+        Incomplete(Path("memoire"))
+
+
+def test_parquet_sink(tmp_path, metrics):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "eval.parquet"
+    with open_sink(path) as sink:
+        sink.write("001", metrics)
+        sink.write("002", metrics)
+    table = pq.read_table(path)
+    assert table.column_names == CSV_COLUMNS
+    assert table.column("arg_count_gold").to_pylist() == [2, 2]
+
+
+def test_cli_multiple_outputs(corpus, tmp_path):
+    ndjson, table = tmp_path / "eval.ndjson", tmp_path / "eval.csv"
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "scripts.evaluate", "--batch", *map(str, corpus),
+            "--jobs", "1", "--quiet", "-o", str(ndjson), "-o", str(table),
+        ],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert [json.loads(line)["article"] for line in ndjson.read_text().splitlines()] == [
+        "000", "001", "002",
+    ]
+    assert len(table.read_text().splitlines()) == 4
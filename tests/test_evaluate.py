@@ -0,0 +1,153 @@
+"""Tests pour le script d'évaluation."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import evaluate
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Répertoires gold/model de quelques articles dérivés de l'annotation de référence."""
+    with open(GOLD, encoding="utf-8") as f:
+        gold = json.load(f)
+    gold_dir, pred_dir = tmp_path / "gold", tmp_path / "model"
+    gold_dir.mkdir()
+    pred_dir.mkdir()
+    for i in range(5):
+        predicted = {
+            **gold,
+            "arguments": [
+                {**arg, "reliability": (arg.get("reliability", 3) + i) % 5 + 1,
+                 "fallacies": arg.get("fallacies", [])[: i % 2]}
+                for arg in gold["arguments"]
+            ],
+        }
+        (gold_dir / f"{i:03}.json").write_text(json.dumps(gold), encoding="utf-8")
+        (pred_dir / f"{i:03}.json").write_text(json.dumps(predicted), encoding="utf-8")
+    (gold_dir / "sans_prediction.json").write_text(json.dumps(gold), encoding="utf-8")
+    return gold_dir, pred_dir
+
+
+def test_batch_evaluate_is_sorted(corpus):
+    results = evaluate.batch_evaluate(*corpus)
+    assert [name for name, _ in results] == ["000", "001", "002", "003", "004"]
+
+
+def test_batch_evaluate_parallel_matches_sequential(corpus):
+    sequential = evaluate.batch_evaluate(*corpus, jobs=1)
+    parallel = evaluate.batch_evaluate(*corpus, jobs=3)
+    assert parallel == sequential
+
+
+def test_batch_evaluate_progress(corpus, capsys):
+    evaluate.batch_evaluate(*corpus, jobs=2, progress=True)
+    captured = capsys.readouterr()
+    assert "5/5 paire(s) évaluée(s)" in captured.err
+    assert "Pas de prédiction pour sans_prediction.json" in captured.out
+
+
+def test_cli_batch_jobs(corpus, tmp_path):
+    output_csv = tmp_path / "eval.csv"
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "scripts.evaluate", "--batch", *map(str, corpus),
+            "--jobs", "2", "--quiet", "-o", str(output_csv),
+        ],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert len(output_csv.read_text().splitlines()) == 6
+
+
+def test_cli_align_similarity(corpus):
+    gold_dir, pred_dir = corpus
+    gold_file = gold_dir / "001.json"
+    # Prédiction identique mais arguments dans l'ordre inverse, ids renumérotés
+    analysis = json.loads(gold_file.read_text(encoding="utf-8"))
+    analysis["arguments"] = [
+        {**arg, "id": i} for i, arg in enumerate(reversed(analysis["arguments"]), 1)
+    ]
+    pred_file = pred_dir / "inverse.json"
+    pred_file.write_text(json.dumps(analysis), encoding="utf-8")
+
+    def f1(*options):
+        result = subprocess.run(
+            [sys.executable, "-m", "scripts.evaluate", str(gold_file), str(pred_file),
+             "--quiet", *options],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        return json.loads(result.stdout)["fallacy_f1"]
+
+    assert f1("--align", "similarity") == 1.0
+    assert f1() < 1.0
+
+
+def test_cli_bootstrap(corpus):
+    pytest.importorskip("numpy")
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.evaluate", "--batch", *map(str, corpus),
+         "--quiet", "--bootstrap", "500"],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert "Intervalles de confiance à 95 % (500 tirages par article)" in result.stdout
+    assert "Reliability MAE:" in result.stdout.split("Intervalles")[1]
+
+
+@pytest.mark.parametrize("option", [["--bootstrap", "100"], ["--state", "state.json"]])
+def test_cli_corpus_options_require_numpy(corpus, option):
+    # NumPy rendu introuvable dans le sous-processus
+    code = (
+        "import runpy, sys; sys.modules['numpy'] = None; "
+        "runpy.run_module('scripts.evaluate', run_name='__main__')"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, "--batch", *map(str, corpus), "--quiet", *option],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 1
+    assert f"❌ Erreur: NumPy requis pour {option[0]} (pip install .[benchmark])" in result.stdout
+
+
+def test_cli_bootstrap_requires_batch(corpus):
+    gold_dir, pred_dir = corpus
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.evaluate", str(gold_dir / "000.json"),
+         str(pred_dir / "000.json"), "--bootstrap", "100"],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 1
+    assert "--bootstrap n'est disponible qu'en mode batch" in result.stdout
+
+
+def test_unannotated_reliability_is_not_scored():
+    gold = {"arguments": [
+        {"id": 1, "fallacies": ["ad_hominem"], "reliability": None},
+        {"id": 2, "fallacies": [], "reliability": 4},
+    ]}
+    predicted = {"arguments": [
+        {"id": 1, "fallacies": ["ad_hominem"], "reliability": 1},
+        {"id": 2, "fallacies": [], "reliability": 2},
+    ]}
+    metrics = evaluate.evaluate_analysis(gold, predicted)
+    assert (metrics.reliability_count, metrics.reliability_mae) == (1, 2.0)
+
+    for arg in gold["arguments"]:
+        arg["reliability"] = None
+    metrics = evaluate.evaluate_analysis(gold, predicted)
+    assert metrics.fallacy_f1 == 1.0
+    assert metrics.reliability_count == 0
+    assert metrics.to_dict()["reliability_mae"] is None
@@ -0,0 +1,99 @@
+"""Tests pour l'index des noms de sophismes."""
+
+import pytest
+
+from scripts.evaluate import evaluate_analysis, extract_fallacies
+from scripts.fallacy_index import (
+    LOGIC_TYPES,
+    build_index,
+    edit_distance,
+    fold,
+    get_index,
+    label,
+    normalize,
+    parse_catalog,
+)
+from scripts.model import Fallacy
+
+CATALOG = """\
+## Sophismes de pertinence
+
+### Ad hominem
+Attaquer la personne plutôt que l'argument.
+- **Tu quoque** : "Toi aussi tu fais pareil"
+
+### Homme de paille (strawman)
+
+### Question complexe / Question piégée
+"""
+
+
+def test_parse_catalog_variants_and_subtypes():
+    assert parse_catalog(CATALOG) == [
+        ("Ad hominem", ["Tu quoque"]),
+        ("Homme de paille", ["strawman"]),
+        ("Question complexe", ["Question piégée"]),
+    ]
+
+
+def test_fold():
+    assert fold("  Appel à l'Émotion ") == "appel_a_l_emotion"
+    assert fold("généralisation_hâtive") == "generalisation_hative"
+
+
+@pytest.mark.parametrize("name", [
+    "Homme de paille", "homme_de_paille", "HOMME DE PAILLE", "strawman", "Straw Man",
+    "fallacy of extension", "Épouvantail",
+])
+def test_aliases_share_one_key(name):
+    assert normalize(name) == "homme_de_paille"
+
+
+def test_catalog_entries_are_indexed():
+    index = get_index()
+    assert index.lookup("Tu quoque") == "ad_hominem"
+    assert index.lookup("Question piégée") == "question_complexe"
+    assert index.lookup("post hoc ergo propter hoc") == "fausse_cause"
+    assert label("petition_de_principe") == "Pétition de principe"
+
+
+def test_all_logic_types_have_labels():
+    index = get_index()
+    assert len(LOGIC_TYPES) == 13
+    for name, key in LOGIC_TYPES.items():
+        assert index.lookup(name) == key
+        assert index.label(key) != key
+
+
+def test_fuzzy_fallback_is_bounded():
+    assert normalize("Home de paile") == "homme_de_paille"
+    assert normalize("divison") == "division"
+    assert edit_distance("division", "divisions", 1) == 1
+    assert edit_distance("abc", "xyz", 1) == 2
+    # Libellé court: une seule faute tolérée
+    assert normalize("divsio") == "divsio"
+    # Libellé inconnu: forme repliée conservée
+    assert normalize("Argument ad nauseam") == "argument_ad_nauseam"
+
+
+def test_index_without_catalog_keeps_synonyms_and_logic():
+    index = build_index()
+    assert index.lookup("strawman argument") == "homme_de_paille"
+    assert index.lookup("red herring") == "diversion"
+
+
+def test_fallacy_key_and_display():
+    assert Fallacy.parse({"name": "fausse_equivalence", "severity": "Majeur"}).display == (
+        "Fausse équivalence (Majeur)"
+    )
+    # Un nom écrit à la main est affiché tel quel
+    assert Fallacy.parse("homme de paille").display == "homme de paille"
+    assert Fallacy.parse("inconnu_du_catalogue").display == "inconnu_du_catalogue"
+    assert Fallacy.parse("Strawman").key == "homme_de_paille"
+
+
+def test_evaluation_matches_synonyms():
+    gold = {"arguments": [{"id": 1, "fallacies": [{"name": "Homme de paille", "severity": "Majeur"}]}]}
+    predicted = {"arguments": [{"id": 1, "fallacies": ["strawman"]}]}
+    assert extract_fallacies(predicted) == {1: ["homme_de_paille"]}
+    assert evaluate_analysis(gold, predicted).fallacy_f1 == 1.0
@@ -1,10 +1,15 @@
 import json
+import os
+import sys
 
 import pytest
 
 import scripts.formatters.excel as excel
 import scripts.formatters.json as json_formatter
 import scripts.formatters.markdown as markdown
+import scripts.formatters.xlsx_native as xlsx_native
+from scripts.model import Analysis, parse_analysis
+from scripts.reader import AnalysisReader
 
 
 # Define a temporary directory for test outputs
@@ -38,6 +43,18 @@ def test_json_formatter(example_analysis_data, temp_output_dir):
         loaded_data = json.load(f)
     assert loaded_data == example_analysis_data
 
+
+def test_json_formatter_model_without_source(example_analysis_data, temp_output_dir):
+    parsed = parse_analysis(example_analysis_data)
+    # Modèle construit en mémoire: pas de document d'origine
+    analysis = Analysis(parsed.metadata, parsed.arguments, parsed.synthesis)
+    output_path = temp_output_dir / "model_report.json"
+    assert json_formatter.save_report(analysis, output_path) is True
+    with open(output_path, encoding='utf-8') as f:
+        loaded_data = json.load(f)
+    assert loaded_data is not None
+    assert parse_analysis(loaded_data) == parsed
+
 # Test Markdown formatter
 def test_markdown_formatter(example_analysis_data, temp_output_dir):
     output_path = temp_output_dir / "test_report.md"
@@ -51,3 +68,158 @@ def test_markdown_formatter(example_analysis_data, temp_output_dir):
     assert "## Synthèse Critique" in content
     assert "### Argument N°1:" in content
     assert "| Note | Niveau | Description |" in content
+
+
+def test_markdown_chunks_are_independent_of_size(example_analysis_data):
+    analysis = parse_analysis(example_analysis_data)
+    expected = "\n".join(markdown.iter_lines(analysis))
+    assert "".join(markdown.iter_chunks(analysis, size=1)) == expected
+    assert "".join(markdown.iter_chunks(analysis)) == expected
+    assert not expected.endswith("\n")
+
+
+def test_markdown_shows_unannotated_fields():
+    analysis = parse_analysis({"arguments": [
+        {"id": 1, "claim": "Thèse", "warrant": None, "reliability": None},
+    ]})
+    content = "\n".join(markdown.iter_lines(analysis))
+    assert "**Fiabilité (1-5):** Non annoté" in content
+    assert "- **Warrant:** Non annoté" in content
+    assert "None" not in content
+
+
+def test_markdown_reader_matches_dict(example_analysis_data, temp_output_dir):
+    dict_path = temp_output_dir / "dict.md"
+    reader_path = temp_output_dir / "reader.md"
+    assert markdown.save_report(example_analysis_data, dict_path) is True
+    assert markdown.save_report(AnalysisReader("assets/example_analysis.json"), reader_path)
+    assert reader_path.read_text() == dict_path.read_text()
+
+
+def test_markdown_stdout(example_analysis_data, capsys):
+    assert markdown.save_report(example_analysis_data, markdown.STDOUT) is True
+    captured = capsys.readouterr()
+    assert captured.out.startswith("# Analyse Rhétorique:")
+    assert "Fichier généré" not in captured.out
+
+
+def test_markdown_stdout_closed_pipe(example_analysis_data, monkeypatch):
+    # `-o - | head`: le lecteur ferme le tube avant la fin, ce n'est pas un échec
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    with open(write_fd, "w", encoding="utf-8") as pipe:
+        monkeypatch.setattr(sys, "stdout", pipe)
+        assert markdown.save_report(example_analysis_data, markdown.STDOUT) is True
+
+
+def test_markdown_invalid_reader_creates_no_output(tmp_path):
+    source = tmp_path / "invalide.json"
+    source.write_text('{"metadata": {}, "arguments": [{"id": 1}, oops]}', encoding="utf-8")
+    output_path = tmp_path / "sortie" / "rapport.md"
+    with pytest.raises(ValueError):
+        markdown.save_report(AnalysisReader(source), output_path)
+    assert not output_path.exists()
+
+# Test Excel formatter in streaming (write-only) mode
+def test_excel_formatter_streaming_matches_standard(example_analysis_data, temp_output_dir):
+    from openpyxl import load_workbook
+
+    standard_path = temp_output_dir / "standard.xlsx"
+    streaming_path = temp_output_dir / "streaming.xlsx"
+    assert excel.save_report(example_analysis_data, standard_path) is True
+    assert excel.save_report(example_analysis_data, streaming_path, streaming=True) is True
+
+    standard = load_workbook(standard_path)
+    streamed = load_workbook(streaming_path)
+    assert streamed.sheetnames == standard.sheetnames
+    for name in standard.sheetnames:
+        assert list(streamed[name].values) == list(standard[name].values)
+
+    main = streamed["Analyse rhétorique"]
+    assert main.row_dimensions[2].height == excel.MAIN_ROW_HEIGHT
+    assert main.cell(row=2, column=excel.RELIABILITY_COLUMN).style == excel.CENTER
+    for name in ["Analyse rhétorique", "Évaluation sources (CRAAP)", "Légende"]:
+        ranges = [str(cf.sqref) for cf in streamed[name].conditional_formatting]
+        assert ranges == [str(cf.sqref) for cf in standard[name].conditional_formatting]
+        assert ranges
+
+
+def test_excel_reliability_bands_use_conditional_formatting(example_analysis_data, temp_output_dir):
+    from openpyxl import load_workbook
+
+    output_path = temp_output_dir / "bands.xlsx"
+    excel.save_report(example_analysis_data, output_path)
+    ws = load_workbook(output_path)["Analyse rhétorique"]
+
+    n = len(example_analysis_data["arguments"])
+    (cf,) = list(ws.conditional_formatting)
+    assert str(cf.sqref) == f"G2:G{n + 1}"
+    colors = [rule.dxf.fill.bgColor.rgb[-6:] for rule in cf.rules]
+    assert colors == ["C6EFCE", "FFEB9C", "FFC7CE"]
+    # Aucun remplissage posé cellule par cellule
+    assert ws["G2"].fill.fill_type is None
+
+
+def test_excel_streaming_accepts_reader(temp_output_dir):
+    wb = excel.stream_workbook(AnalysisReader("assets/example_analysis.json"))
+    output_path = temp_output_dir / "reader.xlsx"
+    output_path.parent.mkdir(parents=True)
+    wb.save(output_path)
+    assert output_path.stat().st_size > 0
+
+
+def test_native_xlsx_accepts_reader(example_analysis_data, temp_output_dir):
+    from openpyxl import load_workbook
+
+    reference_path = temp_output_dir / "dict.xlsx"
+    reader_path = temp_output_dir / "reader.xlsx"
+    assert xlsx_native.save_report(example_analysis_data, reference_path) is True
+    assert xlsx_native.save_report(AnalysisReader("assets/example_analysis.json"), reader_path)
+
+    reference, streamed = load_workbook(reference_path), load_workbook(reader_path)
+    for ws in reference.worksheets:
+        assert [r for r in ws.values] == [r for r in streamed[ws.title].values]
+
+
+# Test native XLSX engine
+def test_native_xlsx_matches_openpyxl(example_analysis_data, temp_output_dir):
+    from openpyxl import load_workbook
+
+    reference_path = temp_output_dir / "openpyxl.xlsx"
+    native_path = temp_output_dir / "native.xlsx"
+    assert excel.save_report(example_analysis_data, reference_path) is True
+    assert xlsx_native.save_report(example_analysis_data, native_path) is True
+
+    reference = load_workbook(reference_path)
+    native = load_workbook(native_path)
+    assert native.sheetnames == reference.sheetnames
+    for name in reference.sheetnames:
+        assert list(native[name].values) == list(reference[name].values)
+        assert [str(cf.sqref) for cf in native[name].conditional_formatting] == [
+            str(cf.sqref) for cf in reference[name].conditional_formatting
+        ]
+
+    main = native["Analyse rhétorique"]
+    assert main["A1"].font.b is True
+    assert main["B2"].alignment.wrap_text is True
+    assert main.row_dimensions[2].height == 150
+    assert main.column_dimensions["C"].width == 45
+
+
+def test_native_xlsx_deduplicates_shared_strings(example_analysis_data, temp_output_dir):
+    import zipfile
+
+    output_path = temp_output_dir / "native.xlsx"
+    xlsx_native.save_report(example_analysis_data, output_path)
+    with zipfile.ZipFile(output_path) as zf:
+        sst = zf.read("xl/sharedStrings.xml").decode("utf-8")
+    assert sst.count("<t xml:space=\"preserve\">Aucun détecté</t>") == 1
+    strings = xlsx_native.SharedStrings()
+    assert strings.add("Non explicité") == strings.add("Non explicité") == 0
+    assert (strings.count, len(strings)) == (2, 1)
+
+
+def test_native_column_letter():
+    assert [xlsx_native.column_letter(i) for i in (1, 26, 27, 52, 703)] == [
+        "A", "Z", "AA", "AZ", "AAA"
+    ]
@@ -1,6 +1,7 @@
 """Tests pour le générateur d'analyse rhétorique."""
 
 import json
+import os
 import subprocess
 
 # Import the main script to test its CLI functionality
@@ -10,7 +11,7 @@ from pathlib import Path
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from scripts import generate_analysis
+from scripts import formatters, generate_analysis
 
 
 @pytest.fixture
@@ -81,6 +82,40 @@ class TestGenerateAnalysisCLI:
         assert output_xlsx.exists()
         assert output_xlsx.stat().st_size > 0 # Ensure file is not empty
 
+    def test_cli_xlsx_streaming_output(self, minimal_analysis_json_file, tmp_path):
+        """Vérifie le mode XLSX write-only."""
+        output_xlsx = tmp_path / "report.xlsx"
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                str(output_xlsx),
+                "--xlsx-streaming"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert output_xlsx.stat().st_size > 0
+
+    def test_cli_xlsx_native_engine(self, minimal_analysis_json_file, tmp_path):
+        """Vérifie le moteur XLSX natif."""
+        output_xlsx = tmp_path / "report.xlsx"
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                str(output_xlsx),
+                "--xlsx-engine", "native"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert output_xlsx.stat().st_size > 0
+
     def test_cli_json_output(self, minimal_analysis_json_file, tmp_path):
         """Vérifie que le CLI génère correctement un fichier JSON."""
         output_json = tmp_path / "report.json"
@@ -129,6 +164,40 @@ class TestGenerateAnalysisCLI:
         assert "### Argument N°1: Test argument" in content
         assert "| Note | Niveau | Description |" in content
 
+    def test_cli_markdown_stdout(self, minimal_analysis_json_file):
+        """Vérifie l'écriture du rapport Markdown sur la sortie standard."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                "-",
+                "--format", "md"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert result.stdout.startswith("# Analyse Rhétorique: Test Article")
+        assert "### Argument N°1: Test argument" in result.stdout
+        assert not Path("-").exists()
+
+    def test_cli_stdout_requires_markdown(self, minimal_analysis_json_file):
+        """Vérifie que `-` est refusé pour les formats binaires ou multiples."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                "-",
+                "--format", "xlsx,md"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 1
+        assert "n'est disponible que pour le format md" in result.stdout
+
     def test_cli_missing_arguments(self):
         """Vérifie le comportement avec des arguments manquants."""
         result = subprocess.run(
@@ -174,6 +243,26 @@ class TestGenerateAnalysisCLI:
         assert result.returncode == 1
         assert "Le fichier JSON d'entrée est invalide" in result.stdout
 
+    def test_cli_invalid_json_content_streaming(self, tmp_path):
+        """Vérifie qu'un JSON malformé est signalé pendant la lecture incrémentale."""
+        invalid_json_file = tmp_path / "invalid.json"
+        invalid_json_file.write_text('{"arguments": [{"id": 1}, oops]}')
+        output_xlsx = tmp_path / "report.xlsx"
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(invalid_json_file),
+                str(output_xlsx),
+                "--xlsx-engine", "native"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 1
+        assert "Le fichier JSON d'entrée est invalide" in result.stdout
+        assert not output_xlsx.exists()
+
     def test_cli_unsupported_format(self, minimal_analysis_json_file, tmp_path):
         """Vérifie le comportement avec un format de sortie non supporté."""
         output_file = tmp_path / "report.xyz"
@@ -190,3 +279,226 @@ class TestGenerateAnalysisCLI:
         )
         assert result.returncode == 2 # argparse exits with 2 for invalid choices
         assert "invalid choice: 'xyz'" in result.stderr
+
+
+class TestGenerateAnalysisMultiFormat:
+    """Tests pour le rendu multi-format en une seule invocation."""
+
+    def test_parse_formats(self):
+        assert generate_analysis.parse_formats("md, json,md") == ["md", "json"]
+        assert generate_analysis.parse_formats("all") == ["xlsx", "json", "md"]
+
+    def test_expand_output_path(self):
+        src = Path("in/article.json")
+        assert generate_analysis.expand_output_path(
+            Path("out/rapport.xlsx"), src, "md", multiple=True
+        ) == Path("out/rapport.md")
+        assert generate_analysis.expand_output_path(
+            Path("out/{stem}_{format}.{ext}"), src, "json", multiple=False
+        ) == Path("out/article_json.json")
+        assert generate_analysis.expand_output_path(
+            Path("out/rapport.txt"), src, "md", multiple=False
+        ) == Path("out/rapport.txt")
+        assert generate_analysis.expand_output_path(
+            Path("out/{{v2}}_{stem}.md"), src, "md", multiple=False
+        ) == Path("out/{v2}_article.md")
+
+    @pytest.mark.parametrize("template, message", [
+        ("out/{name}.{ext}", r"champ\(s\) inconnu\(s\): \{name\}"),
+        ("out/{}.md", "inconnu"),
+        ("out/{stem.upper}.md", "inconnu"),
+        ("out/{stem.md", "accolade isolée"),
+        ("out/stem}.md", "accolade isolée"),
+    ])
+    def test_invalid_output_template(self, template, message):
+        with pytest.raises(ValueError, match=message):
+            generate_analysis.expand_output_path(
+                Path(template), Path("in/article.json"), "md", multiple=False
+            )
+
+    def test_cli_invalid_template(self, minimal_analysis_json_file, tmp_path):
+        commands = [
+            [str(minimal_analysis_json_file), str(tmp_path / "{nom}.md"), "--format", "md"],
+            [str(minimal_analysis_json_file.parent), str(tmp_path / "batch"),
+             "--output-template", "{stem.{ext}", "--jobs", "1"],
+        ]
+        for command in commands:
+            result = subprocess.run(
+                [sys.executable, str(generate_analysis.__file__), *command],
+                capture_output=True,
+                text=True
+            )
+            assert result.returncode == 1
+            assert "❌ Erreur: modèle de sortie invalide" in result.stdout
+            assert "Traceback" not in result.stderr
+
+    def test_cli_all_formats_from_template(self, minimal_analysis_json_file, tmp_path):
+        template = tmp_path / "reports" / "{stem}.{ext}"
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                str(template),
+                "--format", "all"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        for ext in ["xlsx", "json", "md"]:
+            assert (tmp_path / "reports" / f"minimal_analysis.{ext}").exists()
+
+    def test_cli_format_list_without_placeholder(self, minimal_analysis_json_file, tmp_path):
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                str(tmp_path / "rapport.xlsx"),
+                "--format", "md,json"
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert (tmp_path / "rapport.md").exists()
+        assert (tmp_path / "rapport.json").exists()
+        assert not (tmp_path / "rapport.xlsx").exists()
+
+
+class TestGenerateAnalysisBatch:
+    """Tests pour le mode batch (répertoire, glob, manifeste)."""
+
+    @pytest.fixture
+    def corpus_dir(self, minimal_analysis_data, tmp_path):
+        """Crée un petit corpus de trois analyses dont une dans un sous-répertoire."""
+        corpus = tmp_path / "corpus"
+        (corpus / "sub").mkdir(parents=True)
+        for rel in ["a.json", "b.json", "sub/c.json"]:
+            with open(corpus / rel, 'w', encoding='utf-8') as f:
+                json.dump(minimal_analysis_data, f)
+        return corpus
+
+    def _run(self, *args):
+        return subprocess.run(
+            [sys.executable, str(generate_analysis.__file__), *map(str, args)],
+            capture_output=True,
+            text=True
+        )
+
+    def test_collect_inputs_directory_is_recursive(self, corpus_dir):
+        inputs = generate_analysis.collect_inputs(str(corpus_dir))
+        assert [p.name for p in inputs] == ["a.json", "b.json", "c.json"]
+
+    def test_collect_inputs_manifest(self, corpus_dir, tmp_path):
+        manifest = corpus_dir / "manifest.txt"
+        manifest.write_text("# commentaire\na.json\n\nsub/c.json\n", encoding='utf-8')
+        inputs = generate_analysis.collect_inputs(f"@{manifest}")
+        assert inputs == [corpus_dir / "a.json", corpus_dir / "sub" / "c.json"]
+
+    def test_output_paths_keep_relative_layout(self, corpus_dir, tmp_path):
+        inputs = generate_analysis.collect_inputs(str(corpus_dir))
+        outputs = generate_analysis.output_paths_for(inputs, tmp_path / "out", ["md"])
+        assert outputs[-1] == [("md", tmp_path / "out" / "sub" / "c.md")]
+
+    def test_cli_batch_directory(self, corpus_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        result = self._run(corpus_dir, out_dir, "--format", "md", "--jobs", "2")
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert (out_dir / "a.md").exists()
+        assert (out_dir / "sub" / "c.md").exists()
+        assert "3 succès, 0 échec(s)" in result.stdout
+
+    def test_cli_batch_multi_format(self, corpus_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        result = self._run(
+            corpus_dir, out_dir, "--format", "md,json", "--output-template", "{stem}_report.{ext}"
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert (out_dir / "a_report.md").exists()
+        assert (out_dir / "sub" / "c_report.json").exists()
+
+    def test_cli_batch_glob(self, corpus_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        result = self._run(f"{corpus_dir}/*.json", out_dir, "--format", "json", "--jobs", "1")
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert sorted(p.name for p in out_dir.iterdir()) == ["a.json", "b.json"]
+
+    def test_cli_batch_reports_failures(self, corpus_dir, tmp_path):
+        (corpus_dir / "broken.json").write_text("{ invalid json }")
+        result = self._run(corpus_dir, tmp_path / "out", "--format", "md")
+        assert result.returncode == 1
+        assert "broken.json: JSON invalide" in result.stdout
+        assert "3 succès, 1 échec(s) sur 4 fichier(s)" in result.stdout
+
+    def test_cli_batch_streaming_reports_failures(self, corpus_dir, tmp_path):
+        (corpus_dir / "broken.json").write_text('{"arguments": [oops]}')
+        result = self._run(corpus_dir, tmp_path / "out", "--xlsx-streaming", "--jobs", "1")
+        assert result.returncode == 1
+        assert "broken.json: JSON invalide" in result.stdout
+        assert "3 succès, 1 échec(s) sur 4 fichier(s)" in result.stdout
+
+    def test_cli_batch_no_match(self, tmp_path):
+        result = self._run(f"{tmp_path}/*.json", tmp_path / "out")
+        assert result.returncode == 1
+        assert "Aucun fichier JSON trouvé" in result.stdout
+
+
+class TestFormatterRegistry:
+    """Tests du registre paresseux des formateurs."""
+
+    def test_cli_import_does_not_load_openpyxl(self):
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, scripts.generate_analysis; "
+                "print(any(m.startswith('openpyxl') for m in sys.modules))",
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.stdout.strip() == "False", result.stderr
+
+    def test_plugin_formatter_is_accepted(self, monkeypatch):
+        monkeypatch.setattr(formatters, "plugin_formatters", lambda: {"dump": "json:dumps"})
+        assert generate_analysis.parse_formats("md,dump") == ["md", "dump"]
+        assert generate_analysis.parse_formats("all") == ["xlsx", "json", "md", "dump"]
+        assert formatters.get_formatter("dump") is json.dumps
+
+    def test_plugin_cannot_replace_builtin(self, monkeypatch):
+        monkeypatch.setattr(formatters, "plugin_formatters", lambda: {"md": "json:dumps"})
+        assert formatters.available_formats() == ["xlsx", "json", "md"]
+        assert formatters.get_formatter("md") is not json.dumps
+
+    def test_cli_entry_point_plugin(self, minimal_analysis_json_file, tmp_path):
+        """Vérifie qu'un formateur tiers déclaré par entry point est utilisé."""
+        plugin_dir = tmp_path / "site"
+        dist_info = plugin_dir / "txt_formatter-1.0.dist-info"
+        dist_info.mkdir(parents=True)
+        (dist_info / "METADATA").write_text("Name: txt-formatter\nVersion: 1.0\n")
+        (dist_info / "entry_points.txt").write_text(
+            "[rhetorical_analysis.formatters]\ntxt = txt_formatter:save_report\n"
+        )
+        (plugin_dir / "txt_formatter.py").write_text(
+            "def save_report(analysis, output_path):\n"
+            "    output_path.write_text(analysis.metadata.title)\n"
+            "    return True\n"
+        )
+        output_txt = tmp_path / "report.txt"
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(generate_analysis.__file__),
+                str(minimal_analysis_json_file),
+                str(output_txt),
+                "--format", "txt"
+            ],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(
+                [str(plugin_dir), str(Path(__file__).parent.parent)]
+            )},
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        assert output_txt.read_text() == "Test Article"
@@ -0,0 +1,245 @@
+"""Tests pour l'import des jeux de données externes."""
+
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+from scripts import evaluate
+from scripts.import_dataset import import_dataset
+from scripts.importers import input_files
+from scripts.importers.aaec import parse_brat
+from scripts.importers.fallacies import fallacy_entry, map_fallacy, split_labels
+from scripts.reader import AnalysisReader
+
+LOGIC_ROWS = [
+    ("Tout le monde le pense, donc c'est vrai.", "ad populum"),
+    ("Il ment, regardez sa coiffure.", "ad hominem"),
+    ("Soit vous êtes avec nous, soit contre nous.", "false dilemma"),
+    ("", "equivocation"),
+    ("Ce raisonnement est formellement invalide.", "fallacy of logic"),
+]
+
+MAFALDA = [
+    {"text": "You can't trust him, and everyone agrees anyway.",
+     "labels": [[0, 18, "ad hominem"], [24, 47, "ad populum"]]},
+    {"text": "Nothing wrong here.", "labels": [[0, 19, "nothing"]]},
+    {"text": "Laughing at it proves it wrong.", "labels": [[0, 31, "appeal to ridicule"]]},
+]
+
+
+@pytest.fixture
+def logic_dir(tmp_path):
+    directory = tmp_path / "dataset-fixed"
+    directory.mkdir()
+    for split in ("train", "dev"):
+        with open(directory / f"edu_{split}.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["", "source_article", "updated_label"])
+            for i, row in enumerate(LOGIC_ROWS):
+                writer.writerow([i, *row])
+    return directory
+
+
+@pytest.fixture
+def mafalda_file(tmp_path):
+    path = tmp_path / "gold_standard_dataset.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in MAFALDA), encoding="utf-8")
+    return path
+
+
+def test_label_mapping():
+    assert map_fallacy("fallacy of extension") == ("homme_de_paille", True)
+    assert map_fallacy("appeal to (false) authority") == ("appel_a_l_autorite", True)
+    assert map_fallacy("intentional") == ("sophisme_intentionnel", True)
+    assert map_fallacy("appeal to ridicule") == ("appeal_to_ridicule", False)
+    assert fallacy_entry("nothing") is None
+    assert fallacy_entry("causal oversimplification", 3, 9) == {
+        "name": "fausse_cause", "source_label": "causal oversimplification", "start": 3, "end": 9,
+    }
+    assert split_labels("['ad hominem', 'false causality']") == ["ad hominem", "false causality"]
+
+
+def test_import_logic(logic_dir, tmp_path):
+    output = tmp_path / "gold"
+    stats = import_dataset("fixedlogic", [logic_dir], output)
+    assert (stats.files, stats.arguments) == (2, 8)
+    assert not stats.unknown
+    analysis = AnalysisReader(output / "edu_train.json").load()
+    assert analysis.metadata.source == "edu_train.csv"
+    # La ligne sans texte est ignorée, les id suivent les lignes du fichier
+    assert [arg.id for arg in analysis.arguments] == [1, 2, 3, 5]
+    assert [arg.fallacies[0].key for arg in analysis.arguments] == [
+        "appel_a_la_popularite", "ad_hominem", "faux_dilemme", "sophisme_deductif",
+    ]
+    # Fiabilité non annotée: null plutôt que la valeur par défaut
+    assert {arg.reliability for arg in analysis.arguments} == {None}
+    # Le gold importé est évaluable tel quel, sans métriques de fiabilité
+    results = evaluate.batch_evaluate(output, output)
+    assert [metrics.fallacy_f1 for _, metrics in results] == [1.0, 1.0]
+    assert [metrics.reliability_count for _, metrics in results] == [0, 0]
+    assert results[0][1].to_dict()["reliability_mae"] is None
+
+
+def test_import_mafalda_keeps_spans(mafalda_file, tmp_path):
+    stats = import_dataset("mafalda", [mafalda_file], tmp_path / "gold", fmt="ndjson")
+    assert stats.unknown == {"appeal to ridicule": 1}
+    records = [json.loads(line) for line in
+               (tmp_path / "gold" / "gold_standard_dataset.ndjson").read_text().splitlines()]
+    assert [len(record["fallacies"]) for record in records] == [2, 0, 1]
+    assert records[0]["document"] == "gold_standard_dataset"
+    assert records[0]["fallacies"][1] == {
+        "name": "appel_a_la_popularite", "source_label": "ad populum", "start": 24, "end": 47,
+    }
+
+
+def test_shards_and_parallel_import(logic_dir, tmp_path):
+    sequential = import_dataset("logic", [logic_dir], tmp_path / "seq", shard_size=3)
+    parallel = import_dataset("logic", [logic_dir], tmp_path / "par", shard_size=3, jobs=2)
+    assert sequential == parallel
+    names = sorted(path.name for path in (tmp_path / "par").iterdir())
+    assert names == ["edu_dev_0001.json", "edu_dev_0002.json",
+                     "edu_train_0001.json", "edu_train_0002.json"]
+    for name in names:
+        assert (tmp_path / "par" / name).read_bytes() == (tmp_path / "seq" / name).read_bytes()
+    assert len(list(AnalysisReader(tmp_path / "par" / "edu_dev_0002.json").arguments)) == 1
+
+
+def test_missing_columns_are_reported(tmp_path):
+    path = tmp_path / "autre.csv"
+    path.write_text("texte,type\na,b\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="source_article"):
+        import_dataset("logic", [path], tmp_path / "gold")
+    assert input_files("logic", [tmp_path]) == [path]
+
+
+def test_failed_import_leaves_no_partial_output(logic_dir, tmp_path):
+    output = tmp_path / "gold"
+    output.mkdir()
+    (output / "ancien.json").write_text("{}", encoding="utf-8")
+    # Le premier fichier est converti, le second échoue
+    (logic_dir / "zz_invalide.csv").write_text("texte,type\na,b\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="source_article"):
+        import_dataset("logic", [logic_dir], output)
+    assert [path.name for path in output.iterdir()] == ["ancien.json"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["dataset-fixed", "gold"]
+
+
+def test_cli_reports_output_errors(mafalda_file, tmp_path):
+    output = tmp_path / "gold"
+    output.write_text("", encoding="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.import_dataset", "mafalda", str(mafalda_file),
+         "-o", str(output), "--jobs", "1"],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 1
+    assert "❌ Erreur:" in result.stdout
+    assert "Traceback" not in result.stderr
+    assert not [path for path in tmp_path.iterdir() if path.name.startswith(".gold.")]
+
+
+def test_homonymous_inputs_are_rejected(logic_dir, tmp_path):
+    # Même nom de fichier dans deux sous-répertoires: les sorties s'écraseraient
+    (logic_dir / "v2").mkdir()
+    (logic_dir / "edu_dev.csv").rename(logic_dir / "v2" / "edu_train.csv")
+    output = tmp_path / "gold"
+    with pytest.raises(ValueError, match="même nom.*edu_train.csv.*v2/edu_train.csv"):
+        import_dataset("logic", [logic_dir], output)
+    assert not output.exists()
+    assert import_dataset("logic", [logic_dir / "v2"], output).files == 1
+
+
+def test_cli_import(mafalda_file, tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.import_dataset", "mafalda", str(mafalda_file),
+         "-o", str(tmp_path / "gold"), "--jobs", "1"],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert "3 exemple(s) importé(s) dans 1 fichier(s)" in result.stdout
+    assert "appeal to ridicule: 1" in result.stdout
+
+
+ESSAY = (
+    "Should students compete?\r\n\r\n"
+    "Cooperation matters more. Teams build trust. Trust lasts. Rivals disagree.\r\n"
+    "Competition motivates some. In conclusion, cooperation wins.\r\n"
+)
+
+
+def _span(fragment):
+    start = ESSAY.index(fragment)
+    return start, start + len(fragment)
+
+
+@pytest.fixture
+def aaec_dir(tmp_path):
+    components = [
+        ("T1", "MajorClaim", "Cooperation matters more"),
+        ("T2", "Claim", "Teams build trust"),
+        ("T3", "Premise", "Trust lasts"),
+        ("T4", "Premise", "Rivals disagree"),
+        ("T5", "Claim", "Competition motivates some"),
+        ("T6", "MajorClaim", "cooperation wins"),
+    ]
+    lines = [f"{key}\t{kind} {start} {end}\t{text}"
+             for key, kind, text in components for start, end in [_span(text)]]
+    lines += [
+        "A1\tStance T2 For", "A2\tStance T5 Against",
+        "R1\tsupports Arg1:T3 Arg2:T2\t", "R2\tattacks Arg1:T4 Arg2:T2\t",
+    ]
+    directory = tmp_path / "brat-project-final"
+    directory.mkdir()
+    with open(directory / "essay001.txt", "w", encoding="utf-8", newline="") as f:
+        f.write(ESSAY)
+    (directory / "essay001.ann").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return directory
+
+
+def test_parse_brat_discontinuous_span():
+    brat = parse_brat("T1\tPremise 10 20;25 30\tsegment\nR1\tsupports Arg1:T1 Arg2:T2\t\n")
+    assert brat.components["T1"][2:4] == (10, 30)
+    assert brat.relations == [("supports", "T1", "T2")]
+
+
+def test_import_aaec_toulmin(aaec_dir, tmp_path):
+    stats = import_dataset("aaec", [aaec_dir], tmp_path / "gold")
+    assert (stats.files, stats.arguments) == (1, 3)
+    data = json.loads((tmp_path / "gold" / "essay001.json").read_text(encoding="utf-8"))
+    assert data["metadata"]["title"] == "Should students compete?"
+    major, claim, counter = data["arguments"]
+    assert major["claim"] == "Cooperation matters more cooperation wins"
+    assert major["grounds"] == "Teams build trust"
+    assert major["rebuttal"] == "Competition motivates some"
+    assert claim["claim"] == "Teams build trust"
+    assert claim["grounds"] == "Trust lasts"
+    assert claim["rebuttal"] == "Rivals disagree"
+    assert claim["original_text"] == "Teams build trust. Trust lasts"
+    assert (claim["start"], claim["end"]) == _span("Teams build trust")
+    assert [(c["id"], c["role"]) for c in claim["components"]] == [
+        ("T2", "claim"), ("T3", "grounds"), ("T4", "rebuttal"),
+    ]
+    assert counter["rebuttal"] == "Non reconnu"
+    # Les positions tiennent compte des fins de ligne \r\n
+    assert [ESSAY[c["start"]:c["end"]] for c in counter["components"]] == [
+        "Competition motivates some",
+    ]
+    assert {(arg["warrant"], arg["qualifier"], arg["reliability"]) for arg in data["arguments"]} == {
+        (None, None, None)
+    }
+    analysis = AnalysisReader(tmp_path / "gold" / "essay001.json").load()
+    assert evaluate.evaluate_analysis(analysis, analysis).toulmin_details["grounds"]["rouge_l"] == 1.0
+    # Composants et fiabilité non annotés: ignorés face aux valeurs du modèle
+    predicted = {"arguments": [
+        {"id": arg.id, "claim": arg.claim, "grounds": arg.grounds, "warrant": "Une garantie",
+         "reliability": 2}
+        for arg in analysis.arguments
+    ]}
+    metrics = evaluate.evaluate_analysis(analysis, predicted)
+    assert set(metrics.toulmin_details) == {"claim", "grounds", "rebuttal"}
+    assert metrics.reliability_count == 0
@@ -0,0 +1,84 @@
+"""Tests pour le modèle en mémoire d'une analyse."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.evaluate import evaluate_analysis, extract_fallacies
+from scripts.model import (
+    NO_FALLACY,
+    NOT_EXPLICIT,
+    NOT_SPECIFIED,
+    Analysis,
+    Argument,
+    as_analysis,
+    parse_analysis,
+)
+
+
+@pytest.fixture
+def example_analysis_data():
+    with open(Path("assets/example_analysis.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_example_analysis(example_analysis_data):
+    analysis = parse_analysis(example_analysis_data)
+    assert len(analysis.arguments) == len(example_analysis_data["arguments"])
+    assert analysis.metadata.title == example_analysis_data["metadata"]["title"]
+    assert analysis.raw is example_analysis_data
+
+
+def test_as_analysis_returns_model_unchanged(example_analysis_data):
+    analysis = parse_analysis(example_analysis_data)
+    assert as_analysis(analysis) is analysis
+
+
+def test_argument_defaults():
+    arg = Argument.parse({}, 7)
+    assert arg.id == 7
+    assert arg.backing == NOT_EXPLICIT
+    assert arg.reliability == 3
+    assert arg.format_fallacies(", ") == NO_FALLACY
+
+
+def test_metadata_defaults():
+    analysis = parse_analysis({})
+    assert analysis.metadata.title == NOT_SPECIFIED
+    assert analysis.arguments == []
+
+
+def test_fallacy_string_and_object_forms():
+    arg = Argument.parse(
+        {"fallacies": ["Ad hominem", {"name": "Homme de paille", "severity": "Majeur"}, ""]}, 1
+    )
+    assert [f.name for f in arg.fallacies] == ["Ad hominem", "Homme de paille"]
+    assert arg.format_fallacies("\n") == "Ad hominem\nHomme de paille (Majeur)"
+
+
+def test_craap_average_and_missing_criteria():
+    arg = Argument.parse(
+        {"sources_cited": [{"name": "INSEE", "craap_score": {"currency": 5, "authority": 4}}]}, 1
+    )
+    craap = arg.sources[0].craap
+    assert craap.scores == [5, 0, 4, 0, 0]
+    assert craap.average == 1.8
+
+
+def test_repeated_labels_are_interned():
+    first = Argument.parse({"reasoning_type": "".join(["Induc", "tif"])}, 1)
+    second = Argument.parse({"reasoning_type": "".join(["Induc", "tif"])}, 2)
+    assert first.reasoning_type is second.reasoning_type
+
+
+def test_model_is_slotted():
+    assert not hasattr(Analysis(), "__dict__")
+    assert not hasattr(Argument(id=1), "__dict__")
+
+
+def test_evaluate_accepts_object_fallacies():
+    gold = {"arguments": [{"id": 1, "fallacies": [{"name": "Ad Hominem", "severity": "Majeur"}]}]}
+    predicted = {"arguments": [{"id": 1, "fallacies": ["ad hominem"]}]}
+    assert extract_fallacies(gold) == {1: ["ad_hominem"]}
+    assert evaluate_analysis(gold, predicted).fallacy_f1 == 1.0
@@ -0,0 +1,121 @@
+"""Tests pour le lecteur incrémental des fichiers d'analyse."""
+
+import io
+import json
+
+import pytest
+
+from scripts.evaluate import evaluate_analysis
+from scripts.model import parse_analysis
+from scripts.reader import AnalysisReader, _Scanner
+
+
+@pytest.fixture
+def example_analysis_data():
+    with open("assets/example_analysis.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    def write(content: str):
+        path = tmp_path / "analysis.json"
+        path.write_text(content, encoding="utf-8")
+        return path
+    return write
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_reader_matches_json_load(example_analysis_data, chunk_size):
+    reader = AnalysisReader("assets/example_analysis.json", chunk_size=chunk_size)
+    expected = parse_analysis(example_analysis_data)
+    assert list(reader.arguments) == expected.arguments
+    assert reader.metadata == expected.metadata
+    assert reader.synthesis == expected.synthesis
+
+
+def test_reader_yields_arguments_lazily(write_json):
+    path = write_json('{"arguments": [{"id": 1}, {"id": 2}, oops]}')
+    arguments = AnalysisReader(path).arguments
+    assert next(arguments).id == 1
+    assert next(arguments).id == 2
+    with pytest.raises(json.JSONDecodeError):
+        next(arguments)
+
+
+def test_reader_header_is_kept_after_reading_arguments(write_json):
+    path = write_json('{"arguments": [{"id": 1}], "synthesis": {"strengths": ["Sourcé"]}}')
+    reader = AnalysisReader(path)
+    assert len(list(reader.arguments)) == 1
+    path.unlink()
+    assert reader.synthesis.strengths == ["Sourcé"]
+
+
+def test_reader_header_before_arguments(write_json):
+    path = write_json('{"arguments": [{"id": 12345}], "metadata": {"title": "Titre"}}')
+    reader = AnalysisReader(path, chunk_size=3)
+    assert reader.metadata.title == "Titre"
+    assert [arg.id for arg in reader.arguments] == [12345]
+
+
+def test_reader_ignores_unknown_members(write_json):
+    path = write_json('{"version": [1, {"a": 2}], "arguments": [], "extra": null}')
+    reader = AnalysisReader(path)
+    assert list(reader.arguments) == []
+    assert reader.metadata.analyst == "Non spécifié"
+
+
+@pytest.mark.parametrize(
+    "content", ['{"arguments": [{"id": 1}', '{"arguments": []} {}', '[]', '{"a" 1}', '']
+)
+def test_reader_invalid_json(write_json, content):
+    reader = AnalysisReader(write_json(content))
+    with pytest.raises(json.JSONDecodeError):
+        list(reader.arguments)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_reader_error_position_is_relative_to_file(write_json, chunk_size):
+    content = '{"arguments": [' + '{"id": 1},\n' * 50 + '{"id": oops}]}'
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(content)
+    reader = AnalysisReader(write_json(content), chunk_size=chunk_size)
+    with pytest.raises(json.JSONDecodeError) as error:
+        list(reader.arguments)
+    assert (error.value.pos, error.value.lineno, error.value.colno) == (
+        expected.value.pos, expected.value.lineno, expected.value.colno
+    )
+    assert str(error.value) == str(expected.value)
+
+
+def test_reader_stops_at_malformed_value():
+    class CountingStream(io.StringIO):
+        read_size = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.read_size += len(chunk)
+            return chunk
+
+    # Erreur en plein tampon: le reste du fichier (1 Mo) n'est pas lu
+    stream = CountingStream('[{"id": oops, "text": "' + "x" * (1 << 20) + '"}]')
+    scanner = _Scanner(stream, 4096)
+    with pytest.raises(json.JSONDecodeError, match="char 8"):
+        list(scanner.array())
+    assert stream.read_size == 4096
+
+
+def test_reader_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        AnalysisReader(tmp_path / "absent.json")
+
+
+def test_reader_load_keeps_raw_document(example_analysis_data):
+    assert AnalysisReader("assets/example_analysis.json").load().raw == example_analysis_data
+
+
+def test_evaluate_readers(example_analysis_data):
+    reader = AnalysisReader("assets/example_analysis.json")
+    from_readers = evaluate_analysis(reader, reader)
+    from_dicts = evaluate_analysis(example_analysis_data, example_analysis_data)
+    assert from_readers.to_dict() == from_dicts.to_dict()
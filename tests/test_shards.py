@@ -0,0 +1,148 @@
+"""Tests pour l'évaluation par fragments et la fusion des états."""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import evaluate
+from scripts.evaluate import Shard, parse_shard
+
+pytest.importorskip("numpy")
+
+from scripts.corpus_metrics import CorpusAccumulator, CorpusState  # noqa: E402
+from scripts.shards import merge_states, read_state, write_state  # noqa: E402
+
+GOLD = Path("benchmark/annotations/gold/001_atecopol_iag.json")
+FALLACIES = ["Ad hominem", "Homme de paille", "Pente glissante", "Faux dilemme"]
+# "a-b.json" se trie avant "a.json": l'ordre des fichiers n'est pas celui des noms d'articles
+NAMES = ["a", "a-b", "a_b", "b", *(f"{i:03}" for i in range(10))]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    with open(GOLD, encoding="utf-8") as f:
+        gold = json.load(f)
+    rnd = random.Random(7)
+    gold_dir, pred_dir = tmp_path / "gold", tmp_path / "model"
+    gold_dir.mkdir()
+    pred_dir.mkdir()
+    for name in NAMES:
+        documents = []
+        for _ in range(2):
+            arguments = [
+                {**arg, "reliability": rnd.randint(1, 5),
+                 "fallacies": rnd.sample(FALLACIES, rnd.randint(0, 2))}
+                for arg in gold["arguments"][: rnd.randint(0, len(gold["arguments"]))]
+            ]
+            documents.append({**gold, "arguments": arguments})
+        (gold_dir / f"{name}.json").write_text(json.dumps(documents[0]), encoding="utf-8")
+        (pred_dir / f"{name}.json").write_text(json.dumps(documents[1]), encoding="utf-8")
+    return gold_dir, pred_dir
+
+
+def shard_state(corpus, shard):
+    accumulator = CorpusAccumulator()
+    evaluate.batch_evaluate(*corpus, corpus=accumulator, shard=shard)
+    return accumulator.state()
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == Shard(2, 4)
+    assert str(Shard(2, 4)) == "2/4"
+    for value in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(argparse.ArgumentTypeError, match="fragment invalide"):
+            parse_shard(value)
+
+
+def test_shards_partition_the_batch(corpus):
+    full = [name for name, _ in evaluate.batch_evaluate(*corpus)]
+    shards = [
+        [name for name, _ in evaluate.batch_evaluate(*corpus, shard=Shard(k, 3))]
+        for k in (1, 2, 3)
+    ]
+    assert sorted(sum(shards, [])) == sorted(full)
+    assert [len(names) for names in shards] == [5, 5, 4]
+    assert shards[0] == full[::3]
+
+
+def test_merge_reproduces_single_batch(corpus, tmp_path):
+    single = shard_state(corpus, None)
+    paths = []
+    for k in (1, 2, 3, 4):
+        state = shard_state(corpus, Shard(k, 4))
+        paths.append(tmp_path / "states" / f"shard-{k}.json")
+        write_state(paths[-1], state, Shard(k, 4), {"align_threshold": None})
+
+    shard, options, state = read_state(paths[1])
+    assert (shard, options) == (Shard(2, 4), {"align_threshold": None})
+    merged = merge_states(list(reversed(paths)))
+    assert merged.articles == single.articles
+    # Égalité exacte, pas seulement approchée
+    assert merged.compute() == single.compute()
+    assert merged.bootstrap(300) == single.bootstrap(300)
+
+    accumulator = CorpusAccumulator()
+    evaluate.batch_evaluate(*corpus, corpus=accumulator)
+    assert accumulator.compute() == single.compute()
+    assert accumulator.bootstrap(300) == single.bootstrap(300)
+
+
+def test_merge_rejects_incomplete_splits(corpus, tmp_path):
+    def write(name, shard, options=None, state=None):
+        path = tmp_path / name
+        write_state(path, state or CorpusState(), shard, options or {"align_threshold": None})
+        return path
+
+    first, second = write("1.json", Shard(1, 2)), write("2.json", Shard(2, 2))
+    assert merge_states([first, second]).compute().article_count == 0
+    with pytest.raises(ValueError, match="manquant.*2/2"):
+        merge_states([first])
+    with pytest.raises(ValueError, match="en double"):
+        merge_states([first, first, second])
+    with pytest.raises(ValueError, match="découpages différents"):
+        merge_states([first, write("3.json", Shard(1, 3))])
+    with pytest.raises(ValueError, match="options différentes"):
+        merge_states([first, write("4.json", Shard(2, 2), {"align_threshold": 0.2})])
+
+    state = shard_state(corpus, None)
+    with pytest.raises(ValueError, match="plusieurs fragments"):
+        merge_states([write("5.json", Shard(1, 2), state=state),
+                      write("6.json", Shard(2, 2), state=state)])
+
+
+def test_cli_shards(corpus, tmp_path):
+    def run(module, *args):
+        result = subprocess.run(
+            [sys.executable, "-m", module, *map(str, args)], capture_output=True, text=True
+        )
+        assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+        return result.stdout
+
+    single = run("scripts.evaluate", "--batch", *corpus, "--quiet", "--jobs", "1")
+    for k in (1, 2):
+        output = run("scripts.evaluate", "--batch", *corpus, "--quiet", "--shard", f"{k}/2",
+                     "--state", tmp_path / f"shard-{k}.json")
+        assert f"État du fragment {k}/2 écrit" in output
+    merged = run("scripts.shards", tmp_path / "shard-1.json", tmp_path / "shard-2.json",
+                 "--quiet", "-o", tmp_path / "corpus.json")
+    report = single[single.index("📊 MOYENNES GLOBALES"):]
+    assert report in merged
+    scores = json.loads((tmp_path / "corpus.json").read_text(encoding="utf-8"))
+    assert scores["article_count"] == len(NAMES)
+
+
+def test_cli_state_requires_batch(corpus, tmp_path):
+    gold_dir, pred_dir = corpus
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.evaluate", str(gold_dir / "a.json"),
+         str(pred_dir / "a.json"), "--shard", "1/2"],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 1
+    assert "--shard n'est disponible qu'en mode batch" in result.stdout
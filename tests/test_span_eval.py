@@ -0,0 +1,114 @@
+"""Tests pour l'évaluation par segment."""
+
+import json
+import random
+import subprocess
+import sys
+
+import pytest
+
+from scripts.import_dataset import import_dataset
+from scripts.span_eval import (
+    evaluate_spans,
+    load_spans,
+    merge_spans,
+    overlap_sums,
+    read_ptc_labels,
+    spans_from_analysis,
+)
+
+
+def _brute_force(gold, predicted):
+    precision = recall = 0.0
+    for ps, pe in predicted:
+        for gs, ge in gold:
+            overlap = max(0, min(pe, ge) - max(ps, gs))
+            precision += overlap / (pe - ps)
+            recall += overlap / (ge - gs)
+    return precision, recall
+
+
+def _random_spans(rng, count):
+    return merge_spans(
+        (start, start + rng.randint(1, 30)) for start in rng.sample(range(2000), count)
+    )
+
+
+def test_merge_spans():
+    assert merge_spans([(10, 20), (0, 5), (15, 30), (30, 35), (7, 7)]) == [
+        (0, 5), (10, 30), (30, 35),
+    ]
+    assert merge_spans([(0, 10), (2, 4)]) == [(0, 10)]
+
+
+def test_overlap_sweep_matches_pairwise():
+    rng = random.Random(0)
+    for _ in range(50):
+        gold, predicted = _random_spans(rng, 40), _random_spans(rng, 30)
+        assert overlap_sums(gold, predicted) == pytest.approx(_brute_force(gold, predicted))
+
+
+def test_partial_overlap_scores():
+    gold = {"article1": {"loaded_language": [(0, 10)], "doubt": [(20, 30)]}}
+    predicted = {"article1": {"loaded_language": [(5, 15), (40, 50)]}}
+    metrics = evaluate_spans(gold, predicted)
+    # 5 caractères communs: moitié du segment prédit, moitié du segment gold
+    assert metrics.per_technique["loaded_language"]["precision"] == pytest.approx(0.25)
+    assert metrics.per_technique["loaded_language"]["recall"] == pytest.approx(0.5)
+    assert metrics.per_technique["doubt"]["recall"] == 0.0
+    assert metrics.precision == pytest.approx(0.25)
+    assert metrics.recall == pytest.approx(0.25)
+    assert metrics.macro_recall == pytest.approx(0.25)
+    assert metrics.to_dict()["per_technique"]["loaded_language"]["gold"] == 1
+
+
+def test_read_ptc_labels(tmp_path):
+    path = tmp_path / "article1.labels"
+    path.write_text(
+        "111\tLoaded_Language\t10\t20\n111\tad hominem\t0\t5\n\n222\tDoubt\t3\t9\n",
+        encoding="utf-8",
+    )
+    index = read_ptc_labels(path)
+    assert index["111"]["ad_hominem"] == [(0, 5)]
+    assert index["111"]["loaded_language"] == [(10, 20)]
+    assert index["222"] == {"doubt": [(3, 9)]}
+
+    path.write_text("111\tDoubt\tdix\t20\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="article1.labels:1"):
+        read_ptc_labels(path)
+
+
+def test_spans_from_imported_analysis(tmp_path):
+    source = tmp_path / "mafalda.jsonl"
+    source.write_text(json.dumps({
+        "text": "You can't trust him, and everyone agrees anyway.",
+        "labels": [[0, 18, "ad hominem"], [24, 47, "ad populum"]],
+    }) + "\n", encoding="utf-8")
+    import_dataset("mafalda", [source], tmp_path / "gold")
+    gold = load_spans(tmp_path / "gold" / "mafalda.json")
+    assert gold == {
+        (None, 1): {"ad_hominem": [(0, 18)], "appel_a_la_popularite": [(24, 47)]},
+    }
+    # Les sophismes sans position sont ignorés
+    analysis = {"arguments": [{"id": 1, "fallacies": [{"name": "Ad hominem"}]}]}
+    assert spans_from_analysis(analysis) == {}
+    assert evaluate_spans(gold, gold).f1 == 1.0
+
+
+def test_cli_spans(tmp_path):
+    gold, predicted = tmp_path / "gold", tmp_path / "pred"
+    gold.mkdir()
+    predicted.mkdir()
+    (gold / "task.labels").write_text("1\tDoubt\t0\t10\n2\tDoubt\t0\t4\n", encoding="utf-8")
+    (predicted / "task.labels").write_text("1\tDoubt\t5\t10\n", encoding="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.evaluate", "--spans", str(gold), str(predicted)],
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, f"Stdout: {result.stdout}, Stderr: {result.stderr}"
+    assert "doubt (2/1)" in result.stdout
+    scores = json.loads(result.stdout[result.stdout.index("{"):])
+    assert scores["documents"] == 2
+    assert scores["span_precision"] == 1.0
+    assert scores["span_recall"] == 0.25
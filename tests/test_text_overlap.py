@@ -0,0 +1,95 @@
+"""Tests pour le recouvrement lexical des composants Toulmin."""
+
+import random
+
+import pytest
+
+from scripts.evaluate import evaluate_analysis
+from scripts.text_overlap import (
+    common_tokens,
+    lcs_length,
+    rouge_l,
+    token_f1,
+    tokenize,
+    toulmin_overlap,
+)
+
+
+def lcs_table(a, b):
+    """Plus longue sous-séquence commune par programmation dynamique."""
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            table[i + 1][j + 1] = table[i][j] + 1 if x == y else max(table[i][j + 1], table[i + 1][j])
+    return table[-1][-1]
+
+
+def test_tokenize_french():
+    assert tokenize("L'argument qu’il défend jusqu'à l'État, c'est-à-dire des Élèves") == (
+        "argument", "il", "defend", "a", "etat", "est", "a", "dire", "eleves",
+    )
+    assert tokenize("") == ()
+
+
+def test_lcs_matches_dynamic_programming():
+    rnd = random.Random(5)
+    for _ in range(500):
+        a = tuple(rnd.choice("abcde") for _ in range(rnd.randint(0, 80)))
+        b = tuple(rnd.choice("abcde") for _ in range(rnd.randint(0, 80)))
+        assert lcs_length(a, b) == lcs_table(a, b)
+
+
+def test_common_tokens_counts_multiplicity():
+    assert common_tokens(("a", "b", "c"), ("c", "d", "a")) == 2
+    assert common_tokens(("a", "a", "b"), ("a", "a", "a")) == 2
+
+
+def test_rouge_l_and_token_f1():
+    reference = "la dette publique menace les générations futures"
+    predicted = "les générations futures sont menacées par la dette"
+    # Tokens: dette publique menace generations futures / generations futures sont menacees par dette
+    # LCS: "generations futures" (P=2/6, R=2/5); tokens communs: dette, generations, futures
+    assert rouge_l(reference, predicted) == pytest.approx(4 / 11)
+    assert token_f1(reference, predicted) == pytest.approx(6 / 11)
+    assert rouge_l(reference, reference) == token_f1(reference, reference) == 1.0
+    assert rouge_l(reference, "") == 0.0
+
+
+def test_toulmin_overlap_skips_components_empty_on_both_sides():
+    gold = {1: ("la thèse", "les données", "", "", "", ""), 2: ("autre", "", "", "", "", "")}
+    predicted = {1: ("la thèse", "", "", "", "", ""), 3: ("orpheline", "", "", "", "", "")}
+    assert toulmin_overlap(gold, predicted) == {
+        "claim": {"rouge_l": 1.0, "token_f1": 1.0, "count": 1},
+        "grounds": {"rouge_l": 0.0, "token_f1": 0.0, "count": 1},
+    }
+
+
+def test_toulmin_overlap_ignores_model_defaults():
+    # Ni le gold ni la prédiction n'annotent backing, qualifier et rebuttal
+    gold = {1: ("la thèse", "", "", "Non explicité", "Non explicité", "Non reconnu")}
+    predicted = {1: ("la thèse", "", "", "non explicité", "Non explicité", "Non reconnu.")}
+    assert toulmin_overlap(gold, predicted) == {
+        "claim": {"rouge_l": 1.0, "token_f1": 1.0, "count": 1},
+    }
+    # Une valeur par défaut face à un contenu annoté compte pour 0
+    predicted = {1: ("la thèse", "", "", "Le GIEC", "Non explicité", "Non reconnu")}
+    assert toulmin_overlap(gold, predicted)["backing"] == {
+        "rouge_l": 0.0, "token_f1": 0.0, "count": 1,
+    }
+
+
+def test_evaluate_analysis_fills_toulmin_matches():
+    gold = {"arguments": [{"id": 1, "claim": "Le climat se réchauffe", "grounds": "Données du GIEC"}]}
+    pred = {"arguments": [{"id": 1, "claim": "Le climat se réchauffe vite", "grounds": "Le GIEC"}]}
+    metrics = evaluate_analysis(gold, pred)
+    assert metrics.toulmin_claim_match == pytest.approx(2 * 1 * 0.75 / 1.75)
+    assert metrics.toulmin_grounds_match == pytest.approx(2 * 1 * 0.5 / 1.5)
+    assert metrics.to_dict()["toulmin"]["claim"]["count"] == 1
+    assert set(metrics.toulmin_details) == {"claim", "grounds"}
+
+
+def test_toulmin_overlap_skips_unannotated_components():
+    gold = {1: ("Thèse", "Prémisse", None, None, None, "Objection")}
+    predicted = {1: ("Thèse", "Prémisse", "Une garantie", "Non explicité", "Sans doute",
+                     "Objection")}
+    assert set(toulmin_overlap(gold, predicted)) == {"claim", "grounds", "rebuttal"}